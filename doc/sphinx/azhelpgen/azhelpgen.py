@@ -25,6 +25,7 @@ USER_HOME = expanduser('~')
 def get_help_files(cli_ctx):
     cli_ctx.invocation = cli_ctx.invocation_cls(cli_ctx=cli_ctx, commands_loader_cls=cli_ctx.commands_loader_cls, parser_cls=cli_ctx.parser_cls, help_cls=cli_ctx.help_cls)
     cli_ctx.invocation.commands_loader.load_command_table([])
+    cli_ctx.invocation.commands_loader.load_help()
     cmd_table = cli_ctx.invocation.commands_loader.command_table
     for command in cmd_table:
         cli_ctx.invocation.commands_loader.load_arguments(command)
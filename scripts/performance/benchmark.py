@@ -0,0 +1,354 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Startup regression benchmark
+
+Runs a matrix of representative invocations (help, parse-only, offline commands and ARM commands replayed from the
+testsdk recordings) both in-process and out-of-process, and reports the percentiles of their duration, the phase
+timings of `--profile-startup` and, for the out-of-process runs, the number of modules they import and their peak RSS.
+The in-process runs share one interpreter, whose imports and peak RSS accumulate across scenarios and runs, so they
+don't report them. Everything runs offline: the replayed commands are served by VCR from the recordings checked in
+next to the command module tests.
+
+    python scripts/performance/benchmark.py --runs 10 --output results.json
+    python scripts/performance/benchmark.py --runs 10 --baseline results.json --tolerance 0.2
+
+The results of a run can be used as the baseline of a later run. The script exits with a non-zero code when a
+metric regresses beyond the tolerance or when a scenario doesn't exit with the expected code.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import math
+import os
+import platform
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections import namedtuple, OrderedDict
+
+from measure import mean, pstdev
+
+IN_PROCESS = 'in-process'
+OUT_OF_PROCESS = 'out-of-process'
+MODES = [IN_PROCESS, OUT_OF_PROCESS]
+
+COMMAND_MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))),
+                                   'src', 'command_modules')
+
+Scenario = namedtuple('Scenario', ['name', 'kind', 'command', 'exit_code', 'recording'])
+
+
+def _recording(module, name):
+    return os.path.join(COMMAND_MODULES_DIR, 'azure-cli-{}'.format(module), 'azure', 'cli', 'command_modules', module,
+                        'tests', 'latest', 'recordings', '{}.yaml'.format(name))
+
+
+SCENARIOS = [
+    Scenario('help-root', 'help', '-h', 0, None),
+    Scenario('help-group', 'help', 'vm -h', 0, None),
+    Scenario('help-command', 'help', 'vm create -h', 0, None),
+    Scenario('parse-unknown-argument', 'parse', 'vm list --this-does-not-exist', 2, None),
+    Scenario('parse-missing-argument', 'parse', 'storage account show', 1, None),
+    Scenario('offline-version', 'offline', '--version', 0, None),
+    Scenario('offline-cloud-list', 'offline', 'cloud list', 0, None),
+    Scenario('offline-extension-list', 'offline', 'extension list', 0, None),
+    Scenario('replay-group-list', 'replay', 'group list --tag a=b', 0,
+             _recording('resource', 'test_resource_group')),
+    Scenario('replay-vm-list', 'replay', 'vm list -g cli_test_vm_list_ip000001', 0,
+             _recording('vm', 'test_vm_show_list_sizes_list_ip_addresses')),
+]
+
+
+def percentile(values, pct):
+    """ Nearest-rank percentile of `values`. """
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[max(rank - 1, 0)]
+
+
+def _get_temp_file(suffix):
+    """ Create an empty temporary file and return its path. """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    return path
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _get_max_rss():
+    """ Peak resident set size of the current process in KB, or None where it isn't available. """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+    return max_rss // 1024 if sys.platform == 'darwin' else max_rss
+
+
+def _invoke(scenario):
+    """ Run `scenario` once in the current process with its output discarded and return its exit code. """
+    args = shlex.split(scenario.command)
+    devnull = open(os.devnull, 'w')
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = devnull
+    try:
+        if scenario.recording:
+            return _invoke_replay(scenario, args)
+        from azure.cli.core import get_default_cli
+        return get_default_cli().invoke(args, out_file=devnull)
+    except SystemExit as ex:
+        return ex.code
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+        devnull.close()
+
+
+def _invoke_replay(scenario, args):
+    """ Run `scenario` with its HTTP requests served from its recording, the same way the scenario tests replay. """
+    from azure.cli.testsdk import ScenarioTest
+    from azure.cli.testsdk.exceptions import CliExecutionError
+
+    class _ReplayScenario(ScenarioTest):
+
+        def __init__(self, recording_file):
+            super(_ReplayScenario, self).__init__('runTest')
+            self.recording_file = recording_file
+            self.is_live = self.in_recording = False
+
+        def runTest(self):
+            pass
+
+    test = _ReplayScenario(scenario.recording)
+    test.setUp()
+    try:
+        test.cmd(' '.join(args))
+        return 0
+    except (AssertionError, CliExecutionError):
+        return 1
+    finally:
+        test.doCleanups()
+
+
+def run_scenario(scenario, measure_process=False):
+    """ Run `scenario` once in the current process and measure it. The imports and peak RSS of the process are only
+    measured with `measure_process`, when the process runs nothing else. """
+    import azure.cli.core.profiler as profiler
+
+    profile_file = _get_temp_file('.json')
+    modules_before = len(sys.modules)
+    profiler.start(output_file=profile_file)
+    start_time = timeit.default_timer()
+    exit_code = _invoke(scenario)
+    duration = timeit.default_timer() - start_time
+    profiler.conclude()
+    try:
+        with open(profile_file) as f:
+            phases = json.load(f)['phases']
+    except (IOError, OSError, ValueError, KeyError):
+        phases = {}
+    finally:
+        _remove_file(profile_file)
+    return {
+        'exitCode': exit_code,
+        'time': duration,
+        'imports': len(sys.modules) - modules_before if measure_process else None,
+        'maxRss': _get_max_rss() if measure_process else None,
+        'phases': phases
+    }
+
+
+def run_scenario_out_of_process(scenario):
+    """ Run `scenario` once in a new interpreter and measure it. """
+    metrics_file = _get_temp_file('.json')
+    with open(os.devnull, 'w') as devnull:
+        start_time = timeit.default_timer()
+        subprocess.call([sys.executable, os.path.realpath(__file__), '--invoke', scenario.name,
+                         '--metrics-file', metrics_file], stdout=devnull, stderr=devnull)
+        duration = timeit.default_timer() - start_time
+    try:
+        with open(metrics_file) as f:
+            metrics = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {'exitCode': None, 'time': duration, 'imports': None, 'maxRss': None, 'phases': {}}
+    finally:
+        _remove_file(metrics_file)
+    # the wall clock time seen by the caller includes the interpreter startup
+    metrics['time'] = duration
+    return metrics
+
+
+def summarize(runs):
+    times = [r['time'] for r in runs]
+    phases = OrderedDict()
+    for name in sorted(set(name for r in runs for name in r['phases'])):
+        phases[name] = percentile([r['phases'].get(name, 0.0) for r in runs], 50)
+    imports = [r['imports'] for r in runs if r['imports'] is not None]
+    max_rss = [r['maxRss'] for r in runs if r['maxRss'] is not None]
+    return OrderedDict([
+        ('time', OrderedDict([
+            ('min', min(times)),
+            ('p50', percentile(times, 50)),
+            ('p90', percentile(times, 90)),
+            ('p95', percentile(times, 95)),
+            ('max', max(times)),
+            ('mean', mean(times)),
+            ('stdev', pstdev(times) if len(times) > 1 else 0.0)
+        ])),
+        ('imports', max(imports) if imports else None),
+        ('maxRss', max(max_rss) if max_rss else None),
+        ('phases', phases),
+        ('exitCodes', sorted(set(r['exitCode'] for r in runs), key=str))
+    ])
+
+
+def _format(value):
+    return '-' if value is None else str(value)
+
+
+def run_benchmark(scenarios, modes, runs, warmup):
+    results = OrderedDict()
+    for scenario in scenarios:
+        results[scenario.name] = OrderedDict()
+        for mode in modes:
+            run = run_scenario if mode == IN_PROCESS else run_scenario_out_of_process
+            for _ in range(warmup):
+                run(scenario)
+            measurements = [run(scenario) for _ in range(runs)]
+            summary = summarize(measurements)
+            results[scenario.name][mode] = summary
+            print('{:<28} {:<15} p50 {:>8.3f}s  p90 {:>8.3f}s  imports {:>6}  maxRss {:>8}  exit {}'.format(
+                scenario.name, mode, summary['time']['p50'], summary['time']['p90'], _format(summary['imports']),
+                _format(summary['maxRss']), summary['exitCodes']))
+    return results
+
+
+def check_exit_codes(scenarios, results):
+    failures = []
+    for scenario in scenarios:
+        for mode, summary in results[scenario.name].items():
+            if summary['exitCodes'] != [scenario.exit_code]:
+                failures.append('{} ({}) exited with {}, expected {}.'.format(
+                    scenario.name, mode, summary['exitCodes'], scenario.exit_code))
+    return failures
+
+
+def compare(baseline, results, tolerance):
+    """ Compare the median time of every scenario with the baseline, and its import count and peak RSS when they were
+    measured, i.e. for the out-of-process runs.
+
+    :return: the descriptions of the metrics which regressed beyond `tolerance`
+    """
+    def _metrics(summary):
+        return [('time p50', summary['time']['p50']), ('imports', summary['imports']), ('maxRss', summary['maxRss'])]
+
+    regressions = []
+    print('\n{:<28} {:<15} {:<10} {:>12} {:>12} {:>9}'.format('Scenario', 'Mode', 'Metric', 'Baseline', 'Current',
+                                                             'Change'))
+    for name, modes in results.items():
+        for mode, summary in modes.items():
+            baseline_summary = baseline.get(name, {}).get(mode)
+            if not baseline_summary:
+                continue
+            for (metric, current), (_, expected) in zip(_metrics(summary), _metrics(baseline_summary)):
+                if not current or not expected:
+                    continue
+                change = (current - expected) / float(expected)
+                regressed = change > tolerance
+                print('{:<28} {:<15} {:<10} {:>12.3f} {:>12.3f} {:>8.1%}{}'.format(
+                    name, mode, metric, expected, current, change, '  REGRESSION' if regressed else ''))
+                if regressed:
+                    regressions.append('{} ({}): {} went from {} to {}.'.format(name, mode, metric, expected, current))
+    return regressions
+
+
+def main(args):
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if args.kind:
+        scenarios = [s for s in scenarios if s.kind in args.kind]
+    if not scenarios:
+        print('No scenario matches the selection.', file=sys.stderr)
+        return 1
+
+    results = run_benchmark(scenarios, args.mode or MODES, args.runs, args.warmup)
+    report = OrderedDict([
+        ('environment', OrderedDict([
+            ('python', platform.python_version()),
+            ('platform', platform.platform()),
+            ('runs', args.runs)
+        ])),
+        ('results', results)
+    ])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failures = check_exit_codes(scenarios, results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures.extend(compare(baseline['results'], results, args.tolerance))
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+def invoke_child(args):
+    """ Entry point of the out-of-process runs. """
+    scenario = next(s for s in SCENARIOS if s.name == args.invoke)
+    metrics = run_scenario(scenario, measure_process=True)
+    with open(args.metrics_file, 'w') as f:
+        json.dump(metrics, f)
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the startup of the Azure CLI.')
+    parser.add_argument('--scenario', nargs='+', choices=[s.name for s in SCENARIOS],
+                        help='The scenarios to run. Defaults to all of them.')
+    parser.add_argument('--kind', nargs='+', choices=sorted(set(s.kind for s in SCENARIOS)),
+                        help='Only run the scenarios of these kinds.')
+    parser.add_argument('--mode', nargs='+', choices=MODES, help='Defaults to both modes.')
+    parser.add_argument('--runs', type=int, default=10, help='The number of measured runs of each scenario.')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='The number of runs of each scenario to discard, which compile the .pyc files and '
+                             'populate the command index and help store.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare the results with the results of a previous run.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='The fraction by which a metric may exceed its baseline.')
+    parser.add_argument('--config-dir',
+                        help='The CLI config directory to run with. Defaults to an empty temporary directory.')
+    parser.add_argument('--invoke', help=argparse.SUPPRESS)
+    parser.add_argument('--metrics-file', help=argparse.SUPPRESS)
+    parsed_args = parser.parse_args()
+
+    if parsed_args.invoke:
+        sys.exit(invoke_child(parsed_args))
+
+    temp_config_dir = None
+    if not parsed_args.config_dir:
+        temp_config_dir = tempfile.mkdtemp()
+    # read when azure.cli.core is imported, and inherited by the out-of-process runs
+    os.environ['AZURE_CONFIG_DIR'] = parsed_args.config_dir or temp_config_dir
+    try:
+        exit_code = main(parsed_args)
+    finally:
+        if temp_config_dir:
+            shutil.rmtree(temp_config_dir, ignore_errors=True)
+    sys.exit(exit_code)
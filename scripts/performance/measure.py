@@ -53,8 +53,9 @@ def scenario(command, loop=10):
     print('Syst: mean => {} \t pstdev => {}'.format(mean(syst), pstdev(syst)))
     print('')
 
-scenario('az')
-scenario('az cl')
-scenario('az cloud')
-scenario('az cloud list')
-scenario('az cloud show --this-does-not-exist')
+if __name__ == '__main__':
+    scenario('az')
+    scenario('az cl')
+    scenario('az cloud')
+    scenario('az cloud list')
+    scenario('az cloud show --this-does-not-exist')
@@ -16,6 +16,7 @@ from knack.arguments import ArgumentsContext
 from knack.cli import CLI
 from knack.commands import CLICommandsLoader
 from knack.completion import ARGCOMPLETE_ENV_NAME
+from knack.events import EVENT_CLI_POST_EXECUTE
 from knack.introspection import extract_args_from_signature, extract_full_summary_from_signature
 from knack.log import get_logger
 from knack.util import CLIError
@@ -28,6 +29,12 @@ EXCLUDED_PARAMS = ['self', 'raw', 'polling', 'custom_headers', 'operation_config
 EVENT_FAILED_EXTENSION_LOAD = 'MainLoader.OnFailedExtensionLoad'
 
 
+def _log_client_pool_usage(cli_ctx, **_):
+    pool = cli_ctx.data.get('client_pool')
+    if pool is not None and (pool.hits or pool.misses):
+        logger.debug('Management service client pool: %d clients built, %d reused.', pool.misses, pool.hits)
+
+
 class AzCli(CLI):
 
     def __init__(self, **kwargs):
@@ -37,7 +44,8 @@ class AzCli(CLI):
             register_ids_argument, register_global_subscription_argument)
         from azure.cli.core.cloud import get_active_cloud
         from azure.cli.core.commands.transform import register_global_transforms
-        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
+        import azure.cli.core.profiler as profiler
 
         from knack.util import ensure_dir
 
@@ -49,15 +57,19 @@ class AzCli(CLI):
 
         azure_folder = self.config.config_dir
         ensure_dir(azure_folder)
-        ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
-        CONFIG.load(os.path.join(azure_folder, 'az.json'))
-        SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
-        self.cloud = get_active_cloud(self)
+        with profiler.phase('sessionLoad'):
+            ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
+            CONFIG.load(os.path.join(azure_folder, 'az.json'))
+            SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+            INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
+        with profiler.phase('cloudConfig'):
+            self.cloud = get_active_cloud(self)
         logger.debug('Current cloud config:\n%s', str(self.cloud.name))
 
         register_global_transforms(self)
         register_global_subscription_argument(self)
         register_ids_argument(self)  # global subscription must be registered first!
+        self.register_event(EVENT_CLI_POST_EXECUTE, _log_client_pool_usage)
 
         self.progress_controller = None
 
@@ -65,10 +77,12 @@ class AzCli(CLI):
         """Assign a new random GUID as x-ms-client-request-id
 
         The method must be invoked before each command execution in order to ensure
-        unique client-side request ID is generated.
+        unique client-side request ID is generated. The service clients of the previous
+        command carry its request ID, so they are dropped as well.
         """
         import uuid
         self.data['headers']['x-ms-client-request-id'] = str(uuid.uuid1())
+        self.data['client_pool'] = None
 
     def get_progress_controller(self, det=False):
         import azure.cli.core.commands.progress as progress
@@ -96,6 +110,19 @@ class MainCommandsLoader(CLICommandsLoader):
         super(MainCommandsLoader, self).__init__(cli_ctx)
         self.cmd_to_loader_map = {}
         self.loaders = []
+        self._command_trie = None
+        self._command_trie_key = None
+
+    @property
+    def command_trie(self):
+        """ The names of the command table as a `CommandTrie`. It is built once per command table load and rebuilt
+        when the command table is replaced or grows. """
+        from azure.cli.core.commands.command_trie import CommandTrie
+        key = (id(self.command_table), len(self.command_table))
+        if self._command_trie is None or self._command_trie_key != key:
+            self._command_trie = CommandTrie(self.command_table)
+            self._command_trie_key = key
+        return self._command_trie
 
     def _update_command_definitions(self):
         for cmd_name in self.command_table:
@@ -112,32 +139,41 @@ class MainCommandsLoader(CLICommandsLoader):
             _load_module_command_loader, _load_extension_command_loader, BLACKLISTED_MODS, ExtensionCommandSource)
         from azure.cli.core.extension import (
             get_extensions, get_extension_path, get_extension_modname)
+        import azure.cli.core.profiler as profiler
+
+        # (command name, command source) of every command loaded, including the ones overridden by extensions
+        command_sources = []
 
-        def _update_command_table_from_modules(args):
+        def _update_command_table_from_modules(args, command_modules=None):
             '''Loads command table(s)
-            When `module_name` is specified, only commands from that module will be loaded.
-            If the module is not found, all commands are loaded.
+            When `command_modules` is specified, only commands from those modules will be loaded.
+            Otherwise, all installed command modules are loaded.
             '''
             installed_command_modules = []
-            try:
-                mods_ns_pkg = import_module('azure.cli.command_modules')
-                installed_command_modules = [modname for _, modname, _ in
-                                             pkgutil.iter_modules(mods_ns_pkg.__path__)
-                                             if modname not in BLACKLISTED_MODS]
-            except ImportError:
-                pass
+            if command_modules is not None:
+                installed_command_modules = command_modules
+            else:
+                try:
+                    mods_ns_pkg = import_module('azure.cli.command_modules')
+                    installed_command_modules = [modname for _, modname, _ in
+                                                 pkgutil.iter_modules(mods_ns_pkg.__path__)
+                                                 if modname not in BLACKLISTED_MODS]
+                except ImportError:
+                    pass
             logger.debug('Installed command modules %s', installed_command_modules)
             cumulative_elapsed_time = 0
             for mod in [m for m in installed_command_modules if m not in BLACKLISTED_MODS]:
                 try:
                     start_time = timeit.default_timer()
                     module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
-                    for cmd in module_command_table.values():
+                    for cmd_name, cmd in module_command_table.items():
                         cmd.command_source = mod
+                        command_sources.append((cmd_name, cmd.command_source))
                     self.command_table.update(module_command_table)
                     self.command_group_table.update(module_group_table)
                     elapsed_time = timeit.default_timer() - start_time
                     logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
+                    profiler.set_module_load_time(mod, elapsed_time)
                     cumulative_elapsed_time += elapsed_time
                 except Exception as ex:  # pylint: disable=broad-except
                     # Changing this error message requires updating CI script that checks for failed
@@ -151,7 +187,7 @@ class MainCommandsLoader(CLICommandsLoader):
                          "(note: there's always an overhead with the first module loaded)",
                          cumulative_elapsed_time)
 
-        def _update_command_table_from_extensions(ext_suppressions):
+        def _update_command_table_from_extensions(ext_suppressions, extension_names=None):
 
             def _handle_extension_suppressions(extensions):
                 filtered_extensions = []
@@ -165,6 +201,8 @@ class MainCommandsLoader(CLICommandsLoader):
                 return filtered_extensions
 
             extensions = get_extensions()
+            if extension_names is not None:
+                extensions = [ext for ext in extensions if ext.name in extension_names]
             if extensions:
                 logger.debug("Found %s extensions: %s", len(extensions), [e.name for e in extensions])
                 allowed_extensions = _handle_extension_suppressions(extensions)
@@ -187,11 +225,13 @@ class MainCommandsLoader(CLICommandsLoader):
                                 extension_name=ext_name,
                                 overrides_command=cmd_name in module_commands,
                                 preview=ext.preview)
+                            command_sources.append((cmd_name, cmd.command_source))
 
                         self.command_table.update(extension_command_table)
                         self.command_group_table.update(extension_group_table)
                         elapsed_time = timeit.default_timer() - start_time
                         logger.debug("Loaded extension '%s' in %.3f seconds.", ext_name, elapsed_time)
+                        profiler.set_module_load_time(ext_name, elapsed_time, extension=True)
                     except Exception:  # pylint: disable=broad-except
                         self.cli_ctx.raise_event(EVENT_FAILED_EXTENSION_LOAD, extension_name=ext_name)
                         logger.warning("Unable to load extension '%s'. Use --debug for more information.", ext_name)
@@ -223,20 +263,56 @@ class MainCommandsLoader(CLICommandsLoader):
                     res.append(sup)
             return res
 
-        _update_command_table_from_modules(args)
-        try:
-            ext_suppressions = _get_extension_suppressions(self.loaders)
-            # We always load extensions even if the appropriate module has been loaded
-            # as an extension could override the commands already loaded.
-            _update_command_table_from_extensions(ext_suppressions)
-        except Exception:  # pylint: disable=broad-except
-            logger.warning("Unable to load extensions. Use --debug for more information.")
-            logger.debug(traceback.format_exc())
+        def _load_command_table(command_modules=None, extension_names=None):
+            _update_command_table_from_modules(args, command_modules)
+            try:
+                ext_suppressions = _get_extension_suppressions(self.loaders)
+                # We always load extensions even if the appropriate module has been loaded
+                # as an extension could override the commands already loaded.
+                _update_command_table_from_extensions(ext_suppressions, extension_names)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to load extensions. Use --debug for more information.")
+                logger.debug(traceback.format_exc())
+
+        command_index = None
+        if self.cli_ctx.config.getboolean('core', 'use_command_index', fallback=True):
+            command_index = CommandIndex(self.cli_ctx)
+            index_result = command_index.get(args)
+            if index_result:
+                index_modules, index_extensions = index_result
+                logger.debug("Loading command modules %s and extensions %s from the command index.",
+                             index_modules, index_extensions)
+                _load_command_table(index_modules, index_extensions)
+                if any(cmd_name.split()[0] == args[0] for cmd_name in self.command_table):
+                    return self.command_table
+                logger.debug("Command index is stale. Loading all command modules and extensions.")
+                self._reset_command_table()
+                del command_sources[:]
+
+        _load_command_table()
+        if command_index:
+            command_index.update(command_sources)
 
         return self.command_table
 
+    def _reset_command_table(self):
+        self.command_table = {}
+        self.command_group_table = {}
+        self.cmd_to_loader_map = {}
+        self.loaders = []
+
+    def load_help(self, command_path=None):
+        """ Register the help entries of the command modules and extensions that provide the commands under
+        `command_path`, or of all loaded command modules and extensions when no path is given. Help entries are not
+        imported when the command table is loaded as they are only needed when help is shown. """
+        for loader in self.loaders:
+            if not command_path or any(name == command_path or name.startswith(command_path + ' ')
+                                       for name in list(loader.command_table) + list(loader.command_group_table)):
+                loader.load_help()
+
     def load_arguments(self, command):
         from azure.cli.core.commands.parameters import resource_group_name_type, get_location_type, deployment_name_type
+        from azure.cli.core.commands.argument_cache import ArgumentCache
         from knack.arguments import ignore_type
 
         command_loaders = self.cmd_to_loader_map.get(command, None)
@@ -248,15 +324,113 @@ class MainCommandsLoader(CLICommandsLoader):
                 c.argument('deployment_name', deployment_name_type)
                 c.argument('cmd', ignore_type)
 
+            # the arguments of a command provided by a single loader are cached once they are resolved
+            argument_cache = None
+            if len(command_loaders) == 1 and ArgumentCache.is_enabled(self.cli_ctx):
+                argument_cache = ArgumentCache(self.cli_ctx)
+                command_loaders[0].command_name = command
+                if argument_cache.restore(self.command_table[command], command_loaders[0]):
+                    return
+
             for loader in command_loaders:
                 loader.command_name = command
                 self.command_table[command].load_arguments()  # this loads the arguments via reflection
                 loader.load_arguments(command)  # this adds entries to the argument registries
                 self.argument_registry.arguments.update(loader.argument_registry.arguments)
                 self.extra_argument_registry.update(loader.extra_argument_registry)
+                if argument_cache:
+                    argument_cache.update(self.command_table[command], loader, self.argument_registry,
+                                          self.extra_argument_registry)
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
 
+class CommandIndex(object):
+    """ Maps top-level command names to the command modules and extensions that provide them, so that only those
+    have to be imported to build the command table. The index is persisted in the CLI config directory and is
+    rebuilt whenever a full command table load happens. """
+
+    _COMMAND_INDEX = 'commandIndex'
+    _COMMAND_INDEX_SIGNATURE = 'signature'
+
+    def __init__(self, cli_ctx=None):
+        from azure.cli.core._session import INDEX
+        self.cli_ctx = cli_ctx
+        self.index = INDEX
+
+    def _get_signature(self):
+        """ Build a signature of everything that can change the command table: the CLI core version, the active
+        cloud profile, the installed command modules and the installed extensions. Installing, upgrading or removing
+        a command module or extension adds or removes entries in the containing directory, so the directory
+        modification times are used in place of the individual package versions, which are expensive to query. """
+        from importlib import import_module
+        from azure.cli.core.extension import EXTENSIONS_DIR
+
+        def _get_mtime(path):
+            try:
+                return os.stat(path).st_mtime
+            except OSError:
+                return None
+
+        module_paths = []
+        try:
+            module_paths = list(import_module('azure.cli.command_modules').__path__)
+        except ImportError:
+            pass
+        return {
+            'version': __version__,
+            'cloudProfile': self.cli_ctx.cloud.profile,
+            'commandModules': sorted([path, _get_mtime(path)] for path in module_paths),
+            'extensions': [EXTENSIONS_DIR, _get_mtime(EXTENSIONS_DIR)]
+        }
+
+    def get(self, args):
+        """ Get the command modules and extensions which provide the top-level command given in `args`.
+
+        :return: a tuple of (command module names, extension names) or None if the index cannot be used.
+        """
+        if not args or not args[0] or args[0].startswith('-'):
+            return None
+
+        if self.index.get(self._COMMAND_INDEX_SIGNATURE) != self._get_signature():
+            logger.debug("Command index signature doesn't match. The index will be rebuilt.")
+            return None
+
+        entry = self.index.get(self._COMMAND_INDEX, {}).get(args[0])
+        if not entry:
+            return None
+        return entry['modules'], entry['extensions']
+
+    def update(self, command_sources):
+        """ Rebuild the index after a full command table load.
+
+        :param command_sources: (command name, command source) pairs for every command that was loaded.
+        """
+        from azure.cli.core.commands import ExtensionCommandSource
+
+        index = {}
+        for cmd_name, command_source in command_sources:
+            entry = index.setdefault(cmd_name.split()[0], {'modules': [], 'extensions': []})
+            if isinstance(command_source, ExtensionCommandSource):
+                sources, source_name = entry['extensions'], command_source.extension_name
+            else:
+                sources, source_name = entry['modules'], command_source
+            if source_name and source_name not in sources:
+                sources.append(source_name)
+
+        signature = self._get_signature()
+        if self.index.get(self._COMMAND_INDEX) == index and self.index.get(self._COMMAND_INDEX_SIGNATURE) == signature:
+            return
+        self.index.data[self._COMMAND_INDEX] = index
+        self.index.data[self._COMMAND_INDEX_SIGNATURE] = signature
+        self.index.save_with_retry()
+        logger.debug("Updated command index with %s top-level commands.", len(index))
+
+    def invalidate(self):
+        """ Clear the index so that the next command loads all command modules and extensions. """
+        self.index.data = {}
+        self.index.save_with_retry()
+
+
 class ModExtensionSuppress(object):  # pylint: disable=too-few-public-methods
 
     def __init__(self, mod_name, suppress_extension_name, suppress_up_to_version, reason=None, recommend_remove=False):
@@ -299,6 +473,7 @@ class AzCommandsLoader(CLICommandsLoader):  # pylint: disable=too-many-instance-
         self.skip_applicability = False
         self._command_group_cls = command_group_cls or AzCommandGroup
         self._argument_context_cls = argument_context_cls or AzArgumentContext
+        self._help_loaded = False
 
     def _update_command_definitions(self):
         master_arg_registry = self.cli_ctx.invocation.commands_loader.argument_registry
@@ -313,6 +488,18 @@ class AzCommandsLoader(CLICommandsLoader):  # pylint: disable=too-many-instance-
                 overrides = master_arg_registry.get_cli_argument(command_name, argument_name)
                 command.update_argument(argument_name, overrides)
 
+    def load_help(self):
+        """ Import the `_help` module which registers the help entries of the module defining this loader. """
+        from importlib import import_module
+        if self._help_loaded:
+            return
+        self._help_loaded = True
+        help_module = '{}._help'.format(self.__class__.__module__)
+        try:
+            import_module(help_module)
+        except ImportError:
+            logger.debug("Unable to import help module '%s'.", help_module)
+
     def _apply_doc_string(self, dest, command_kwargs):
         from azure.cli.core.profiles._shared import APIVersionException
         doc_string_source = command_kwargs.get('doc_string_source', None)
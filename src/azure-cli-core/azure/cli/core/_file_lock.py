@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import errno
+import os
+import time
+
+from knack.util import CLIError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt  # pylint: disable=import-error
+
+
+class FileLock(object):
+    """ An exclusive lock between processes, held on a `.lock` file next to the file it protects. Use it as a context
+    manager around reading and rewriting a file that several `az` processes can update at the same time.
+
+    :param path: The path of the file to protect.
+    :param timeout: The number of seconds to wait for the lock before raising a CLIError.
+    """
+
+    _POLL_INTERVAL = 0.05
+
+    def __init__(self, path, timeout=10):
+        self.lock_file = path + '.lock'
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return
+            except (IOError, OSError) as ex:
+                if ex.errno not in (errno.EACCES, errno.EAGAIN, errno.EDEADLK):
+                    os.close(fd)
+                    raise
+                if time.time() > deadline:
+                    os.close(fd)
+                    raise CLIError("Timed out waiting for the lock on '{}'.".format(self.lock_file))
+                time.sleep(self._POLL_INTERVAL)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+def write_file_atomically(path, content, mode=0o600):
+    """ Write `content`, text or bytes, to a temporary file and move it over `path`, so that readers never see a
+    partial file. """
+    temp_file = '{}.{}.tmp'.format(path, os.getpid())
+    with os.fdopen(os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode),
+                   'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+    try:
+        os.rename(temp_file, path)
+    except OSError:
+        # os.rename doesn't replace an existing file on Windows
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        os.rename(temp_file, path)
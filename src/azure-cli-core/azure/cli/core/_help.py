@@ -5,12 +5,17 @@
 
 from __future__ import print_function
 
+import json
+import os
+
 from knack.help import (HelpExample,
                         HelpFile as KnackHelpFile,
+                        GroupHelpFile as KnackGroupHelpFile,
                         CommandHelpFile as KnackCommandHelpFile,
                         CLIHelp,
                         HelpParameter,
                         ArgumentGroupRegistry as KnackArgumentGroupRegistry)
+from knack.help_files import helps, _load_help_file
 from knack.log import get_logger
 
 from azure.cli.core.commands import ExtensionCommandSource
@@ -52,8 +57,10 @@ class AzCliHelp(CLIHelp):
         super(AzCliHelp, self).__init__(cli_ctx,
                                         privacy_statement=PRIVACY_STATEMENT,
                                         welcome_message=WELCOME_MESSAGE,
+                                        group_help_cls=CliGroupHelpFile,
                                         command_help_cls=CliCommandHelpFile,
                                         help_cls=CliHelpFile)
+        self.help_store = None
         from knack.help import HelpObject
 
         # TODO: This workaround is used to avoid a bizarre bug in Python 2.7. It
@@ -71,6 +78,42 @@ class AzCliHelp(CLIHelp):
 
         HelpObject._normalize_text = new_normalize_text  # pylint: disable=protected-access
 
+    def _load_help_entries(self, nouns=None):
+        from azure.cli.core import MainCommandsLoader
+        commands_loader = getattr(self.cli_ctx.invocation, 'commands_loader', None)
+        if not isinstance(commands_loader, MainCommandsLoader):
+            return
+
+        help_store = HelpStore(self.cli_ctx)
+        # a store which can't be written would be compiled again on every invocation, the help entries of the command
+        # are loaded instead
+        if not help_store.is_valid() and help_store.is_writable():
+            logger.debug("Help store is out of date. Compiling the help entries of all command modules.")
+            loader = MainCommandsLoader(self.cli_ctx)
+            loader.load_command_table(None)
+            loader.load_help()
+            help_store.build(helps)
+        if help_store.is_valid():
+            self.help_store = help_store
+        else:
+            commands_loader.load_help(' '.join(nouns or []))
+
+    def get_help_entry(self, delimiters):
+        """ Get the deserialized help entry of a command or group, from the help store if it is available. """
+        if self.help_store:
+            data = self.help_store.get(delimiters)
+            if data is not None:
+                return data
+        return _load_help_file(delimiters)
+
+    def show_welcome(self, parser):
+        self._load_help_entries()
+        super(AzCliHelp, self).show_welcome(parser)
+
+    def show_help(self, cli_name, nouns, parser, is_group):
+        self._load_help_entries(nouns)
+        super(AzCliHelp, self).show_help(cli_name, nouns, parser, is_group)
+
     @staticmethod
     def _print_extensions_msg(help_file):
         if help_file.type != 'command':
@@ -99,6 +142,12 @@ class CliHelpFile(KnackHelpFile):
                                          min_api=min_profile, max_api=max_profile)
         return True
 
+    # Needs to override base implementation
+    def _load_from_file(self):
+        file_data = self.help_ctx.get_help_entry(self.delimiters)
+        if file_data:
+            self._load_from_data(file_data)
+
     # Needs to override base implementation
     def _load_from_data(self, data):
         if not data:
@@ -123,9 +172,16 @@ class CliHelpFile(KnackHelpFile):
                     self.examples.append(HelpExample(d))
 
 
+class CliGroupHelpFile(KnackGroupHelpFile, CliHelpFile):
+    pass
+
+
 class CliCommandHelpFile(KnackCommandHelpFile, CliHelpFile):
 
     def __init__(self, help_ctx, delimiters, parser):
+        # command parsers get their arguments on demand, see AzCliSubParsersAction
+        if hasattr(parser, 'load_command_arguments'):
+            parser.load_command_arguments()
         super(CliCommandHelpFile, self).__init__(help_ctx, delimiters, parser)
         import argparse
         self.type = 'command'
@@ -169,6 +225,117 @@ class CliCommandHelpFile(KnackCommandHelpFile, CliHelpFile):
         self.parameters = loaded_params
 
 
+class HelpStore(object):
+    """ The help entries of all command modules and extensions, compiled into a single file in the CLI config
+    directory. The file starts with a header line holding the signature of the installation and the offset of each
+    entry, followed by the entries serialized as JSON. Showing help maps the file and deserializes only the entries
+    it needs instead of parsing the YAML of every help string. """
+
+    _HELP_STORE_FILE = 'helpStore.dat'
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        self.path = os.path.join(cli_ctx.config.config_dir, self._HELP_STORE_FILE)
+        self._index = None
+        self._entries = None
+        self._entries_offset = 0
+
+    def _get_signature(self):
+        """ The command index signature, extended with the modification times of the `_help.py` files so that
+        editing help in a development install recompiles the store. """
+        from azure.cli.core import CommandIndex
+        signature = CommandIndex(self.cli_ctx)._get_signature()  # pylint: disable=protected-access
+        help_files = []
+        for module_path, _ in signature['commandModules']:
+            try:
+                module_names = sorted(os.listdir(module_path))
+            except OSError:
+                continue
+            for module_name in module_names:
+                help_file = os.path.join(module_path, module_name, '_help.py')
+                try:
+                    help_files.append([help_file, os.stat(help_file).st_mtime])
+                except OSError:
+                    pass
+        signature['helpFiles'] = help_files
+        return signature
+
+    def _load_index(self):
+        import mmap
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline().decode('utf-8'))
+                if header.get('signature') != self._get_signature():
+                    logger.debug("Help store signature doesn't match.")
+                    return self._index
+                self._entries_offset = f.tell()
+                self._entries = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._index = header['index']
+        except (IOError, OSError, ValueError, KeyError) as ex:
+            logger.debug("Unable to load help store '%s': %s", self.path, ex)
+        return self._index
+
+    def is_valid(self):
+        """ Whether the store exists and was compiled for the installed command modules and extensions. """
+        return bool(self._load_index())
+
+    def is_writable(self):
+        """ Whether the store can be compiled into the CLI config directory. """
+        config_dir = os.path.dirname(self.path)
+        return os.path.isdir(config_dir) and os.access(config_dir, os.W_OK)
+
+    def keys(self):
+        return list(self._load_index())
+
+    def get(self, command_path):
+        """ Deserialize the help entry of `command_path`.
+
+        :return: the help entry as loaded from its YAML or None if the store has no entry for `command_path`.
+        """
+        entry = self._load_index().get(command_path)
+        if not entry:
+            return None
+        offset, length = entry
+        start = self._entries_offset + offset
+        return json.loads(self._entries[start:start + length].decode('utf-8'))
+
+    def build(self, help_entries):
+        """ Compile the store from `help_entries`, a {command path: YAML help} mapping such as knack's `helps`. """
+        import yaml
+        from azure.cli.core._file_lock import write_file_atomically
+        index = {}
+        entries = []
+        offset = 0
+        for command_path in sorted(help_entries):
+            text = help_entries[command_path]
+            try:
+                data = yaml.safe_load(text) if text else None
+            except yaml.YAMLError:
+                data = text
+            # yaml loads dates as datetimes, which are stored back as strings
+            entry = json.dumps(data, default=str).encode('utf-8')
+            index[command_path] = [offset, len(entry)]
+            entries.append(entry)
+            offset += len(entry)
+        header = json.dumps({'signature': self._get_signature(), 'index': index}).encode('utf-8')
+
+        self.close()
+        try:
+            write_file_atomically(self.path, header + b'\n' + b''.join(entries), mode=0o666)
+            logger.debug("Compiled %s help entries into '%s'.", len(index), self.path)
+        except (IOError, OSError) as ex:
+            logger.debug("Unable to write help store '%s': %s", self.path, ex)
+
+    def close(self):
+        if self._entries is not None:
+            self._entries.close()
+        self._entries = None
+        self._index = None
+
+
 class ArgumentGroupRegistry(KnackArgumentGroupRegistry):  # pylint: disable=too-few-public-methods
 
     def __init__(self, group_list):
@@ -16,6 +16,11 @@ class AzOutputProducer(knack.output.OutputProducer):
         import yaml
         return yaml.safe_dump(obj.result, default_flow_style=False)
 
+    def out(self, obj, formatter=None, out_file=None):
+        import azure.cli.core.profiler as profiler
+        with profiler.phase('output'):
+            super(AzOutputProducer, self).out(obj, formatter=formatter, out_file=out_file)
+
     def check_valid_format_type(self, format_type):
         return format_type in self._FORMAT_DICT
 
@@ -11,6 +11,7 @@ import json
 import os
 import os.path
 import re
+import time
 from copy import deepcopy
 from enum import Enum
 from six.moves import BaseHTTPServer
@@ -54,6 +55,11 @@ _TOKEN_ENTRY_TOKEN_TYPE = 'tokenType'
 # This naming is no good, but can't change because xplat-cli does so.
 _ACCESS_TOKEN = 'accessToken'
 _REFRESH_TOKEN = 'refreshToken'
+_SP_TOKEN_RESOURCE = 'resource'
+_SP_TOKEN_EXPIRES_AT = 'expiresAt'
+_SP_TOKEN_ENTRY = 'tokenEntry'
+# cached service principal tokens are renewed this many seconds before they expire
+_SP_TOKEN_REFRESH_MARGIN = 300
 
 TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE = ['familyName',
                                           'givenName',
@@ -107,6 +113,22 @@ def _load_tokens_from_file(file_path):
     return []
 
 
+def _get_file_stat(file_path):
+    try:
+        st = os.stat(file_path)
+        return st.st_mtime, st.st_size
+    except OSError:
+        return None
+
+
+def _split_service_principal_creds(entries):
+    """ Split the entries of a token file into (AAD tokens, service principal creds). """
+    tokens, sp_creds = [], []
+    for entry in entries:
+        (sp_creds if entry.get(_SERVICE_PRINCIPAL_ID) else tokens).append(entry)
+    return tokens, sp_creds
+
+
 def _delete_file(file_path):
     try:
         os.remove(file_path)
@@ -418,10 +440,17 @@ class Profile(object):
 
         self._storage[_SUBSCRIPTIONS] = subscriptions
         self._creds_cache.remove_cached_creds(user_or_sp)
+        self._clear_storage_accounts()
 
     def logout_all(self):
         self._storage[_SUBSCRIPTIONS] = []
         self._creds_cache.remove_all_cached_creds()
+        self._clear_storage_accounts()
+
+    def _clear_storage_accounts(self):
+        # the cached storage account keys were retrieved with the credentials being removed
+        from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
+        get_storage_account_resolver(self.cli_ctx).clear()
 
     def load_cached_subscriptions(self, all_clouds=False):
         subscriptions = self._storage.get(_SUBSCRIPTIONS) or []
@@ -829,7 +858,14 @@ class CredsCache(object):
         # AZURE_ACCESS_TOKEN_FILE is used by Cloud Console and not meant to be user configured
         self._token_file = (os.environ.get('AZURE_ACCESS_TOKEN_FILE', None) or
                             os.path.join(get_config_dir(), 'accessTokens.json'))
+        # access tokens of service principals are kept apart, so that xplat-cli doesn't see them in accessTokens.json
+        self._sp_token_file = os.path.join(os.path.dirname(self._token_file), 'servicePrincipalTokens.json')
         self._service_principal_creds = []
+        # the service principal creds saved or removed since the token file was written, by (sp id, tenant)
+        self._sp_cred_changes = {}
+        # the stat of the token file when it was last read or written, to tell whether another process changed it
+        self._token_file_stat = None
+        self._sp_tokens = None
         self._auth_ctx_factory = auth_ctx_factory
         self._adal_token_cache_attr = None
         self._should_flush_to_disk = False
@@ -845,10 +881,32 @@ class CredsCache(object):
             self.flush_to_disk()
         self.adal_token_cache.has_state_changed = False
 
+    def _merge_token_file_changes(self):
+        """ When another process changed the token file since it was read, apply the tokens and service principal
+        creds changed by this process on top of its current content, instead of overwriting it. """
+        if self._token_file_stat == _get_file_stat(self._token_file):
+            return
+        try:
+            tokens, sp_creds = _split_service_principal_creds(_load_tokens_from_file(self._token_file))
+        except CLIError:
+            return
+        logger.debug("The token file was changed by another process. Merging the changes.")
+        self.adal_token_cache.merge_into(tokens)
+        merged = collections.OrderedDict(((x[_SERVICE_PRINCIPAL_ID], x[_SERVICE_PRINCIPAL_TENANT]), x)
+                                         for x in sp_creds)
+        for sp_key, sp_entry in self._sp_cred_changes.items():
+            if sp_entry is None:
+                merged.pop(sp_key, None)
+            else:
+                merged[sp_key] = sp_entry
+        self._service_principal_creds = list(merged.values())
+
     def flush_to_disk(self):
         if self._should_flush_to_disk:
-            with os.fdopen(os.open(self._token_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
-                           'w+') as cred_file:
+            from azure.cli.core._file_lock import FileLock, write_file_atomically
+            # the changes of another process can't be written between the merge and the write
+            with FileLock(self._token_file):
+                self._merge_token_file_changes()
                 items = self.adal_token_cache.read_items()
                 all_creds = [entry for _, entry in items]
 
@@ -858,7 +916,10 @@ class CredsCache(object):
                         i.pop(key, None)
 
                 all_creds.extend(self._service_principal_creds)
-                cred_file.write(json.dumps(all_creds))
+                write_file_atomically(self._token_file, json.dumps(all_creds), mode=0o600)
+                self._token_file_stat = _get_file_stat(self._token_file)
+            self.adal_token_cache.clear_changes()
+            self._sp_cred_changes.clear()
 
     def retrieve_token_for_user(self, username, tenant, resource):
         context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
@@ -877,13 +938,83 @@ class CredsCache(object):
         if not matched:
             raise CLIError("Please run 'az account set' to select active account.")
         cred = matched[0]
-        context = self._auth_ctx_factory(self._ctx, cred[_SERVICE_PRINCIPAL_TENANT], None)
-        sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
-                                       cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None),
-                                       use_cert_sn_issuer)
-        token_entry = sp_auth.acquire_token(context, resource, sp_id)
+        tenant = cred[_SERVICE_PRINCIPAL_TENANT]
+        token_entry = self._find_service_principal_token(sp_id, tenant, resource)
+        if token_entry is None:
+            context = self._auth_ctx_factory(self._ctx, tenant, None)
+            sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
+                                           cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None),
+                                           use_cert_sn_issuer)
+            token_entry = sp_auth.acquire_token(context, resource, sp_id)
+            self._save_service_principal_token(sp_id, tenant, resource, token_entry)
         return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
 
+    def _load_service_principal_tokens(self):
+        try:
+            entries = get_file_json(self._sp_token_file, throw_on_empty=False) or []
+        except (OSError, IOError, ValueError, CLIError):
+            # the file is only a cache, so a missing or corrupted one is rebuilt
+            entries = []
+        now = time.time()
+        return [e for e in entries if isinstance(e, dict) and e.get(_SP_TOKEN_EXPIRES_AT, 0) > now]
+
+    def _find_service_principal_token(self, sp_id, tenant, resource):
+        def _find():
+            for entry in self._sp_tokens:
+                if (entry[_SERVICE_PRINCIPAL_ID] == sp_id and entry[_SERVICE_PRINCIPAL_TENANT] == tenant and
+                        entry[_SP_TOKEN_RESOURCE] == resource):
+                    if entry[_SP_TOKEN_EXPIRES_AT] - _SP_TOKEN_REFRESH_MARGIN > time.time():
+                        return entry[_SP_TOKEN_ENTRY]
+            return None
+
+        if self._sp_tokens is None:
+            self._sp_tokens = self._load_service_principal_tokens()
+            return _find()
+        # another process may have renewed the token since the file was read
+        token_entry = _find()
+        if token_entry is None:
+            self._sp_tokens = self._load_service_principal_tokens()
+            token_entry = _find()
+        return token_entry
+
+    def _update_service_principal_tokens(self, keep, new_entry=None):
+        from azure.cli.core._file_lock import FileLock, write_file_atomically
+        try:
+            with FileLock(self._sp_token_file):
+                entries = [e for e in self._load_service_principal_tokens() if keep(e)]
+                if new_entry:
+                    entries.append(new_entry)
+                write_file_atomically(self._sp_token_file, json.dumps(entries))
+        except (OSError, IOError, CLIError) as ex:
+            logger.debug("Unable to save the service principal token cache: %s", ex)
+            entries = [e for e in self._sp_tokens or [] if keep(e)] + ([new_entry] if new_entry else [])
+        self._sp_tokens = entries
+
+    def _save_service_principal_token(self, sp_id, tenant, resource, token_entry):
+        try:
+            expires_at = time.time() + int(token_entry['expiresIn'])
+        except (KeyError, TypeError, ValueError):
+            return
+        self._update_service_principal_tokens(
+            lambda e: (e[_SERVICE_PRINCIPAL_ID], e[_SERVICE_PRINCIPAL_TENANT], e[_SP_TOKEN_RESOURCE]) !=
+            (sp_id, tenant, resource),
+            {
+                _SERVICE_PRINCIPAL_ID: sp_id,
+                _SERVICE_PRINCIPAL_TENANT: tenant,
+                _SP_TOKEN_RESOURCE: resource,
+                _SP_TOKEN_EXPIRES_AT: expires_at,
+                _SP_TOKEN_ENTRY: token_entry
+            })
+
+    def _remove_service_principal_tokens(self, sp_id, tenant=None):
+        def _matches(entry):
+            return entry[_SERVICE_PRINCIPAL_ID] == sp_id and tenant in (None, entry[_SERVICE_PRINCIPAL_TENANT])
+
+        if self._sp_tokens is None:
+            self._sp_tokens = self._load_service_principal_tokens()
+        if any(_matches(e) for e in self._sp_tokens):
+            self._update_service_principal_tokens(lambda e: not _matches(e))
+
     def retrieve_secret_of_service_principal(self, sp_id):
         self.load_adal_token_cache()
         matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
@@ -898,11 +1029,11 @@ class CredsCache(object):
 
     def load_adal_token_cache(self):
         if self._adal_token_cache_attr is None:
-            import adal
-            all_entries = _load_tokens_from_file(self._token_file)
-            self._load_service_principal_creds(all_entries)
-            real_token = [x for x in all_entries if x not in self._service_principal_creds]
-            self._adal_token_cache_attr = adal.TokenCache(json.dumps(real_token))
+            from azure.cli.core._token_cache import IndexedTokenCache
+            self._token_file_stat = _get_file_stat(self._token_file)
+            tokens, sp_creds = _split_service_principal_creds(_load_tokens_from_file(self._token_file))
+            self._service_principal_creds.extend(sp_creds)
+            self._adal_token_cache_attr = IndexedTokenCache(tokens)
         return self._adal_token_cache_attr
 
     def save_service_principal_cred(self, sp_entry):
@@ -917,20 +1048,19 @@ class CredsCache(object):
                     sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE, None) != matched[0].get(_SERVICE_PRINCIPAL_CERT_FILE, None)):
                 self._service_principal_creds.remove(matched[0])
                 self._service_principal_creds.append(sp_entry)
+                self._sp_cred_changes[(sp_entry[_SERVICE_PRINCIPAL_ID],
+                                       sp_entry[_SERVICE_PRINCIPAL_TENANT])] = sp_entry
+                self._remove_service_principal_tokens(sp_entry[_SERVICE_PRINCIPAL_ID],
+                                                      sp_entry[_SERVICE_PRINCIPAL_TENANT])
                 state_changed = True
         else:
             self._service_principal_creds.append(sp_entry)
+            self._sp_cred_changes[(sp_entry[_SERVICE_PRINCIPAL_ID], sp_entry[_SERVICE_PRINCIPAL_TENANT])] = sp_entry
             state_changed = True
 
         if state_changed:
             self.persist_cached_creds()
 
-    def _load_service_principal_creds(self, creds):
-        for c in creds:
-            if c.get(_SERVICE_PRINCIPAL_ID):
-                self._service_principal_creds.append(c)
-        return self._service_principal_creds
-
     def remove_cached_creds(self, user_or_sp):
         state_changed = False
         # clear AAD tokens
@@ -946,6 +1076,9 @@ class CredsCache(object):
             state_changed = True
             self._service_principal_creds = [x for x in self._service_principal_creds
                                              if x not in matched]
+            for x in matched:
+                self._sp_cred_changes[(x[_SERVICE_PRINCIPAL_ID], x[_SERVICE_PRINCIPAL_TENANT])] = None
+            self._remove_service_principal_tokens(user_or_sp)
 
         if state_changed:
             self.persist_cached_creds()
@@ -953,6 +1086,10 @@ class CredsCache(object):
     def remove_all_cached_creds(self):
         # we can clear file contents, but deleting it is simpler
         _delete_file(self._token_file)
+        # the token file of service principals is emptied under its lock, as other processes may be updating it
+        if os.path.isfile(self._sp_token_file):
+            self._update_service_principal_tokens(lambda _: False)
+        self._sp_tokens = []
 
 
 class ServicePrincipalAuth(object):
@@ -16,19 +16,26 @@ except ImportError:
 from codecs import open as codecs_open
 
 from knack.log import get_logger
+from knack.util import CLIError
 
 try:
     t_JSONDecodeError = json.JSONDecodeError
 except AttributeError:  # in Python 2.7
     t_JSONDecodeError = ValueError
 
+# marks a key deleted since the last write
+_DELETED = object()
+
 
 class Session(collections.MutableMapping):
     """
     A simple dict-like class that is backed by a JSON file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    Direct modifications are collected and written once, when the process exits or `flush` is called. Only the
+    modified keys are written over the current content of the file, so that the changes made by other processes to
+    other keys are kept. Indirect modifications should be followed by a call to `save_with_retry` or `save`, which
+    write the whole content right away. Writes happen under a lock file and through a temporary file, so concurrent
+    processes never see a partial file.
     """
 
     def __init__(self, encoding=None):
@@ -36,17 +43,47 @@ class Session(collections.MutableMapping):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        # the stat of the file when it was last read or written, to tell whether another process changed it
+        self._file_stat = None
+        # the keys set or deleted since the last write
+        self._changed_keys = set()
+        self._flush_registered = False
+
+    def _get_file_stat(self):
+        try:
+            st = os.stat(self.filename)
+            return st.st_mtime, st.st_size
+        except (OSError, TypeError):
+            return None
+
+    def _read(self):
+        with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+            data = json.load(f)
+        self._file_stat = self._get_file_stat()
+        return data
+
+    def _write(self, data):
+        from azure.cli.core._file_lock import write_file_atomically
+        write_file_atomically(self.filename, json.dumps(data).encode(self._encoding), mode=0o666)
+        self._file_stat = self._get_file_stat()
 
     def load(self, filename, max_age=0):
+        if filename == self.filename and self._file_stat is not None and self._file_stat == self._get_file_stat():
+            # nothing changed since the file was last read or written
+            return
+        if filename != self.filename:
+            self.flush()
+            self._changed_keys.clear()
         self.filename = filename
+        pending = {k: self.data.get(k, _DELETED) for k in self._changed_keys}
         self.data = {}
         try:
             if max_age > 0:
                 st = os.stat(self.filename)
                 if st.st_mtime + max_age < time.clock():
                     self.save()
-            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
-                self.data = json.load(f)
+            self.data = self._read()
+            self._apply(self.data, pending)
         except (OSError, IOError, t_JSONDecodeError) as load_exception:
             # OSError / IOError should imply file not found issues which are expected on fresh runs (e.g. on build
             # agents or new systems). A parse error indicates invalid/bad data in the file. We do not wish to warn
@@ -60,10 +97,21 @@ class Session(collections.MutableMapping):
                                      self.filename)
             self.save()
 
+    @staticmethod
+    def _apply(data, changes):
+        for key, value in changes.items():
+            if value is _DELETED:
+                data.pop(key, None)
+            else:
+                data[key] = value
+
     def save(self):
+        """ Write the whole content to the file. """
+        from azure.cli.core._file_lock import FileLock
         if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+            with FileLock(self.filename):
+                self._write(self.data)
+            self._changed_keys.clear()
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -75,6 +123,36 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    def flush(self):
+        """ Write the keys set or deleted since the last write over the current content of the file. """
+        from azure.cli.core._file_lock import FileLock
+        if not self.filename or not self._changed_keys:
+            return
+        changes = {k: self.data.get(k, _DELETED) for k in self._changed_keys}
+        try:
+            with FileLock(self.filename):
+                # the file is read again even if its stat didn't change, as the modification time is too coarse on
+                # some file systems to tell apart two writes of the same size
+                data = self.data
+                try:
+                    data = self._read()
+                except (OSError, IOError, t_JSONDecodeError):
+                    pass
+                else:
+                    self._apply(data, changes)
+                    self.data = data
+                self._write(data)
+            self._changed_keys.clear()
+        except (OSError, IOError, CLIError) as ex:
+            get_logger(__name__).warning("Failed to save file %s: %s", self.filename, ex)
+
+    def _set_changed(self, key):
+        self._changed_keys.add(key)
+        if not self._flush_registered:
+            import atexit
+            atexit.register(self.flush)
+            self._flush_registered = True
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
@@ -83,11 +161,11 @@ class Session(collections.MutableMapping):
 
     def __setitem__(self, key, value):
         self.data[key] = value
-        self.save_with_retry()
+        self._set_changed(key)
 
     def __delitem__(self, key):
         del self.data[key]
-        self.save_with_retry()
+        self._set_changed(key)
 
     def __iter__(self):
         return iter(self.data)
@@ -104,3 +182,6 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# INDEX contains the {top-level command: command modules and extensions} mapping
+INDEX = Session()
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import adal
+from adal.constants import TokenResponseFields
+from adal.token_cache import _get_cache_key  # pylint: disable=protected-access
+
+
+def _get_user_key(user_id):
+    # adal compares user IDs case insensitively
+    return (user_id or '').lower()
+
+
+class IndexedTokenCache(adal.TokenCache):
+    """ An adal token cache which indexes its entries by user, so that finding the tokens of a user, which adal does
+    for every token it acquires, doesn't scan the tokens of every other account. It also records the entries added or
+    removed since the last call to `clear_changes`, so that they can be merged into a token file changed by another
+    process. """
+
+    def __init__(self, entries=None):
+        self._user_index = {}
+        self._changed_keys = set()
+        super(IndexedTokenCache, self).__init__()
+        if entries:
+            self._add_entries(entries)
+
+    def _add_entries(self, entries):
+        for entry in entries:
+            key = _get_cache_key(entry)
+            self._cache[key] = entry
+            self._user_index.setdefault(_get_user_key(key.user_id), set()).add(key)
+
+    def _remove_key(self, key):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            keys = self._user_index.get(_get_user_key(key.user_id))
+            if keys is not None:
+                keys.discard(key)
+        return entry
+
+    def add(self, entries):
+        with self._lock:
+            entries = list(entries)
+            for entry in entries:
+                self._remove_key(_get_cache_key(entry))
+            self._add_entries(entries)
+            self._changed_keys.update(_get_cache_key(e) for e in entries)
+            self.has_state_changed = True
+
+    def remove(self, entries):
+        with self._lock:
+            for entry in entries:
+                key = _get_cache_key(entry)
+                if self._remove_key(key) is not None:
+                    self._changed_keys.add(key)
+                    self.has_state_changed = True
+
+    def deserialize(self, state):
+        import json
+        with self._lock:
+            self._cache.clear()
+            self._user_index.clear()
+            if state:
+                self._add_entries(json.loads(state))
+
+    def _query_cache(self, is_mrrt, user_id, client_id):
+        if user_id is None:
+            return super(IndexedTokenCache, self)._query_cache(is_mrrt, user_id, client_id)
+        matches = []
+        for key in self._user_index.get(_get_user_key(user_id), ()):
+            entry = self._cache[key]
+            if ((is_mrrt is None or is_mrrt == entry.get(TokenResponseFields.IS_MRRT)) and
+                    (client_id is None or (client_id or '').lower() ==
+                     (entry.get(TokenResponseFields._CLIENT_ID) or '').lower())):  # pylint: disable=protected-access
+                matches.append(entry)
+        return matches
+
+    def merge_into(self, entries):
+        """ Apply the entries added or removed since the last call to `clear_changes` to `entries`, the content of a
+        token file, and make the result the content of this cache. """
+        with self._lock:
+            merged = {}
+            for entry in entries:
+                merged[_get_cache_key(entry)] = entry
+            for key in self._changed_keys:
+                if key in self._cache:
+                    merged[key] = self._cache[key]
+                else:
+                    merged.pop(key, None)
+            self._cache.clear()
+            self._user_index.clear()
+            self._add_entries(merged.values())
+
+    def clear_changes(self):
+        with self._lock:
+            self._changed_keys.clear()
@@ -3,28 +3,140 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import threading
+import time
+
 import requests
 import adal
 
 from msrest.authentication import Authentication
 
+from knack.log import get_logger
 from knack.util import CLIError
 from azure.cli.core.util import in_cloud_console
 
+logger = get_logger(__name__)
+
+# tokens are refreshed in the background this many seconds before they expire. adal and the service principal token
+# cache renew a token which expires within 5 minutes, so this has to be less than that.
+TOKEN_REFRESH_MARGIN = 240
+# a token which expires within this many seconds is refreshed by the request which needs it
+_SYNC_REFRESH_MARGIN = 120
+
+
+def get_token_expiry(token_entry):
+    """ The time, in seconds since the epoch, at which an adal or MSI token entry expires, or None if unknown. """
+    from datetime import datetime
+    if not isinstance(token_entry, dict):
+        return None
+    expires_on = token_entry.get('expiresOn', token_entry.get('expires_on'))
+    try:
+        # MSI tokens give the expiry as a timestamp
+        return float(expires_on)
+    except (TypeError, ValueError):
+        pass
+    for time_format in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S'):
+        try:
+            # adal gives the expiry in local time
+            expires_on = datetime.strptime(expires_on, time_format)
+            return time.mktime(expires_on.timetuple()) + expires_on.microsecond / 1e6
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class TokenRefreshTimer(object):
+    """ Calls `refresh` on a daemon thread shortly before the token it returned last expires, so that a command which
+    runs longer than the lifetime of a token gets a new one before it's needed. `refresh` returns the new token entry,
+    or None to stop. """
+
+    def __init__(self, refresh, refresh_margin=TOKEN_REFRESH_MARGIN):
+        self._refresh = refresh
+        self._refresh_margin = refresh_margin
+        # the timer is set by the timer thread and canceled by others
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self, token_entry):
+        """ Set the timer ahead of the expiry of `token_entry`. Returns False when the token expires too soon or its
+        expiry is unknown. """
+        expiry = get_token_expiry(token_entry)
+        if expiry is None:
+            return False
+        delay = expiry - time.time() - self._refresh_margin
+        if delay <= 0:
+            return False
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+        return True
+
+    def _run(self):
+        try:
+            token_entry = self._refresh()
+        except Exception as ex:  # pylint: disable=broad-except
+            # the request which needs the token will retry and report the failure
+            logger.debug('Unable to refresh the access token in the background: %s', ex)
+            return
+        if token_entry is not None:
+            self.schedule(token_entry)
+
+    def cancel(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
 
 class AdalAuthentication(Authentication):  # pylint: disable=too-few-public-methods
 
     def __init__(self, token_retriever, external_tenant_token_retriever=None):
         self._token_retriever = token_retriever
         self._external_tenant_token_retriever = external_tenant_token_retriever
+        # (scheme, token, external tenant tokens, expiry) of the last tokens retrieved
+        self._tokens = None
+        # whether the tokens were used since they were last refreshed in the background
+        self._tokens_used = False
+        self._lock = threading.Lock()
+        self._refresh_timer = TokenRefreshTimer(self._refresh_in_background)
+
+    def _retrieve_tokens(self):
+        """ Retrieve the tokens and return the entry of the one which expires first, or None if it's unknown. """
+        with self._lock:
+            scheme, token, token_entry = self._token_retriever()
+            external_tenant_tokens = None
+            entries = [token_entry]
+            if self._external_tenant_token_retriever:
+                external_tenant_tokens = self._external_tenant_token_retriever()
+                entries.extend(entry for _, _, entry in external_tenant_tokens)
+            expiries = [get_token_expiry(entry) for entry in entries]
+            expiry = None if None in expiries else min(expiries)
+            self._tokens = scheme, token, external_tenant_tokens, expiry
+            return None if expiry is None else entries[expiries.index(expiry)]
+
+    def _refresh_in_background(self):
+        if not self._tokens_used:
+            # the credentials aren't used anymore, e.g. by a finished command of a batch
+            return None
+        self._tokens_used = False
+        logger.debug('Refreshing the access token ahead of its expiry.')
+        return self._retrieve_tokens()
+
+    def _get_tokens(self):
+        tokens = self._tokens
+        if tokens is None or tokens[3] is None or tokens[3] - time.time() < _SYNC_REFRESH_MARGIN:
+            self._refresh_timer.schedule(self._retrieve_tokens())
+            tokens = self._tokens
+        self._tokens_used = True
+        return tokens
 
     def signed_session(self, session=None):  # pylint: disable=arguments-differ
         session = session or super(AdalAuthentication, self).signed_session()
-        external_tenant_tokens = None
         try:
-            scheme, token, _ = self._token_retriever()
-            if self._external_tenant_token_retriever:
-                external_tenant_tokens = self._external_tenant_token_retriever()
+            scheme, token, external_tenant_tokens, _ = self._get_tokens()
         except CLIError as err:
             if in_cloud_console():
                 AdalAuthentication._log_hostname()
@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Batch execution
+
+Runs the newline-delimited command lines read from stdin one after another in a single CLI process, so that Python
+start-up, session and cloud config loading, command module imports and the credentials cache are paid for once. It is
+enabled with the `--stdin-commands` global flag:
+
+    az --stdin-commands < commands.txt
+
+Empty lines and lines starting with `#` are skipped and a leading `az` is optional. Any other argument given along with
+the flag, e.g. `--output tsv` or `--debug`, is appended to every command. For each command a JSON object is written on
+its own line with the command, its exit code, its result and its error message, if any. The result is the parsed
+output of the command when it is JSON, and the raw output text otherwise. The exit code of the batch is 0 when every
+command succeeded and the exit code of the last failed command otherwise.
+"""
+
+from __future__ import print_function
+
+import json
+import shlex
+import sys
+
+from knack.log import get_logger
+from six import StringIO
+
+logger = get_logger(__name__)
+
+STDIN_COMMANDS_FLAG = '--stdin-commands'
+
+
+def parse_args(args):
+    """ Remove the `--stdin-commands` flag from `args`.
+
+    :return: a tuple of (remaining args, whether batch execution is enabled)
+    """
+    return [a for a in args if a != STDIN_COMMANDS_FLAG], STDIN_COMMANDS_FLAG in args
+
+
+def get_command_args(line):
+    """ The arguments of a command line, or None for an empty or comment line. """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    args = shlex.split(line)
+    if args and args[0] == 'az':
+        args = args[1:]
+    return args
+
+
+def run_command(cli_ctx, args):
+    """ Invoke a command with `cli_ctx`, capturing what it writes to stdout.
+
+    :return: a tuple of (exit code, output text, error message)
+    """
+    errors = []
+    exception_handler = cli_ctx.exception_handler
+
+    def _exception_handler(ex):
+        errors.append(str(ex))
+        return exception_handler(ex)
+
+    out_file = StringIO()
+    stdout = sys.stdout
+    sys.stdout = out_file
+    cli_ctx.exception_handler = _exception_handler
+    try:
+        exit_code = cli_ctx.invoke(args, out_file=out_file)
+    except SystemExit as ex:
+        # argparse exits after showing help or a parsing error
+        exit_code = ex.code if isinstance(ex.code, int) else int(ex.code is not None)
+    finally:
+        sys.stdout = stdout
+        cli_ctx.exception_handler = exception_handler
+    return exit_code, out_file.getvalue(), errors[-1] if errors else None
+
+
+def run_commands(cli_ctx, lines, out_file, extra_args=None):
+    """ Run each command line of `lines` and write its outcome to `out_file` as a line of JSON.
+
+    :return: the exit code of the batch
+    """
+    batch_exit_code = 0
+    for line in lines:
+        try:
+            args = get_command_args(line)
+        except ValueError as ex:
+            exit_code, output, error = 2, '', 'unable to parse the command line: {}'.format(ex)
+            logger.error(error)
+        else:
+            if args is None:
+                continue
+            exit_code, output, error = run_command(cli_ctx, args + list(extra_args or []))
+
+        try:
+            result = json.loads(output) if output.strip() else None
+        except ValueError:
+            result = output
+        print(json.dumps({
+            'command': line.strip(),
+            'exitCode': exit_code,
+            'result': result,
+            'error': error
+        }), file=out_file)
+        out_file.flush()
+        if exit_code:
+            batch_exit_code = exit_code
+    return batch_exit_code
@@ -29,6 +29,7 @@ from azure.cli.core.commands.parameters import (
     AzArgumentContext, patch_arg_make_required, patch_arg_make_optional)
 from azure.cli.core.extension import get_extension
 from azure.cli.core.util import get_command_type_kwarg, read_file_content, get_arg_list, poller_classes
+import azure.cli.core.profiler as profiler
 import azure.cli.core.telemetry as telemetry
 
 logger = get_logger(__name__)
@@ -208,20 +209,23 @@ class AzCliCommandInvoker(CommandInvoker):
     def execute(self, args):
         from knack.events import (EVENT_INVOKER_PRE_CMD_TBL_CREATE, EVENT_INVOKER_POST_CMD_TBL_CREATE,
                                   EVENT_INVOKER_CMD_TBL_LOADED, EVENT_INVOKER_PRE_PARSE_ARGS,
-                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_TRANSFORM_RESULT,
-                                  EVENT_INVOKER_FILTER_RESULT)
-        from knack.util import CommandResultItem, todict
+                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_FILTER_RESULT)
+        from knack.util import CommandResultItem
         from azure.cli.core.commands.events import EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE
+        from azure.cli.core.commands.validators import IterateValue
 
         # TODO: Can't simply be invoked as an event because args are transformed
         args = _pre_command_table_create(self.cli_ctx, args)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_CREATE, args=args)
-        self.commands_loader.load_command_table(args)
+        with profiler.phase('commandTable'):
+            self.commands_loader.load_command_table(args)
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE,
                                  load_cmd_tbl_func=self.commands_loader.load_command_table, args=args)
-        command = self._rudimentary_get_command(args)
+        command_trie = self._get_command_trie()
+        command = self._rudimentary_get_command(args, command_trie)
         telemetry.set_raw_command_name(command)
+        profiler.set_command(command)
 
         try:
             self.commands_loader.command_table = {command: self.commands_loader.command_table[command]}
@@ -244,25 +248,18 @@ class AzCliCommandInvoker(CommandInvoker):
             # output: network application-gateway create
             #         network list-usages
 
-            cmd_table = {}
-            group_names = set()
-            for cmd_name, cmd in self.commands_loader.command_table.items():
-                if command and not cmd_name.startswith(command):
-                    continue
-
-                cmd_stub = cmd_name[len(command):].strip()
-                group_name = cmd_stub.split(' ', 1)[0]
-                if group_name not in group_names:
-                    cmd_table[cmd_name] = cmd
-                    group_names.add(group_name)
-                self.commands_loader.command_table = cmd_table
+            cmd_table = self.commands_loader.command_table
+            self.commands_loader.command_table = {
+                cmd_name: cmd_table[cmd_name] for cmd_name in command_trie.child_representatives(command.split())}
 
         self.commands_loader.command_table = self.commands_loader.command_table  # update with the truncated table
         self.commands_loader.command_name = command
-        self.commands_loader.load_arguments(command)
-        self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
+        with profiler.phase('arguments'):
+            self.commands_loader.load_arguments(command)
+            self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
         self.parser.cli_ctx = self.cli_ctx
-        self.parser.load_command_table(self.commands_loader)
+        with profiler.phase('parser'):
+            self.parser.load_command_table(self.commands_loader)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_CMD_TBL_LOADED, cmd_tbl=self.commands_loader.command_table,
                                  parser=self.parser)
@@ -284,104 +281,189 @@ class AzCliCommandInvoker(CommandInvoker):
         self.parser.enable_autocomplete()
 
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_PARSE_ARGS, args=args)
-        parsed_args = self.parser.parse_args(args)
+        with profiler.phase('parseArgs'):
+            parsed_args = self.parser.parse_args(args)
         self.cli_ctx.raise_event(EVENT_INVOKER_POST_PARSE_ARGS, command=parsed_args.command, args=parsed_args)
 
         # TODO: This fundamentally alters the way Knack.invocation works here. Cannot be customized
         # with an event. Would need to be customized via inheritance.
-        results = []
-        for expanded_arg in _explode_list_args(parsed_args):
-            cmd = expanded_arg.func
-            if hasattr(expanded_arg, 'cmd'):
-                expanded_arg.cmd = cmd
+        parallelism = self._get_parallelism(parsed_args)
+        list_arg_names = sorted(k for k, v in vars(parsed_args).items() if isinstance(v, IterateValue))
+        expanded_args = list(_explode_list_args(parsed_args))
+        if parallelism > 1 and len(expanded_args) > 1:
+            jobs = []
+            for expanded_arg in expanded_args:
+                cmd, params = self._prepare_job(expanded_arg, command, args)
+                jobs.append((cmd, expanded_arg, params))
+            results = self._run_jobs_in_parallel(jobs, parallelism, list_arg_names)
+        else:
+            results = []
+            for expanded_arg in expanded_args:
+                cmd, params = self._prepare_job(expanded_arg, command, args)
+                try:
+                    results.append(self._run_job(cmd, expanded_arg, params))
+                except Exception as ex:  # pylint: disable=broad-except
+                    if cmd.exception_handler:
+                        cmd.exception_handler(ex)
+                        return None
+                    else:
+                        six.reraise(*sys.exc_info())
 
-            self.cli_ctx.data['command'] = expanded_arg.command
+        if results and len(results) == 1:
+            results = results[0]
 
-            if hasattr(expanded_arg, '_subscription'):
-                self.cli_ctx.data['subscription_id'] = expanded_arg._subscription  # pylint: disable=protected-access
+        event_data = {'result': results}
+        self.cli_ctx.raise_event(EVENT_INVOKER_FILTER_RESULT, event_data=event_data)
 
+        return CommandResultItem(
+            event_data['result'],
+            table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
+            is_query_active=self.data['query_active'])
+
+    def _prepare_job(self, expanded_arg, command, args):
+        """ Validate the arguments of one invocation of the command and report its telemetry and deprecations. """
+        cmd = expanded_arg.func
+        if hasattr(expanded_arg, 'cmd'):
+            expanded_arg.cmd = cmd
+
+        self.cli_ctx.data['command'] = expanded_arg.command
+
+        if hasattr(expanded_arg, '_subscription'):
+            self.cli_ctx.data['subscription_id'] = expanded_arg._subscription  # pylint: disable=protected-access
+
+        with profiler.phase('validators'):
             self._validation(expanded_arg)
 
-            params = self._filter_params(expanded_arg)
+        params = self._filter_params(expanded_arg)
 
-            command_source = self.commands_loader.command_table[command].command_source
+        command_source = self.commands_loader.command_table[command].command_source
 
-            extension_version = None
-            extension_name = None
-            try:
-                if isinstance(command_source, ExtensionCommandSource):
-                    extension_name = command_source.extension_name
-                    extension_version = get_extension(command_source.extension_name).version
-            except Exception:  # pylint: disable=broad-except
-                pass
+        extension_version = None
+        extension_name = None
+        try:
+            if isinstance(command_source, ExtensionCommandSource):
+                extension_name = command_source.extension_name
+                extension_version = get_extension(command_source.extension_name).version
+        except Exception:  # pylint: disable=broad-except
+            pass
 
-            telemetry.set_command_details(self.cli_ctx.data['command'], self.data['output'],
-                                          [(p.split('=', 1)[0] if p.startswith('--') else p[:2]) for p in args if
-                                           (p.startswith('-') and len(p) > 1)],
-                                          extension_name=extension_name, extension_version=extension_version)
-            if extension_name:
-                self.data['command_extension_name'] = extension_name
-
-            deprecations = [] + getattr(expanded_arg, '_argument_deprecations', [])
-            if cmd.deprecate_info:
-                deprecations.append(cmd.deprecate_info)
-
-            # search for implicit deprecation
-            path_comps = cmd.name.split()[:-1]
-            implicit_deprecate_info = None
-            while path_comps and not implicit_deprecate_info:
-                implicit_deprecate_info = resolve_deprecate_info(self.cli_ctx, ' '.join(path_comps))
-                del path_comps[-1]
-
-            if implicit_deprecate_info:
-                deprecate_kwargs = implicit_deprecate_info.__dict__.copy()
-                deprecate_kwargs['object_type'] = 'command'
-                del deprecate_kwargs['_get_tag']
-                del deprecate_kwargs['_get_message']
-                deprecations.append(ImplicitDeprecated(**deprecate_kwargs))
-
-            for d in deprecations:
-                logger.warning(d.message)
+        telemetry.set_command_details(self.cli_ctx.data['command'], self.data['output'],
+                                      [(p.split('=', 1)[0] if p.startswith('--') else p[:2]) for p in args if
+                                       (p.startswith('-') and len(p) > 1)],
+                                      extension_name=extension_name, extension_version=extension_version)
+        if extension_name:
+            self.data['command_extension_name'] = extension_name
+
+        deprecations = [] + getattr(expanded_arg, '_argument_deprecations', [])
+        if cmd.deprecate_info:
+            deprecations.append(cmd.deprecate_info)
+
+        # search for implicit deprecation
+        path_comps = cmd.name.split()[:-1]
+        implicit_deprecate_info = None
+        while path_comps and not implicit_deprecate_info:
+            implicit_deprecate_info = resolve_deprecate_info(self.cli_ctx, ' '.join(path_comps))
+            del path_comps[-1]
+
+        if implicit_deprecate_info:
+            deprecate_kwargs = implicit_deprecate_info.__dict__.copy()
+            deprecate_kwargs['object_type'] = 'command'
+            del deprecate_kwargs['_get_tag']
+            del deprecate_kwargs['_get_message']
+            deprecations.append(ImplicitDeprecated(**deprecate_kwargs))
+
+        for d in deprecations:
+            logger.warning(d.message)
+
+        return cmd, params
+
+    def _run_job(self, cmd, expanded_arg, params):
+        """ Invoke the command with the validated arguments of one invocation and return its result. """
+        from knack.events import EVENT_INVOKER_TRANSFORM_RESULT
+        from knack.util import todict
+
+        with profiler.phase('execute'):
+            result = cmd(params)
+            if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
+                result = None
+            elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
+                result = None
+
+            transform_op = cmd.command_kwargs.get('transform', None)
+            if transform_op:
+                result = transform_op(result)
+
+            if _is_poller(result):
+                result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name))(result)
+            elif _is_paged(result):
+                result = list(result)
+
+        result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
+        event_data = {'result': result}
+        self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
+        result = event_data['result']
+        return result
 
+    def _get_parallelism(self, parsed_args):
+        parallelism = getattr(parsed_args, '_parallel', None)
+        if parallelism is None:
+            parallelism = self.cli_ctx.config.getint('core', 'ids_parallelism', fallback=1)
+        if parallelism < 1:
+            raise CLIError('usage error: --parallel must be at least 1.')
+        return parallelism
+
+    def _run_jobs_in_parallel(self, jobs, parallelism, list_arg_names):
+        """ Run the prepared invocations of the command on up to `parallelism` threads. The results keep the order of
+        the invocations. An invocation that fails doesn't stop the others; the failures are reported once all the
+        invocations are done. """
+        from collections import OrderedDict
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from azure.cli.core.commands.progress import AggregateProgressHook
+
+        def _run_job(cmd, expanded_arg, params):
             try:
-                result = cmd(params)
-                if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
-                    result = None
-                elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
-                    result = None
-
-                transform_op = cmd.command_kwargs.get('transform', None)
-                if transform_op:
-                    result = transform_op(result)
-
-                if _is_poller(result):
-                    result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name))(result)
-                elif _is_paged(result):
-                    result = list(result)
-
-                result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
-                event_data = {'result': result}
-                self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
-                result = event_data['result']
-                results.append(result)
-
+                return self._run_job(cmd, expanded_arg, params)
             except Exception as ex:  # pylint: disable=broad-except
                 if cmd.exception_handler:
                     cmd.exception_handler(ex)
                     return None
-                else:
-                    six.reraise(*sys.exc_info())
-
-        if results and len(results) == 1:
-            results = results[0]
+                raise
 
-        event_data = {'result': results}
-        self.cli_ctx.raise_event(EVENT_INVOKER_FILTER_RESULT, event_data=event_data)
+        # the subscription of an invocation is read from the CLI context, so only the invocations on the same
+        # subscription run at the same time
+        jobs_by_subscription = OrderedDict()
+        for index, job in enumerate(jobs):
+            jobs_by_subscription.setdefault(getattr(job[1], '_subscription', None), []).append(index)
 
-        return CommandResultItem(
-            event_data['result'],
-            table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
-            is_query_active=self.data['query_active'])
+        results = [None] * len(jobs)
+        failures = []
+        progress_controller = self.cli_ctx.progress_controller
+        self.cli_ctx.progress_controller = AggregateProgressHook(len(jobs))
+        try:
+            for subscription, indexes in jobs_by_subscription.items():
+                if subscription:
+                    self.cli_ctx.data['subscription_id'] = subscription
+                with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                    futures = {executor.submit(_run_job, *jobs[index]): index for index in indexes}
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        try:
+                            results[index] = future.result()
+                        except Exception as ex:  # pylint: disable=broad-except
+                            failures.append((index, ex))
+                        self.cli_ctx.progress_controller.operation_done()
+        finally:
+            self.cli_ctx.progress_controller.finish()
+            self.cli_ctx.progress_controller = progress_controller
+
+        if failures:
+            for index, ex in sorted(failures, key=lambda f: f[0]):
+                expanded_arg = jobs[index][1]
+                logger.error('%s (%s): %s', jobs[index][0].name,
+                             ', '.join('{}: {}'.format(name.lstrip('_'), getattr(expanded_arg, name, None))
+                                       for name in list_arg_names), ex)
+            raise CLIError('{} of {} operations failed.'.format(len(failures), len(jobs)))
+        return results
 
     def _build_kwargs(self, func, ns):  # pylint: disable=no-self-use
         arg_list = get_arg_list(func)
@@ -403,24 +485,24 @@ class AzCliCommandInvoker(CommandInvoker):
                 converted_dic.update(converted_dic.pop('additionalProperties'))
         return converted_dic
 
-    def _rudimentary_get_command(self, args):  # pylint: disable=no-self-use
+    def _get_command_trie(self):
+        from azure.cli.core.commands.command_trie import CommandTrie
+        command_trie = getattr(self.commands_loader, 'command_trie', None)
+        if command_trie is None:
+            command_trie = CommandTrie(self.commands_loader.command_table)
+        return command_trie
+
+    def _rudimentary_get_command(self, args, command_trie=None):
         """ Rudimentary parsing to get the command """
         nouns = []
-        command_names = self.commands_loader.command_table.keys()
         for arg in args:
             if arg and arg[0] != '-':
                 nouns.append(arg)
             else:
                 break
 
-        def _find_args(args):
-            search = ' '.join(args)
-            return next((x for x in command_names if x.startswith(search)), False)
-
         # since the command name may be immediately followed by a positional arg, strip those off
-        while nouns and not _find_args(nouns):
-            del nouns[-1]
-        return ' '.join(nouns)
+        return ' '.join((command_trie or self._get_command_trie()).longest_prefix(nouns))
 
     def _validate_cmd_level(self, ns, cmd_validator):  # pylint: disable=no-self-use
         if cmd_validator:
@@ -0,0 +1,231 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import sys
+from importlib import import_module
+
+from enum import Enum
+
+from knack.arguments import CLIArgumentType, CLICommandArgument
+from knack.log import get_logger
+
+from azure.cli.core.commands import CliCommandType
+
+logger = get_logger(__name__)
+
+# completers are only used for tab completion, which doesn't use the cache
+_SKIPPED_SETTINGS = ('completer',)
+# subclasses, like the str subclasses used for defaults, are not stored as their base type
+_PLAIN_TYPES = (bool, int, float, str, type(u''))
+# argument and command types nested in the settings, e.g. by `arg_type` or `custom_command_type`, store settings too
+_SETTINGS_TYPES = (CLIArgumentType, CliCommandType)
+
+
+class _NotCacheable(Exception):
+    pass
+
+
+def _get_reference(obj):
+    """ The 'module:qualified.name' of a module level function or class, which can be imported back. """
+    module_name = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None) or getattr(obj, '__name__', None)
+    if not module_name or not qualname or '<' in qualname:
+        raise _NotCacheable()
+    if _resolve_reference(module_name, qualname) is not obj:
+        raise _NotCacheable()
+    return '{}:{}'.format(module_name, qualname)
+
+
+def _resolve_reference(module_name, qualname):
+    try:
+        value = sys.modules.get(module_name) or import_module(module_name)
+        for name in qualname.split('.'):
+            value = getattr(value, name)
+        return value
+    except (ImportError, AttributeError):
+        return None
+
+
+def _encode(value):  # pylint: disable=too-many-return-statements
+    from azure.cli.core.commands.validators import DefaultStr, DefaultInt
+    if isinstance(value, DefaultStr):
+        return {'$defaultStr': str(value)}
+    if isinstance(value, DefaultInt):
+        return {'$defaultInt': int(value)}
+    if value is None or type(value) in _PLAIN_TYPES:  # pylint: disable=unidiomatic-typecheck
+        return value
+    if isinstance(value, tuple) and type(value) is tuple:  # pylint: disable=unidiomatic-typecheck
+        return {'$tuple': [_encode(x) for x in value]}
+    if isinstance(value, list):
+        items = [_encode(x) for x in value]
+        if type(value) is list:  # pylint: disable=unidiomatic-typecheck
+            return items
+        return {'$list': _get_reference(type(value)), 'items': items}
+    if isinstance(value, dict) and type(value) is dict:  # pylint: disable=unidiomatic-typecheck
+        if not all(isinstance(k, str) for k in value):
+            raise _NotCacheable()
+        return {'$dict': {k: _encode(v) for k, v in value.items()}}
+    if isinstance(value, Enum):
+        return {'$enum': _get_reference(type(value)), 'name': value.name}
+    if type(value) in _SETTINGS_TYPES:
+        return {'$settings': _get_reference(type(value)), 'settings': _encode_settings(value.settings)}
+    if isinstance(value, type) or callable(value):
+        return {'$ref': _get_reference(value)}
+    raise _NotCacheable()
+
+
+def _decode(value):
+    from azure.cli.core.commands.validators import DefaultStr, DefaultInt
+    if isinstance(value, list):
+        return [_decode(x) for x in value]
+    if not isinstance(value, dict):
+        return value
+    if '$defaultStr' in value:
+        return DefaultStr(value['$defaultStr'])
+    if '$defaultInt' in value:
+        return DefaultInt(value['$defaultInt'])
+    if '$tuple' in value:
+        return tuple(_decode(x) for x in value['$tuple'])
+    if '$list' in value:
+        return _decode_reference(value['$list'])(_decode(x) for x in value['items'])
+    if '$dict' in value:
+        return {k: _decode(v) for k, v in value['$dict'].items()}
+    if '$enum' in value:
+        return getattr(_decode_reference(value['$enum']), value['name'])
+    if '$settings' in value:
+        return _decode_reference(value['$settings'])(**_decode_settings(value['settings']))
+    return _decode_reference(value['$ref'])
+
+
+def _decode_reference(reference):
+    module_name, qualname = reference.split(':', 1)
+    obj = _resolve_reference(module_name, qualname)
+    if obj is None:
+        raise _NotCacheable()
+    return obj
+
+
+def _encode_settings(settings):
+    return {k: _encode(v) for k, v in settings.items() if k not in _SKIPPED_SETTINGS}
+
+
+def _decode_settings(settings):
+    return {k: _decode(v) for k, v in settings.items()}
+
+
+class ArgumentCache(object):
+    """ Stores the argument definitions of a command once they are resolved, so that later invocations of the same
+    command don't have to import the `_params` module of its command module, run its argument registrations and
+    extract the arguments of its operation by reflection.
+
+    For each command, the cache keeps the arguments found by reflection, the extra arguments, the arguments registered
+    in the scope of the command and the merged argument registrations that apply to each argument. Restoring the
+    arguments replays the merge, so that the defaults configured with `az configure --defaults` still apply. Types,
+    actions and validators are stored by import path; a command with an argument setting that can't be imported back,
+    like a closure, is not cached. The cache is keyed on the CLI version, the installed command modules and extensions,
+    the active cloud and its profile, and the modification times of the source files of the command module, so that
+    editing its argument registrations or operations in a development install rebuilds the entry. """
+
+    _CACHE_DIR = 'argumentCache'
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        self.cache_dir = os.path.join(cli_ctx.config.config_dir, self._CACHE_DIR)
+
+    @staticmethod
+    def is_enabled(cli_ctx):
+        return cli_ctx.config.getboolean('core', 'use_argument_cache', fallback=True) and \
+            '_ARGCOMPLETE' not in os.environ
+
+    def _get_signature(self, loader):
+        from azure.cli.core import CommandIndex
+        signature = CommandIndex(self.cli_ctx)._get_signature()  # pylint: disable=protected-access
+        signature['cloud'] = self.cli_ctx.cloud.name
+        signature['python'] = list(sys.version_info[:2])
+        signature['moduleFiles'] = self._get_module_files(loader)
+        return signature
+
+    @staticmethod
+    def _get_module_files(loader):
+        """ The modification times of the source files of the package of `loader`, e.g. its `__init__`, `_params`,
+        `commands` and custom modules, without its tests and vendored SDKs. """
+        package_file = getattr(sys.modules.get(type(loader).__module__), '__file__', None)
+        if not package_file:
+            return None
+        files = []
+        for root, dirs, names in os.walk(os.path.dirname(package_file)):
+            dirs[:] = sorted(d for d in dirs if d != 'tests' and not d.startswith('vendored'))
+            for name in sorted(names):
+                if name.endswith('.py'):
+                    try:
+                        files.append([os.path.join(root, name), os.stat(os.path.join(root, name)).st_mtime])
+                    except OSError:
+                        pass
+        return files
+
+    def _get_cache_file(self, command_name):
+        return os.path.join(self.cache_dir, '{}.json'.format('.'.join(command_name.split())))
+
+    def restore(self, command, loader):
+        """ Load the arguments of `command` from the cache. Returns False when the command isn't cached. """
+        try:
+            with open(self._get_cache_file(command.name), 'r') as f:
+                entry = json.load(f)
+        except (OSError, IOError, ValueError):
+            return False
+        if entry.get('signature') != self._get_signature(loader):
+            return False
+
+        try:
+            arguments = [(name, _decode_settings(s)) for name, s in entry['arguments']]
+            extra_arguments = [(name, _decode_settings(s)) for name, s in entry['extraArguments']]
+            registry = [(name, _decode_settings(s)) for name, s in entry['registry']]
+            overrides = {name: _decode_settings(s) for name, s in entry['overrides']}
+        except (_NotCacheable, KeyError, TypeError, ValueError):
+            logger.debug("Unable to restore the arguments of '%s' from the argument cache.", command.name)
+            return False
+
+        for name, settings in arguments + extra_arguments:
+            command.arguments[name] = CLICommandArgument(**settings)
+        # the registrations in the scope of the command are looked up by event handlers, e.g. for the `--ids` argument
+        loader.argument_registry.arguments[command.name] = {name: CLIArgumentType(**s) for name, s in registry}
+        for name in command.arguments:
+            command.update_argument(name, CLIArgumentType(**overrides.get(name, {})))
+        logger.debug("Loaded the arguments of '%s' from the argument cache.", command.name)
+        return True
+
+    def update(self, command, loader, argument_registry, extra_argument_registry):
+        """ Store the arguments of `command`. Call it once the arguments are loaded and registered, but before the
+        argument registrations are applied to them. """
+        all_arguments = list(command.arguments.items()) + list(extra_argument_registry[command.name].items())
+        try:
+            entry = {
+                'signature': self._get_signature(loader),
+                'arguments': [(name, _encode_settings(arg.type.settings)) for name, arg in command.arguments.items()],
+                'extraArguments': [(name, _encode_settings(arg.type.settings))
+                                   for name, arg in extra_argument_registry[command.name].items()],
+                'registry': [(name, _encode_settings(arg.settings))
+                             for name, arg in loader.argument_registry.arguments[command.name].items()],
+                'overrides': [(name, _encode_settings(argument_registry.get_cli_argument(command.name, name).settings))
+                              for name, _ in all_arguments]
+            }
+        except _NotCacheable:
+            logger.debug("The arguments of '%s' can't be cached.", command.name)
+            return
+
+        cache_file = self._get_cache_file(command.name)
+        temp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            with open(temp_file, 'w') as f:
+                json.dump(entry, f)
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            os.rename(temp_file, cache_file)
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to save the argument cache of '%s': %s", command.name, ex)
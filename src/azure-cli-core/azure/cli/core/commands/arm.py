@@ -223,6 +223,11 @@ def register_ids_argument(cli_ctx):
                 'arg_group': group_name
             }
             command.add_argument('ids', '--ids', **id_kwargs)
+            command.add_argument('parallel', '--parallel', dest='_parallel', type=int, metavar='N',
+                                 arg_group=group_name,
+                                 help='The number of resource IDs to process at the same time. Failures are reported '
+                                      'once all of them are processed. Default: the value of `ids_parallelism` in '
+                                      'the `[core]` section of the CLI config, or 1.')
 
     def parse_ids_arguments(_, command, args):
 
@@ -1078,9 +1083,6 @@ def get_arm_resource_by_id(cli_ctx, arm_id, api_version=None):
                 namespace = v
                 highest_child = child_number
 
-        # retrieve provider info for the namespace
-        provider = client.providers.get(namespace)
-
         # assemble the resource type key used by the provider list operation.  type1/type2/type3/...
         resource_type_str = ''
         if not highest_child:
@@ -1093,17 +1095,15 @@ def get_arm_resource_by_id(cli_ctx, arm_id, api_version=None):
                 resource_type_str = '{}{}/'.format(resource_type_str, parts['child_type_{}'.format(k)])
             resource_type_str = resource_type_str.rstrip('/')
 
-        api_version = None
-        rt = next((t for t in provider.resource_types if t.resource_type.lower() == resource_type_str.lower()), None)
+        # retrieve provider info for the namespace
+        from azure.cli.core.commands.provider_cache import get_provider_cache
+        rt = get_provider_cache(cli_ctx).get_resource_type(client, namespace, resource_type_str)
         if not rt:
             from azure.cli.core.parser import IncorrectUsageError
             raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
-        try:
-            # if the service specifies, use the default API version
-            api_version = rt.default_api_version
-        except AttributeError:
-            # if the service doesn't specify, use the most recent non-preview API version unless there is only a
-            # single API version. API versions are returned by the service in a sorted list
-            api_version = next((x for x in rt.api_versions if not x.endswith('preview')), rt.api_versions[0])
+        # if the service specifies, use the default API version. Otherwise use the most recent non-preview API version
+        # unless there is only a single API version. API versions are returned by the service in a sorted list
+        api_version = rt.default_api_version or \
+            next((x for x in rt.api_versions if not x.endswith('preview')), rt.api_versions[0])
 
     return client.resources.get_by_id(arm_id, api_version)
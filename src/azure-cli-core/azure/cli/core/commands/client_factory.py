@@ -4,12 +4,14 @@
 # --------------------------------------------------------------------------------------------
 
 import os
+import threading
 
 from knack.log import get_logger
 from knack.util import CLIError
 
 from azure.cli.core import __version__ as core_version
 import azure.cli.core._debug as _debug
+import azure.cli.core.profiler as profiler
 from azure.cli.core.extension import EXTENSIONS_MOD_PREFIX
 from azure.cli.core.profiles._shared import get_client_class, SDKProfile
 from azure.cli.core.profiles import ResourceType, CustomResourceType, get_api_version, get_sdk
@@ -43,6 +45,58 @@ def resolve_client_arg_name(operation, kwargs):
     return client_arg_name
 
 
+class ServiceClientPool(object):
+    """ The management service clients built during one command invocation, so that a command which asks for the
+    same client several times, e.g. from its validators and its operation, reuses its credentials and keep-alive
+    connections. Clients are not shared across threads. """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, key):
+        with self._lock:
+            value = self._clients.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def add(self, key, value):
+        with self._lock:
+            self._clients[key] = value
+
+
+def get_client_pool(cli_ctx):
+    """ The `ServiceClientPool` of the current invocation of `cli_ctx`. """
+    pool = cli_ctx.data.get('client_pool')
+    if pool is None:
+        pool = cli_ctx.data['client_pool'] = ServiceClientPool()
+    return pool
+
+
+def _get_client_pool_key(client_type, **kwargs):
+    def _freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()), key=lambda i: i[0]))
+        if isinstance(value, (list, tuple)):
+            return tuple(_freeze(v) for v in value)
+        hash(value)
+        return value
+
+    try:
+        return client_type, threading.current_thread().ident, _freeze(kwargs)
+    except TypeError:
+        # e.g. an unhashable client argument, such clients are not pooled
+        return None
+
+
 def get_mgmt_service_client(cli_ctx, client_or_resource_type, subscription_id=None, api_version=None,
                             aux_subscriptions=None, **kwargs):
     """
@@ -77,10 +131,15 @@ def get_subscription_service_client(cli_ctx):
 
 
 def configure_common_settings(cli_ctx, client):
+    from azure.cli.core.http_pool import configure_service_client
     client = _debug.change_ssl_cert_verification(client)
+    configure_service_client(cli_ctx, client)
 
     client.config.enable_http_logger = True
 
+    if profiler.is_enabled():
+        client.config.hooks.append(profiler.http_response_hook)
+
     client.config.add_user_agent(UA_AGENT)
     try:
         client.config.add_user_agent(os.environ[ENV_ADDITIONAL_USER_AGENT])
@@ -115,6 +174,17 @@ def _get_mgmt_service_client(cli_ctx,
                              sdk_profile=None,
                              aux_subscriptions=None,
                              **kwargs):
+    pool = get_client_pool(cli_ctx)
+    pool_key = _get_client_pool_key(client_type, subscription_bound=subscription_bound, subscription_id=subscription_id,
+                                    api_version=api_version, base_url_bound=base_url_bound, resource=resource,
+                                    sdk_profile=sdk_profile, aux_subscriptions=aux_subscriptions, kwargs=kwargs)
+    if pool_key is not None:
+        pooled = pool.get(pool_key)
+        if pooled is not None:
+            logger.debug('Reusing management service client client_type=%s (client pool hits: %d)',
+                         client_type.__name__, pool.hits)
+            return pooled
+
     from azure.cli.core._profile import Profile
     logger.debug('Getting management service client client_type=%s', client_type.__name__)
     resource = resource or cli_ctx.cloud.endpoints.active_directory_resource_id
@@ -139,6 +209,8 @@ def _get_mgmt_service_client(cli_ctx,
 
     configure_common_settings(cli_ctx, client)
 
+    if pool_key is not None:
+        pool.add(pool_key, (client, subscription_id))
     return client, subscription_id
 
 
@@ -166,6 +238,9 @@ def get_data_service_client(cli_ctx, service_type, account_name, account_key, co
             raise CLIError('Unable to obtain data client. Check your connection parameters.')
     # TODO: enable Fiddler
     client.request_callback = _get_add_headers_callback(cli_ctx)
+    if hasattr(client, 'request_session'):
+        from azure.cli.core.http_pool import new_session
+        client.request_session = new_session(cli_ctx)
     return client
 
 
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+
+class _CommandTrieNode(object):  # pylint: disable=too-few-public-methods
+
+    __slots__ = ('children', 'command', 'any_command')
+
+    def __init__(self):
+        self.children = {}
+        # the full name of the command ending at this node, if any
+        self.command = None
+        # the full name of one command at or below this node
+        self.any_command = None
+
+
+class CommandTrie(object):
+    """ The names of a command table stored word by word in a trie, so that resolving a command or listing the
+    commands of a group walks the words of the path instead of scanning every command name. """
+
+    def __init__(self, command_names=None):
+        self._root = _CommandTrieNode()
+        self._size = 0
+        for command_name in command_names or []:
+            self.add(command_name)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, command_name):
+        node = self._get_node(command_name.split())
+        return node is not None and node.command is not None
+
+    def add(self, command_name):
+        node = self._root
+        if node.any_command is None:
+            node.any_command = command_name
+        for word in command_name.split():
+            node = node.children.setdefault(word, _CommandTrieNode())
+            if node.any_command is None:
+                node.any_command = command_name
+        if node.command is None:
+            self._size += 1
+        node.command = command_name
+
+    def _get_node(self, words):
+        node = self._root
+        for word in words:
+            node = node.children.get(word)
+            if node is None:
+                return None
+        return node
+
+    def is_group(self, words):
+        """ Whether `words` is the path of a command group, which includes the root. """
+        node = self._get_node(words)
+        return node is not None and bool(node.children)
+
+    def longest_prefix(self, words):
+        """ The longest leading part of `words` which is the path of a command or command group. The words after it
+        are usually positional arguments. """
+        node = self._root
+        prefix = []
+        for word in words:
+            node = node.children.get(word)
+            if node is None:
+                break
+            prefix.append(word)
+        return prefix
+
+    def children(self, words):
+        """ The names of the subgroups and commands directly under the group `words`. """
+        node = self._get_node(words)
+        return sorted(node.children) if node else []
+
+    def commands(self, words=None):
+        """ The full names of all commands under the group `words`, or of all commands. """
+        node = self._get_node(words or [])
+        if node is None:
+            return []
+        command_names = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.command is not None:
+                command_names.append(node.command)
+            stack.extend(node.children.values())
+        return command_names
+
+    def child_representatives(self, words):
+        """ One command name under each subgroup or command directly under the group `words`. Loading these is
+        enough for the parser to build every choice of the group. """
+        node = self._get_node(words)
+        if node is None:
+            return []
+        return [child.any_command for child in node.children.values()]
@@ -192,6 +192,22 @@ def get_three_state_flag(positive_label='true', negative_label='false', invert=F
     return CLIArgumentType(**params)
 
 
+# pylint: disable=too-few-public-methods
+class _EnumDefaultAction(argparse.Action):
+    """ Stores the value of an enum argument with the casing of the matching choice. """
+
+    def __call__(self, parser, args, values, option_string=None):
+
+        def _get_value(val):
+            return next((x for x in self.choices if x.lower() == val.lower()), val)
+
+        if isinstance(values, list):
+            values = [_get_value(v) for v in values]
+        else:
+            values = _get_value(values)
+        setattr(args, self.dest, values)
+
+
 def get_enum_type(data, default=None):
     """ Creates the argparse choices and type kwargs for a supplied enum type or list of strings. """
     if not data:
@@ -203,20 +219,6 @@ def get_enum_type(data, default=None):
     except AttributeError:
         choices = data
 
-    # pylint: disable=too-few-public-methods
-    class DefaultAction(argparse.Action):
-
-        def __call__(self, parser, args, values, option_string=None):
-
-            def _get_value(val):
-                return next((x for x in self.choices if x.lower() == val.lower()), val)
-
-            if isinstance(values, list):
-                values = [_get_value(v) for v in values]
-            else:
-                values = _get_value(values)
-            setattr(args, self.dest, values)
-
     def _type(value):
         return next((x for x in choices if x.lower() == value.lower()), value) if value else value
 
@@ -226,9 +228,10 @@ def get_enum_type(data, default=None):
         if not default_value:
             raise CLIError("Command authoring exception: unrecognized default '{}' from choices '{}'"
                            .format(default, choices))
-        arg_type = CLIArgumentType(choices=CaseInsensitiveList(choices), action=DefaultAction, default=default_value)
+        arg_type = CLIArgumentType(choices=CaseInsensitiveList(choices), action=_EnumDefaultAction,
+                                   default=default_value)
     else:
-        arg_type = CLIArgumentType(choices=CaseInsensitiveList(choices), action=DefaultAction)
+        arg_type = CLIArgumentType(choices=CaseInsensitiveList(choices), action=_EnumDefaultAction)
     return arg_type
 
 
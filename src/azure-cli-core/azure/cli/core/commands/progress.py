@@ -101,6 +101,45 @@ class ProgressHook(object):
         return not self.reporter.closed
 
 
+class AggregateProgressHook(ProgressHook):
+    """ reports the progress of operations running at the same time as the number of completed operations, the
+    progress reported by each of the operations is ignored """
+    def __init__(self, total, progress_view=None):
+        import threading
+        super(AggregateProgressHook, self).__init__()
+        self.total = total
+        self.completed = 0
+        self._lock = threading.Lock()
+        super(AggregateProgressHook, self).init_progress(progress_view or get_progress_view())
+
+    def init_progress(self, progress_view):
+        pass
+
+    def add(self, **kwargs):
+        pass
+
+    def begin(self, **kwargs):
+        pass
+
+    def end(self, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+    def operation_done(self):
+        """ count a completed operation """
+        with self._lock:
+            self.completed += 1
+            super(AggregateProgressHook, self).add(
+                message='Completed {} of {}'.format(self.completed, self.total))
+
+    def finish(self):
+        """ ending reporting of progress once all operations completed """
+        with self._lock:
+            super(AggregateProgressHook, self).end()
+
+
 class IndeterminateStandardOut(ProgressViewBase):
     """ custom output for progress reporting """
     def __init__(self, out=None):
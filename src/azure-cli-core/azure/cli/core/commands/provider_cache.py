@@ -0,0 +1,147 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Provider API version cache
+
+Commands which operate on a resource of any type, like `az resource show --ids`, resolve the API version to call it
+with from the resource types of its provider. The resource types of each provider are kept here, so that they're
+requested once per provider rather than once per resource, and in `providerApiVersions.json` in the CLI config
+directory, so that later invocations don't request them at all until they expire.
+
+The number of seconds the resource types are kept for is set with `provider_cache_ttl` in the `[core]` section of the
+CLI config (default one day). Setting it to 0 disables the file, the resource types are then kept for the duration of
+the process only.
+"""
+
+import collections
+import os
+import threading
+import time
+
+from six import string_types
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+_CACHE_FILE = 'providerApiVersions.json'
+# the number of missing providers from which all providers are requested at once
+_BULK_LOAD_THRESHOLD = 3
+
+ProviderResourceType = collections.namedtuple('ProviderResourceType',
+                                              ['resource_type', 'api_versions', 'default_api_version'])
+
+
+def _get_resource_types(provider):
+    resource_types = {}
+    for rt in provider.resource_types or []:
+        default_api_version = getattr(rt, 'default_api_version', None)
+        resource_types[rt.resource_type.lower()] = {
+            'resourceType': rt.resource_type,
+            'apiVersions': list(rt.api_versions or []),
+            'defaultApiVersion': default_api_version if isinstance(default_api_version, string_types) else None
+        }
+    return resource_types
+
+
+class ProviderCache(object):
+    """ The resource types and API versions of the resource providers of a subscription, by provider namespace. """
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        try:
+            self.ttl = cli_ctx.config.getint('core', 'provider_cache_ttl', fallback=DEFAULT_TTL)
+        except ValueError:
+            logger.warning("Ignoring invalid value of 'provider_cache_ttl' in the [core] section of the CLI config.")
+            self.ttl = DEFAULT_TTL
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._file = None
+
+    def _get_file(self):
+        if self._file is None and self.ttl > 0:
+            from azure.cli.core._session import Session
+            self._file = Session()
+            self._file.load(os.path.join(self.cli_ctx.config.config_dir, _CACHE_FILE))
+        return self._file
+
+    def _get_key(self, client, namespace):
+        """ The key of `namespace` and whether it can be persisted. The resource types of a provider can differ
+        between subscriptions, so they're kept per subscription. """
+        subscription_id = getattr(client.config, 'subscription_id', None)
+        persisted = isinstance(subscription_id, string_types)
+        return '{}/{}/{}'.format(self.cli_ctx.cloud.name, subscription_id, namespace).lower(), persisted
+
+    def _get_entry(self, key, persisted):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and persisted and self._get_file() is not None:
+                entry = self._file.get(key)
+            if entry is None or entry['expiresOn'] < time.time():
+                return None
+            self._entries[key] = entry
+            return entry
+
+    def _set_entry(self, key, persisted, provider):
+        entry = {
+            # without the file, the resource types are kept for the duration of the process
+            'expiresOn': time.time() + self.ttl if self.ttl > 0 else float('inf'),
+            'resourceTypes': _get_resource_types(provider)
+        }
+        with self._lock:
+            self._entries[key] = entry
+            if persisted and self._get_file() is not None:
+                self._file[key] = entry
+        return entry
+
+    def _load(self, client, namespace):
+        logger.debug("Retrieving the resource types of provider '%s'.", namespace)
+        key, persisted = self._get_key(client, namespace)
+        return self._set_entry(key, persisted, client.providers.get(namespace))
+
+    def load(self, client, namespaces):
+        """ Make sure the resource types of the providers `namespaces` are cached. When several are missing, the
+        resource types of every provider are requested at once. """
+        missing = set()
+        for namespace in namespaces:
+            if self._get_entry(*self._get_key(client, namespace)) is None:
+                missing.add(namespace.lower())
+        if len(missing) < _BULK_LOAD_THRESHOLD:
+            for namespace in missing:
+                self._load(client, namespace)
+            return
+        logger.debug('Retrieving the resource types of all providers.')
+        for provider in client.providers.list():
+            key, persisted = self._get_key(client, provider.namespace)
+            self._set_entry(key, persisted, provider)
+            missing.discard(provider.namespace.lower())
+        # let the individual requests report the providers which don't exist
+        for namespace in missing:
+            self._load(client, namespace)
+
+    def get_resource_type(self, client, namespace, resource_type):
+        """ The `ProviderResourceType` of `resource_type` in provider `namespace`, or None if the provider has no
+        such resource type. """
+        entry = self._get_entry(*self._get_key(client, namespace))
+        cached = entry is not None
+        if not cached:
+            entry = self._load(client, namespace)
+        rt = entry['resourceTypes'].get(resource_type.lower())
+        if rt is None and cached:
+            # the resource type may have been added since the provider was cached
+            rt = self._load(client, namespace)['resourceTypes'].get(resource_type.lower())
+        if rt is None:
+            return None
+        return ProviderResourceType(rt['resourceType'], rt['apiVersions'], rt['defaultApiVersion'])
+
+
+def get_provider_cache(cli_ctx):
+    """ The provider cache of `cli_ctx`. """
+    cache = cli_ctx.data.get('provider_cache')
+    if cache is None:
+        cache = cli_ctx.data['provider_cache'] = ProviderCache(cli_ctx)
+    return cache
@@ -0,0 +1,122 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Resource ID resolution
+
+Commands given only the name of a resource, like `az acr show -n myregistry`, need its ID to find its resource group.
+Rather than listing every resource of the type in the subscription and comparing names, the resources are queried by
+name and type. The IDs found are kept here and in `resourceIds.json` in the CLI config directory, so that later
+invocations don't query them until they expire. Commands which create or delete a resource invalidate its name.
+
+The number of seconds the IDs are kept for is set with `resource_id_cache_ttl` in the `[core]` section of the CLI
+config (default one hour). Setting it to 0 disables the file, the IDs are then kept for the duration of the process
+only.
+"""
+
+import os
+import threading
+import time
+
+from six import string_types
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 60 * 60
+_CACHE_FILE = 'resourceIds.json'
+
+
+class ResourceIdResolver(object):
+    """ Resolves the IDs of the resources of the current subscription by name and resource type. """
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        try:
+            self.ttl = cli_ctx.config.getint('core', 'resource_id_cache_ttl', fallback=DEFAULT_TTL)
+        except ValueError:
+            logger.warning("Ignoring invalid value of 'resource_id_cache_ttl' in the [core] section of the CLI config.")
+            self.ttl = DEFAULT_TTL
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._file = None
+
+    def _get_client(self):
+        from azure.cli.core.commands.client_factory import get_mgmt_service_client
+        from azure.cli.core.profiles import ResourceType
+        return get_mgmt_service_client(self.cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES)
+
+    def _get_file(self):
+        if self._file is None and self.ttl > 0:
+            from azure.cli.core._session import Session
+            self._file = Session()
+            self._file.load(os.path.join(self.cli_ctx.config.config_dir, _CACHE_FILE))
+        return self._file
+
+    def _get_key(self, client, resource_name, resource_type):
+        """ The key of `resource_name` and whether it can be persisted. """
+        subscription_id = getattr(client.config, 'subscription_id', None)
+        persisted = isinstance(subscription_id, string_types)
+        return '{}/{}/{}/{}'.format(self.cli_ctx.cloud.name, subscription_id, resource_type,
+                                    resource_name).lower(), persisted
+
+    def _get_entry(self, key, persisted):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and persisted and self._get_file() is not None:
+                entry = self._file.get(key)
+            if entry is None or entry['expiresOn'] < time.time():
+                return None
+            self._entries[key] = entry
+            return entry
+
+    def _set_entry(self, key, persisted, resource_ids):
+        entry = {
+            # without the file, the IDs are kept for the duration of the process
+            'expiresOn': time.time() + self.ttl if self.ttl > 0 else float('inf'),
+            'ids': resource_ids
+        }
+        with self._lock:
+            self._entries[key] = entry
+            if persisted and self._get_file() is not None:
+                self._file[key] = entry
+
+    def _list_resource_ids(self, client, resource_name, resource_type):
+        query = "resourceType eq '{}' and name eq '{}'".format(resource_type, resource_name)
+        # the filter on the name is not case sensitive everywhere, so the names are compared here too
+        return [r.id for r in client.resources.list(filter=query) if r.name.lower() == resource_name.lower()]
+
+    def get_resource_ids(self, resource_name, resource_type, refresh=False):
+        """ The IDs of the resources of type `resource_type` named `resource_name`, an empty list if there are none.
+        Use `refresh` to query them even if they are cached. """
+        client = self._get_client()
+        key, persisted = self._get_key(client, resource_name, resource_type)
+        entry = None if refresh else self._get_entry(key, persisted)
+        if entry is not None:
+            return list(entry['ids'])
+        logger.debug("Querying the resources of type '%s' named '%s'.", resource_type, resource_name)
+        resource_ids = self._list_resource_ids(client, resource_name, resource_type)
+        # a resource which isn't found may be created by the next command, so only found IDs are kept
+        if resource_ids:
+            self._set_entry(key, persisted, resource_ids)
+        return resource_ids
+
+    def invalidate(self, resource_name, resource_type):
+        """ Forget the IDs of the resources of type `resource_type` named `resource_name`, e.g. once one of them is
+        created or deleted. """
+        key, persisted = self._get_key(self._get_client(), resource_name, resource_type)
+        with self._lock:
+            self._entries.pop(key, None)
+            if persisted and self._get_file() is not None:
+                self._file.pop(key, None)
+
+
+def get_resource_id_resolver(cli_ctx):
+    """ The resource ID resolver of `cli_ctx`. """
+    resolver = cli_ctx.data.get('resource_id_resolver')
+    if resolver is None:
+        resolver = cli_ctx.data['resource_id_resolver'] = ResourceIdResolver(cli_ctx)
+    return resolver
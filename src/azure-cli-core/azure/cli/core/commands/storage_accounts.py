@@ -0,0 +1,235 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Storage account resolution
+
+Commands given only the name of a storage account need its resource group to get its keys or properties. Rather than
+listing every storage account of the subscription, the resource group is found from the ID resolved by name in
+`azure.cli.core.commands.resource_ids`. The resource group and endpoints of the accounts resolved this way are kept in
+`storageAccounts.json` in the CLI config directory, which is emptied on `az logout`. The keys of the accounts are
+secrets which can be regenerated from anywhere, so they are only kept for the duration of the process and are never
+written to the file.
+
+The number of seconds the accounts are kept for is set with `storage_account_cache_ttl` in the `[core]` section of
+the CLI config (default one hour). Setting it to 0 disables the file, the accounts are then kept for the duration of
+the process only.
+"""
+
+import json
+import os
+import threading
+import time
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 60 * 60
+_CACHE_FILE = 'storageAccounts.json'
+_STORAGE_ACCOUNT_TYPE = 'Microsoft.Storage/storageAccounts'
+_ENDPOINT_NAMES = ('blob', 'queue', 'table', 'file', 'web', 'dfs')
+
+_RESOURCE_GROUP = 'resourceGroup'
+_ENDPOINTS = 'endpoints'
+_KEYS = 'keys'
+_EXPIRES_ON = 'expiresOn'
+# the values which are kept for the duration of the process only
+_IN_MEMORY_VALUES = (_KEYS,)
+
+
+class StorageAccountResolver(object):
+    """ Resolves the resource group, endpoints and keys of storage accounts of the current subscription by name.
+
+    The methods take the storage management `client` to use, e.g. of a given API version, or None for the one of the
+    current profile. """
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        try:
+            self.ttl = cli_ctx.config.getint('core', 'storage_account_cache_ttl', fallback=DEFAULT_TTL)
+        except ValueError:
+            logger.warning("Ignoring invalid value of 'storage_account_cache_ttl' in the [core] section of the CLI "
+                           "config.")
+            self.ttl = DEFAULT_TTL
+        self._lock = threading.Lock()
+        self._entries = None
+        self._in_memory_entries = {}
+
+    def _get_client(self):
+        from azure.cli.core.commands.client_factory import get_mgmt_service_client
+        from azure.cli.core.profiles import ResourceType
+        return get_mgmt_service_client(self.cli_ctx, ResourceType.MGMT_STORAGE)
+
+    def _get_key(self, client, account_name):
+        # account names are unique, but the same account can be reached from several clouds and subscriptions
+        return '{}/{}/{}'.format(self.cli_ctx.cloud.name, client.config.subscription_id, account_name).lower()
+
+    def _get_cache_file(self):
+        return os.path.join(self.cli_ctx.config.config_dir, _CACHE_FILE) if self.ttl > 0 else None
+
+    def _load_entries(self):
+        entries = {}
+        cache_file = self._get_cache_file()
+        if cache_file:
+            from azure.cli.core.util import get_file_json
+            try:
+                entries = get_file_json(cache_file, throw_on_empty=False) or {}
+            except (OSError, IOError, ValueError, CLIError):
+                # the file is only a cache, so a missing or corrupted one is rebuilt
+                pass
+        if not isinstance(entries, dict):
+            return {}
+        now = time.time()
+        entries = {k: v for k, v in entries.items() if isinstance(v, dict) and v.get(_EXPIRES_ON, 0) > now}
+        for entry in entries.values():
+            # written by previous versions, dropped when the file is written again
+            for name in _IN_MEMORY_VALUES:
+                entry.pop(name, None)
+        return entries
+
+    def _update_entries(self, update):
+        """ Apply `update` to the entries of the cache file, under its lock so that the entries updated by other
+        processes are kept. """
+        from azure.cli.core._file_lock import FileLock, write_file_atomically
+        with self._lock:
+            cache_file = self._get_cache_file()
+            if cache_file:
+                try:
+                    with FileLock(cache_file):
+                        entries = self._load_entries()
+                        update(entries)
+                        write_file_atomically(cache_file, json.dumps(entries))
+                    self._entries = entries
+                    return
+                except (OSError, IOError, CLIError) as ex:
+                    logger.debug("Unable to save the storage account cache: %s", ex)
+            if self._entries is None:
+                self._entries = {}
+            update(self._entries)
+
+    def _get_entry(self, key):
+        with self._lock:
+            if self._entries is None or (key not in self._entries and self._get_cache_file()):
+                # another process may have resolved the account since the file was read
+                self._entries = self._load_entries()
+            entry = self._entries.get(key)
+        if entry is not None and entry.get(_EXPIRES_ON, 0) > time.time():
+            return entry
+        return None
+
+    def _set_values(self, key, **values):
+        def _update(entries):
+            entry = entries.get(key)
+            if entry is None or entry.get(_EXPIRES_ON, 0) <= time.time():
+                # without the file, the accounts are kept for the duration of the process
+                entry = entries[key] = {_EXPIRES_ON: time.time() + self.ttl if self._get_cache_file() else float('inf')}
+            entry.update(values)
+        self._update_entries(_update)
+
+    def _query_account_id(self, account_name):
+        from azure.cli.core.commands.resource_ids import get_resource_id_resolver
+        return next(iter(get_resource_id_resolver(self.cli_ctx).get_resource_ids(account_name, _STORAGE_ACCOUNT_TYPE)),
+                    None)
+
+    def _find_resource_group(self, client, account_name):
+        from msrestazure.tools import parse_resource_id
+        account_id = self._query_account_id(account_name)
+        if account_id is None:
+            # the resources of the subscription are indexed shortly after they are created, so an account that was
+            # just created may not be found yet
+            logger.debug("Storage account '%s' not found by name, listing the storage accounts.", account_name)
+            account_id = next((a.id for a in client.storage_accounts.list() if a.name == account_name), None)
+        return parse_resource_id(account_id)['resource_group'] if account_id else None
+
+    def get_resource_group(self, account_name, client=None):
+        """ The resource group of storage account `account_name`, or None if it isn't found. """
+        client = client or self._get_client()
+        key = self._get_key(client, account_name)
+        entry = self._get_entry(key)
+        if entry is not None:
+            return entry[_RESOURCE_GROUP]
+        resource_group = self._find_resource_group(client, account_name)
+        if resource_group is not None:
+            self._set_values(key, **{_RESOURCE_GROUP: resource_group})
+        return resource_group
+
+    def _get_value(self, account_name, resource_group, name, retrieve, refresh=False, client=None):
+        from msrestazure.azure_exceptions import CloudError
+        client = client or self._get_client()
+        key = self._get_key(client, account_name)
+        entry = self._get_entry(key)
+        in_memory = name in _IN_MEMORY_VALUES
+        cached = self._in_memory_entries.get(key, {}) if in_memory else entry or {}
+        if name in cached and not refresh:
+            return cached[name]
+        cached_resource_group = resource_group is None and entry is not None
+        resource_group = resource_group or self.get_resource_group(account_name, client)
+        if resource_group is None:
+            raise CLIError("Storage account '{}' not found.".format(account_name))
+        try:
+            value = retrieve(client, resource_group)
+        except CloudError as ex:
+            if not cached_resource_group or ex.status_code != 404:
+                raise
+            # the account was deleted and created again in another resource group since it was cached
+            self.invalidate(account_name, client)
+            resource_group = self.get_resource_group(account_name, client)
+            if resource_group is None:
+                raise CLIError("Storage account '{}' not found.".format(account_name))
+            value = retrieve(client, resource_group)
+        if in_memory:
+            with self._lock:
+                self._in_memory_entries.setdefault(key, {})[name] = value
+            if entry is None or entry.get(_RESOURCE_GROUP) != resource_group:
+                self._set_values(key, **{_RESOURCE_GROUP: resource_group})
+        else:
+            self._set_values(key, **{_RESOURCE_GROUP: resource_group, name: value})
+        return value
+
+    def get_keys(self, account_name, resource_group=None, refresh=False, client=None):
+        """ The keys of storage account `account_name`, primary first. They are retrieved once per process, use
+        `refresh` to retrieve keys which are handed over to a service so that they're never out of date. """
+        def _retrieve(client, resource_group):
+            result = client.storage_accounts.list_keys(resource_group, account_name)
+            keys = getattr(result, 'keys', None)
+            if keys is None:
+                # of type: models.storage_account_keys#StorageAccountKeys in older API versions
+                return [result.key1, result.key2]
+            return [k.value for k in keys]
+        return self._get_value(account_name, resource_group, _KEYS, _retrieve, refresh=refresh, client=client)
+
+    def get_endpoints(self, account_name, resource_group=None, client=None):
+        """ The primary endpoints of storage account `account_name`, by service, e.g. 'blob'. """
+        def _retrieve(client, resource_group):
+            endpoints = client.storage_accounts.get_properties(resource_group, account_name).primary_endpoints
+            return {n: getattr(endpoints, n) for n in _ENDPOINT_NAMES if getattr(endpoints, n, None)}
+        return self._get_value(account_name, resource_group, _ENDPOINTS, _retrieve, client=client)
+
+    def invalidate(self, account_name, client=None):
+        """ Forget storage account `account_name`, e.g. once its keys are regenerated. """
+        from azure.cli.core.commands.resource_ids import get_resource_id_resolver
+        key = self._get_key(client or self._get_client(), account_name)
+        with self._lock:
+            self._in_memory_entries.pop(key, None)
+        self._update_entries(lambda entries: entries.pop(key, None))
+        get_resource_id_resolver(self.cli_ctx).invalidate(account_name, _STORAGE_ACCOUNT_TYPE)
+
+    def clear(self):
+        """ Forget every storage account. """
+        with self._lock:
+            self._in_memory_entries.clear()
+        cache_file = self._get_cache_file()
+        if (cache_file and os.path.isfile(cache_file)) or self._entries:
+            self._update_entries(lambda entries: entries.clear())
+
+
+def get_storage_account_resolver(cli_ctx):
+    """ The storage account resolver of `cli_ctx`. """
+    resolver = cli_ctx.data.get('storage_account_resolver')
+    if resolver is None:
+        resolver = cli_ctx.data['storage_account_resolver'] = StorageAccountResolver(cli_ctx)
+    return resolver
@@ -23,11 +23,12 @@ TRIES = 3
 # pylint: disable=inconsistent-return-statements
 def get_index(index_url=None):
     from azure.cli.core.util import should_disable_connection_verify
+    from azure.cli.core.http_pool import get_session
     index_url = index_url or DEFAULT_INDEX_URL
 
     for try_number in range(TRIES):
         try:
-            response = requests.get(index_url, verify=(not should_disable_connection_verify()))
+            response = get_session().get(index_url, verify=(not should_disable_connection_verify()))
             if response.status_code == 200:
                 return response.json()
             msg = ERR_TMPL_NON_200.format(response.status_code, index_url)
@@ -57,8 +57,9 @@ def _run_pip(pip_exec_args):
 
 def _whl_download_from_url(url_parse_result, ext_file):
     from azure.cli.core.util import should_disable_connection_verify
+    from azure.cli.core.http_pool import get_session
     url = url_parse_result.geturl()
-    r = requests.get(url, stream=True, verify=(not should_disable_connection_verify()))
+    r = get_session().get(url, stream=True, verify=(not should_disable_connection_verify()))
     if r.status_code != 200:
         raise CLIError("Request to {} failed with {}".format(url, r.status_code))
     with open(ext_file, 'wb') as f:
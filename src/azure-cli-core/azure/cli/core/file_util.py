@@ -46,6 +46,7 @@ def create_invoker_and_load_cmds_and_args(cli_ctx):
                                      parser_cls=cli_ctx.parser_cls, help_cls=cli_ctx.help_cls)
     cli_ctx.invocation = invoker
     invoker.commands_loader.load_command_table(None)
+    invoker.commands_loader.load_help()
     for command in invoker.commands_loader.command_table:
         invoker.commands_loader.load_arguments(command)
     invoker.parser.load_command_table(invoker.commands_loader)
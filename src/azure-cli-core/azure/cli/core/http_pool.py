@@ -0,0 +1,141 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Shared HTTP connection pool
+
+Every `requests.Session` normally owns its connection pools, so each SDK client, and each bare `requests.get`, opens
+its own connections and pays for a new TLS handshake. The sessions created here mount adapters that draw their
+connections from one process-wide urllib3 pool instead, so a connection to a host is kept alive and reused by every
+management client, data-plane client and helper of the process.
+
+The number of connections kept per host is set with `http_pool_size` in the `[core]` section of the CLI config
+(default 10). Proxies are taken from the environment as usual, and certificate verification follows
+`AZURE_CLI_DISABLE_CONNECTION_VERIFICATION`.
+"""
+
+import threading
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+# the number of hosts to keep connections to
+_POOL_HOSTS = 10
+
+_lock = threading.Lock()
+_pool_manager = None
+_proxy_managers = {}
+_local = threading.local()
+_adapter_type = None
+_sender_type = None
+
+
+def _get_pool_size(cli_ctx):
+    if cli_ctx is None:
+        return DEFAULT_POOL_SIZE
+    try:
+        return max(1, cli_ctx.config.getint('core', 'http_pool_size', fallback=DEFAULT_POOL_SIZE))
+    except ValueError:
+        logger.warning("Ignoring invalid value of 'http_pool_size' in the [core] section of the CLI config.")
+        return DEFAULT_POOL_SIZE
+
+
+def _get_pool_manager(cli_ctx=None):
+    global _pool_manager  # pylint: disable=global-statement
+    with _lock:
+        if _pool_manager is None:
+            from urllib3.poolmanager import PoolManager
+            pool_size = _get_pool_size(cli_ctx)
+            logger.debug('Creating the shared HTTP connection pool with %d connections per host.', pool_size)
+            _pool_manager = PoolManager(num_pools=_POOL_HOSTS, maxsize=pool_size)
+        return _pool_manager
+
+
+def _get_adapter_type():
+    global _adapter_type  # pylint: disable=global-statement
+    if _adapter_type is None:
+        from requests.adapters import HTTPAdapter
+
+        class PooledHTTPAdapter(HTTPAdapter):
+            """ An adapter which sends requests over the shared connection pool. Its retry settings remain its own. """
+
+            def __init__(self, cli_ctx=None, **kwargs):
+                self._cli_ctx = cli_ctx
+                super(PooledHTTPAdapter, self).__init__(**kwargs)
+                self.proxy_manager = _proxy_managers
+
+            def init_poolmanager(self, *args, **kwargs):  # pylint: disable=unused-argument
+                self.poolmanager = _get_pool_manager(self._cli_ctx)
+
+            def close(self):
+                # the shared connections live as long as the process
+                pass
+
+        _adapter_type = PooledHTTPAdapter
+    return _adapter_type
+
+
+def _get_sender_type():
+    global _sender_type  # pylint: disable=global-statement
+    if _sender_type is None:
+        from msrest.universal_http.requests import RequestsHTTPSender
+
+        class PooledRequestsHTTPSender(RequestsHTTPSender):
+
+            def __init__(self, cli_ctx, config=None):
+                self._cli_ctx = cli_ctx
+                super(PooledRequestsHTTPSender, self).__init__(config)
+
+            def _init_session(self, session):
+                mount_pooled_adapters(session, self._cli_ctx)
+                super(PooledRequestsHTTPSender, self)._init_session(session)
+
+        _sender_type = PooledRequestsHTTPSender
+    return _sender_type
+
+
+def mount_pooled_adapters(session, cli_ctx=None):
+    """ Make `session` send its HTTP and HTTPS requests over the shared connection pool. """
+    adapter_type = _get_adapter_type()
+    for prefix in ('https://', 'http://'):
+        adapter = adapter_type(cli_ctx=cli_ctx)
+        previous = session.adapters.get(prefix)
+        if previous is not None:
+            adapter.max_retries = previous.max_retries
+        session.mount(prefix, adapter)
+    return session
+
+
+def new_session(cli_ctx=None):
+    """ A new `requests.Session` over the shared connection pool. Use it for a client which keeps its own session. """
+    import requests
+    from azure.cli.core.util import should_disable_connection_verify
+    session = mount_pooled_adapters(requests.Session(), cli_ctx)
+    session.verify = not should_disable_connection_verify()
+    return session
+
+
+def get_session(cli_ctx=None):
+    """ The `requests.Session` of the current thread over the shared connection pool. Use it instead of the functions
+    of `requests`, e.g. `get_session(cli_ctx).get(url)` instead of `requests.get(url)`. """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = new_session(cli_ctx)
+    return session
+
+
+def configure_service_client(cli_ctx, client):
+    """ Make the msrest based `client` send its requests over the shared connection pool and keep its connections
+    alive between requests. """
+    try:
+        from msrest.universal_http.requests import RequestsHTTPSender
+        sender = client.config.pipeline._sender  # pylint: disable=protected-access
+    except (ImportError, AttributeError):
+        return
+    if type(sender.driver) is RequestsHTTPSender:  # pylint: disable=unidiomatic-typecheck
+        sender.driver = _get_sender_type()(cli_ctx, client.config)
+        client.config.keep_alive = True
@@ -7,6 +7,7 @@ from __future__ import print_function
 
 import sys
 import difflib
+from collections import OrderedDict
 
 import argparse
 import argcomplete
@@ -49,12 +50,33 @@ class AzCompletionFinder(argcomplete.CompletionFinder):
                                                                                        last_wordbreak_pos)
 
 
+class _LazyParserMap(OrderedDict):
+    """ The parsers of a group by name. Looking up a command parser adds its arguments if they weren't yet. """
+
+    def __getitem__(self, key):
+        parser = super(_LazyParserMap, self).__getitem__(key)
+        if isinstance(parser, AzCliCommandParser):
+            parser.load_command_arguments()
+        return parser
+
+
+class AzCliSubParsersAction(argparse._SubParsersAction):  # pylint: disable=protected-access
+    """ Subparsers action whose command parsers get their arguments only when argparse or argcomplete descends into
+    them. Listing the commands of a group, for help or completion, only needs their name and description. """
+
+    def __init__(self, *args, **kwargs):
+        super(AzCliSubParsersAction, self).__init__(*args, **kwargs)
+        self._name_parser_map = self.choices = _LazyParserMap()
+
+
 class AzCliCommandParser(CLICommandParser):
     """ArgumentParser implementation specialized for the Azure CLI utility."""
 
     def __init__(self, cli_ctx=None, cli_help=None, **kwargs):
         self.command_source = kwargs.pop('_command_source', None)
+        self._pending_command = None
         super(AzCliCommandParser, self).__init__(cli_ctx, cli_help=cli_help, **kwargs)
+        self.register('action', 'parsers', AzCliSubParsersAction)
 
     def load_command_table(self, command_loader):
         """Load a command table into our parser."""
@@ -90,41 +112,51 @@ class AzCliCommandParser(CLICommandParser):
                                                   cli_help=self.cli_help,
                                                   _command_source=metadata.command_source)
             command_parser.cli_ctx = self.cli_ctx
-            command_validator = metadata.validator
-            argument_validators = []
-            argument_groups = {}
-            for _, arg in metadata.arguments.items():
-                # don't add deprecated arguments to the parser
-                deprecate_info = arg.type.settings.get('deprecate_info', None)
-                if deprecate_info and deprecate_info.expired():
-                    continue
-
-                if arg.validator:
-                    argument_validators.append(arg.validator)
-                try:
-                    if arg.arg_group:
-                        try:
-                            group = argument_groups[arg.arg_group]
-                        except KeyError:
-                            # group not found so create
-                            group_name = '{} Arguments'.format(arg.arg_group)
-                            group = command_parser.add_argument_group(arg.arg_group, group_name)
-                            argument_groups[arg.arg_group] = group
-                        param = AzCliCommandParser._add_argument(group, arg)
-                    else:
-                        param = AzCliCommandParser._add_argument(command_parser, arg)
-                except argparse.ArgumentError as ex:
-                    raise CLIError("command authoring error for '{}': '{}' {}".format(
-                        command_name, ex.args[0].dest, ex.message))  # pylint: disable=no-member
-                param.completer = arg.completer
-                param.deprecate_info = arg.deprecate_info
             command_parser.set_defaults(
                 func=metadata,
                 command=command_name,
                 _cmd=metadata,
-                _command_validator=command_validator,
-                _argument_validators=argument_validators,
+                _command_validator=metadata.validator,
+                _argument_validators=[],
                 _parser=command_parser)
+            # the arguments are added by load_command_arguments once the command parser is looked up
+            command_parser._pending_command = (command_name, metadata)  # pylint: disable=protected-access
+
+    def load_command_arguments(self):
+        """ Add the arguments of the command this parser was created for, if they weren't added yet. """
+        if not self._pending_command:
+            return
+        command_name, metadata = self._pending_command
+        self._pending_command = None
+
+        argument_validators = []
+        argument_groups = {}
+        for _, arg in metadata.arguments.items():
+            # don't add deprecated arguments to the parser
+            deprecate_info = arg.type.settings.get('deprecate_info', None)
+            if deprecate_info and deprecate_info.expired():
+                continue
+
+            if arg.validator:
+                argument_validators.append(arg.validator)
+            try:
+                if arg.arg_group:
+                    try:
+                        group = argument_groups[arg.arg_group]
+                    except KeyError:
+                        # group not found so create
+                        group_name = '{} Arguments'.format(arg.arg_group)
+                        group = self.add_argument_group(arg.arg_group, group_name)
+                        argument_groups[arg.arg_group] = group
+                    param = AzCliCommandParser._add_argument(group, arg)
+                else:
+                    param = AzCliCommandParser._add_argument(self, arg)
+            except argparse.ArgumentError as ex:
+                raise CLIError("command authoring error for '{}': '{}' {}".format(
+                    command_name, ex.args[0].dest, ex.message))  # pylint: disable=no-member
+            param.completer = arg.completer
+            param.deprecate_info = arg.deprecate_info
+        self.set_defaults(_argument_validators=argument_validators)
 
     def validation_error(self, message):
         telemetry.set_user_fault('validation error')
@@ -0,0 +1,143 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Startup profiler
+
+Records the time spent in each phase of an invocation (session load, cloud config, command module import, argument
+registration, parser construction, argument parsing, validators, command execution, HTTP requests and output
+formatting) and dumps the breakdown as JSON when the invocation ends. It is enabled with the `--profile-startup` global
+flag or the AZURE_CLI_PROFILE_STARTUP environment variable, and can additionally collect a cProfile of the whole
+invocation. Every function of this module is a no-op unless the profiler was started.
+"""
+
+from __future__ import print_function
+
+import json
+import sys
+import timeit
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import azure.cli.core.decorators as decorators
+
+PROFILE_STARTUP_FLAG = '--profile-startup'
+# path of the file to write the timings to, the timings are written to stderr when only the flag is used
+ENV_PROFILE_STARTUP = 'AZURE_CLI_PROFILE_STARTUP'
+# path of the file to write the cProfile statistics to, loadable with pstats
+ENV_PROFILE_STARTUP_PSTATS = 'AZURE_CLI_PROFILE_STARTUP_PSTATS'
+
+
+class StartupProfile(object):  # pylint: disable=too-many-instance-attributes
+    def __init__(self, output_file=None, pstats_file=None):
+        self.output_file = output_file
+        self.pstats_file = pstats_file
+        self.start_time = timeit.default_timer()
+        self.command = None
+        self.phases = OrderedDict()
+        self.modules = OrderedDict()
+        self.extensions = OrderedDict()
+        self.http_requests = 0
+        self.http_time = 0.0
+        self.profiler = None
+        if pstats_file:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def add_phase_time(self, name, elapsed_time):
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed_time
+
+    def generate_payload(self):
+        def _round(seconds):
+            return round(seconds, 4)
+
+        return OrderedDict([
+            ('command', self.command),
+            ('totalTime', _round(timeit.default_timer() - self.start_time)),
+            ('phases', OrderedDict((k, _round(v)) for k, v in self.phases.items())),
+            ('commandModules', OrderedDict((k, _round(v)) for k, v in self.modules.items())),
+            ('extensions', OrderedDict((k, _round(v)) for k, v in self.extensions.items())),
+            ('http', OrderedDict([('requests', self.http_requests), ('time', _round(self.http_time))])),
+            ('pstats', self.pstats_file)
+        ])
+
+
+_profile = None
+
+
+# public api
+
+
+def parse_args(args, environ):
+    """ Remove the `--profile-startup` flag from `args` and read the profiler settings from the environment.
+
+    :return: a tuple of (remaining args, whether profiling is enabled, timings file, pstats file)
+    """
+    enabled = PROFILE_STARTUP_FLAG in args
+    args = [a for a in args if a != PROFILE_STARTUP_FLAG]
+    output_file = environ.get(ENV_PROFILE_STARTUP) or None
+    pstats_file = environ.get(ENV_PROFILE_STARTUP_PSTATS) or None
+    return args, bool(enabled or output_file or pstats_file), output_file, pstats_file
+
+
+def start(output_file=None, pstats_file=None):
+    global _profile  # pylint: disable=global-statement
+    _profile = StartupProfile(output_file=output_file, pstats_file=pstats_file)
+
+
+def is_enabled():
+    return _profile is not None
+
+
+@contextmanager
+def phase(name):
+    """ Add the time spent in the block to the phase `name`. A phase entered several times accumulates its times. """
+    if _profile is None:
+        yield
+        return
+    start_time = timeit.default_timer()
+    try:
+        yield
+    finally:
+        _profile.add_phase_time(name, timeit.default_timer() - start_time)
+
+
+def set_command(command):
+    if _profile is not None:
+        _profile.command = command
+
+
+def set_module_load_time(name, elapsed_time, extension=False):
+    if _profile is not None:
+        (_profile.extensions if extension else _profile.modules)[name] = elapsed_time
+
+
+def http_response_hook(response, *args, **kwargs):  # pylint: disable=unused-argument
+    """ A `requests` response hook which adds the round trip of each response to the HTTP timings. """
+    if _profile is not None:
+        _profile.http_requests += 1
+        _profile.http_time += response.elapsed.total_seconds()
+    return response
+
+
+@decorators.suppress_all_exceptions()
+def conclude():
+    """ Stop the profiler and write the timings as JSON and, if requested, the cProfile statistics. """
+    global _profile  # pylint: disable=global-statement
+    if _profile is None:
+        return
+    profile, _profile = _profile, None
+
+    if profile.profiler:
+        profile.profiler.disable()
+        profile.profiler.dump_stats(profile.pstats_file)
+
+    payload = json.dumps(profile.generate_payload(), indent=2)
+    if profile.output_file:
+        with open(profile.output_file, 'w') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload, file=sys.stderr)
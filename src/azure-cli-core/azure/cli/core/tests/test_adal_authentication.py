@@ -0,0 +1,83 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import threading
+import time
+import unittest
+import mock
+
+from azure.cli.core.adal_authentication import AdalAuthentication, TokenRefreshTimer, get_token_expiry
+
+
+def _token_entry(seconds_left):
+    expires_on = datetime.datetime.now() + datetime.timedelta(seconds=seconds_left)
+    return {'accessToken': 'token', 'expiresOn': str(expires_on)}
+
+
+class TestAdalAuthentication(unittest.TestCase):
+
+    def test_get_token_expiry(self):
+        self.assertAlmostEqual(get_token_expiry(_token_entry(3600)), time.time() + 3600, delta=2)
+        self.assertAlmostEqual(get_token_expiry({'expiresOn': '2038-01-01 00:00:00'}),
+                               time.mktime(datetime.datetime(2038, 1, 1).timetuple()))
+        self.assertEqual(get_token_expiry({'expires_on': '1500000000'}), 1500000000)
+        self.assertIsNone(get_token_expiry({'accessToken': 'token'}))
+        self.assertIsNone(get_token_expiry(None))
+
+    def test_signed_session_reuses_token(self):
+        retriever = mock.MagicMock(return_value=('Bearer', 'token1', _token_entry(3600)))
+        auth = AdalAuthentication(retriever)
+        self.addCleanup(auth._refresh_timer.cancel)
+
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token1')
+        retriever.return_value = ('Bearer', 'token2', _token_entry(3600))
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token1')
+        self.assertEqual(retriever.call_count, 1)
+
+    def test_signed_session_retrieves_token_close_to_expiry(self):
+        retriever = mock.MagicMock(return_value=('Bearer', 'token1', _token_entry(60)))
+        auth = AdalAuthentication(retriever)
+
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token1')
+        retriever.return_value = ('Bearer', 'token2', {'accessToken': 'token2'})
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token2')
+        # without a known expiry the token is retrieved for every request
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token2')
+        self.assertEqual(retriever.call_count, 3)
+
+    def test_token_refreshed_in_background(self):
+        refreshed = threading.Event()
+        entries = [_token_entry(3600)]
+
+        def _refresh():
+            refreshed.set()
+            return entries.pop()
+
+        timer = TokenRefreshTimer(_refresh, refresh_margin=3599)
+        self.addCleanup(timer.cancel)
+        self.assertTrue(timer.schedule(_token_entry(3600)))
+        self.assertTrue(refreshed.wait(5))
+
+        # a token which expires within the margin can't be refreshed ahead of time
+        self.assertFalse(TokenRefreshTimer(_refresh).schedule(_token_entry(60)))
+
+    def test_background_refresh_stops_when_unused(self):
+        retriever = mock.MagicMock(return_value=('Bearer', 'token1', _token_entry(3600)))
+        auth = AdalAuthentication(retriever)
+        self.addCleanup(auth._refresh_timer.cancel)
+        auth.signed_session()
+
+        retriever.return_value = ('Bearer', 'token2', _token_entry(3600))
+        self.assertIsNotNone(auth._refresh_in_background())
+        self.assertEqual(auth.signed_session().headers['Authorization'], 'Bearer token2')
+        self.assertIsNotNone(auth._refresh_in_background())
+        # not used since the last refresh
+        self.assertIsNone(auth._refresh_in_background())
+        self.assertEqual(retriever.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import unittest
+
+import mock
+from six import StringIO
+
+import azure.cli.core.batch as batch
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_batch_parse_args(self):
+        self.assertEqual(batch.parse_args(['--stdin-commands', '-o', 'tsv']), (['-o', 'tsv'], True))
+        self.assertEqual(batch.parse_args(['vm', 'list']), (['vm', 'list'], False))
+
+    def test_batch_get_command_args(self):
+        self.assertEqual(batch.get_command_args('az vm list -g "my group"\n'), ['vm', 'list', '-g', 'my group'])
+        self.assertEqual(batch.get_command_args('vm list'), ['vm', 'list'])
+        self.assertIsNone(batch.get_command_args('  \n'))
+        self.assertIsNone(batch.get_command_args('# az vm list'))
+        with self.assertRaises(ValueError):
+            batch.get_command_args('vm list -g "my group')
+
+    def test_batch_run_commands(self):
+        def _invoke(args, out_file=None):
+            if args[0] == 'fail':
+                return cli_ctx.exception_handler(ValueError('bad things'))
+            if args[0] == 'help':
+                print('some help')
+                raise SystemExit(0)
+            out_file.write(json.dumps({'args': args}))
+            return 0
+
+        cli_ctx = mock.MagicMock()
+        cli_ctx.invoke.side_effect = _invoke
+        cli_ctx.exception_handler.return_value = 1
+        out_file = StringIO()
+        lines = ['az vm list\n', '\n', '# skipped\n', 'fail now\n', 'help\n', 'vm "list\n', 'vm show']
+        exit_code = batch.run_commands(cli_ctx, lines, out_file, extra_args=['-o', 'json'])
+
+        results = [json.loads(line) for line in out_file.getvalue().splitlines()]
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0], {'command': 'az vm list', 'exitCode': 0, 'error': None,
+                                      'result': {'args': ['vm', 'list', '-o', 'json']}})
+        self.assertEqual(results[1]['exitCode'], 1)
+        self.assertEqual(results[1]['error'], 'bad things')
+        self.assertEqual(results[2]['result'], 'some help\n')
+        self.assertEqual(results[2]['exitCode'], 0)
+        self.assertEqual(results[3]['exitCode'], 2)
+        self.assertEqual(results[4]['exitCode'], 0)
+        # the batch fails when a command failed
+        self.assertEqual(exit_code, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+import mock
+
+from azure.cli.core.commands.client_factory import _get_mgmt_service_client, get_client_pool
+from azure.cli.core.mock import DummyCli
+
+
+class _ClientStub(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, credentials, subscription_id=None, **kwargs):
+        self.credentials = credentials
+        self.subscription_id = subscription_id
+        self.kwargs = kwargs
+        self.config = mock.MagicMock()
+        self._client = mock.MagicMock()
+
+
+class TestClientPool(unittest.TestCase):
+
+    @mock.patch('azure.cli.core._profile.Profile.get_login_credentials', autospec=True)
+    def test_client_pool(self, get_login_credentials):
+        get_login_credentials.return_value = ('creds', 'sub1', 'tenant')
+        cli = DummyCli()
+        cli.refresh_request_id()
+
+        client, subscription_id = _get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01')
+        self.assertEqual(subscription_id, 'sub1')
+        self.assertIs(_get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01')[0], client)
+        # a different api-version, subscription or keyword argument builds another client
+        self.assertIsNot(_get_mgmt_service_client(cli, _ClientStub, api_version='2017-01-01')[0], client)
+        self.assertIsNot(_get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01',
+                                                  subscription_id='sub2')[0], client)
+        self.assertIsNot(_get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01', polling=False)[0],
+                         client)
+        pool = get_client_pool(cli)
+        self.assertEqual((pool.hits, pool.misses), (1, 4))
+        self.assertEqual(get_login_credentials.call_count, 4)
+
+        # clients aren't shared across threads
+        other_thread_clients = []
+        thread = threading.Thread(target=lambda: other_thread_clients.append(
+            _get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01')[0]))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread_clients[0], client)
+
+        # the next command starts with an empty pool
+        cli.refresh_request_id()
+        self.assertIsNot(_get_mgmt_service_client(cli, _ClientStub, api_version='2018-01-01')[0], client)
+        self.assertEqual(len(get_client_pool(cli)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,10 @@ def _prepare_test_commands_loader(loader_cls, cli_ctx, command):
     return loader
 
 
+def _validate_vm_name(namespace):
+    pass
+
+
 class TestCommandRegistration(unittest.TestCase):
 
     @classmethod
@@ -220,6 +224,152 @@ class TestCommandRegistration(unittest.TestCase):
         self.assertTrue(isinstance(ext2.command_source, ExtensionCommandSource))
         self.assertTrue(ext2.command_source.overrides_command)
 
+    @mock.patch('importlib.import_module', _mock_import_lib)
+    @mock.patch('pkgutil.iter_modules', _mock_iter_modules)
+    @mock.patch('azure.cli.core.commands._load_command_loader', _mock_load_command_loader)
+    @mock.patch('azure.cli.core.extension.get_extension_modname', _mock_extension_modname)
+    @mock.patch('azure.cli.core.extension.get_extensions', _mock_get_extensions)
+    def test_command_index(self):
+        import os
+        import shutil
+        import tempfile
+        from azure.cli.core import CommandIndex
+        from azure.cli.core._session import INDEX
+
+        cli = DummyCli()
+        index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, index_dir)
+        INDEX.load(os.path.join(index_dir, 'commandIndex.json'))
+        ext_names = [__name__ + '.ExtCommandsLoader', __name__ + '.Ext2CommandsLoader']
+
+        # nothing indexed yet, so everything is loaded and the index is built
+        self.assertIsNone(CommandIndex(cli).get(['hello', 'world']))
+        cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+        self.assertIn('hello noodle', cmd_tbl)
+        self.assertEqual(CommandIndex(cli).get(['hello', 'world']), ([__name__], ext_names))
+        self.assertIsNone(CommandIndex(cli).get(['--help']))
+        self.assertIsNone(CommandIndex(cli).get([]))
+
+        # the index is used, so installed command modules aren't enumerated
+        with mock.patch('pkgutil.iter_modules') as iter_modules_mock:
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            iter_modules_mock.assert_not_called()
+        self.assertIn('hello world', cmd_tbl)
+
+        # a stale index falls back to loading everything
+        INDEX.data['commandIndex']['hello'] = {'modules': [], 'extensions': []}
+        cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+        self.assertIn('hello world', cmd_tbl)
+        self.assertEqual(CommandIndex(cli).get(['hello', 'world']), ([__name__], ext_names))
+
+        # an index built for another CLI version is ignored
+        INDEX.data['signature']['version'] = '0.0.1'
+        self.assertIsNone(CommandIndex(cli).get(['hello', 'world']))
+
+        CommandIndex(cli).invalidate()
+        self.assertIsNone(CommandIndex(cli).get(['hello', 'world']))
+
+    def test_argument_cache(self):
+        import os
+        import shutil
+        import tempfile
+        from azure.cli.core.commands.argument_cache import ArgumentCache
+        from azure.cli.core.commands.parameters import get_enum_type
+
+        def _closure_validator(namespace):
+            pass
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                super(TestCommandsLoader, self).load_command_table(args)
+                operations_tmpl = '{}#TestCommandRegistration.{{}}'.format(__name__)
+                with self.command_group('test', operations_tmpl=operations_tmpl) as g:
+                    g.command('vm-get', 'sample_vm_get')
+                    g.command('vm-get-2', 'sample_vm_get')
+                return self.command_table
+
+            def load_arguments(self, command):
+                super(TestCommandsLoader, self).load_arguments(command)
+                with self.argument_context('test') as c:
+                    c.argument('vm_name', options_list=('--vm-name', '-n'), validator=_validate_vm_name)
+                    c.argument('expand', arg_type=get_enum_type(['instanceView', 'none']))
+                with self.argument_context('test vm-get') as c:
+                    c.extra('added_param', options_list=['--added-param'], type=int, default=3)
+                with self.argument_context('test vm-get-2') as c:
+                    c.argument('opt_param', validator=_closure_validator)
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cli = DummyCli()
+
+        def _load_arguments(command):
+            main_loader = MainCommandsLoader(cli)
+            loader = TestCommandsLoader(cli)
+            main_loader.command_table = loader.load_command_table(None)
+            main_loader.cmd_to_loader_map = {name: [loader] for name in main_loader.command_table}
+            cli.invocation = mock.MagicMock()
+            cli.invocation.commands_loader = main_loader
+            with mock.patch.object(ArgumentCache, '_CACHE_DIR', cache_dir), \
+                    mock.patch.object(TestCommandsLoader, 'load_arguments', autospec=True,
+                                      side_effect=TestCommandsLoader.load_arguments) as load_arguments_mock:
+                main_loader.load_arguments(command)
+            return main_loader.command_table[command].arguments, load_arguments_mock.called
+
+        def _get_settings(arguments):
+            return {name: {k: v for k, v in arg.type.settings.items() if k != 'completer'}
+                    for name, arg in arguments.items()}
+
+        # the arguments are registered and cached on the first load, then read from the cache
+        arguments, registered = _load_arguments('test vm-get')
+        self.assertTrue(registered)
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, 'test.vm-get.json')))
+        cached_arguments, registered = _load_arguments('test vm-get')
+        self.assertFalse(registered)
+        self.assertEqual(list(cached_arguments), list(arguments))
+        self.assertEqual(_get_settings(cached_arguments), _get_settings(arguments))
+        self.assertIs(cached_arguments['vm_name'].type.settings['validator'], _validate_vm_name)
+        self.assertEqual(cached_arguments['added_param'].type.settings['default'], 3)
+
+        # a cache built for another CLI version is ignored
+        with mock.patch('azure.cli.core.__version__', '0.0.1'):
+            _, registered = _load_arguments('test vm-get')
+        self.assertTrue(registered)
+
+        # the cache is keyed on the source files of the command module
+        module_files = ArgumentCache._get_module_files(TestCommandsLoader(cli))
+        self.assertIn(os.path.abspath(__file__).replace('.pyc', '.py'), [os.path.abspath(f) for f, _ in module_files])
+        module_files[0][1] += 1
+        with mock.patch.object(ArgumentCache, '_get_module_files', return_value=module_files):
+            _, registered = _load_arguments('test vm-get')
+        self.assertTrue(registered)
+
+        # a command with an argument setting which can't be imported back isn't cached
+        _load_arguments('test vm-get-2')
+        self.assertFalse(os.path.isfile(os.path.join(cache_dir, 'test.vm-get-2.json')))
+
+    def test_load_help_for_command_path(self):
+        cli = DummyCli()
+        main_loader = MainCommandsLoader(cli)
+        for name in ['hello world', 'hello2 world']:
+            loader = AzCommandsLoader(cli)
+            loader.command_table = {name: None}
+            main_loader.loaders.append(loader)
+
+        with mock.patch('importlib.import_module') as import_module_mock:
+            main_loader.load_help('hello')
+            import_module_mock.assert_called_once_with('azure.cli.core._help')
+
+            import_module_mock.reset_mock()
+            main_loader.load_help()
+            import_module_mock.assert_called_once_with('azure.cli.core._help')
+            self.assertTrue(all(loader._help_loaded for loader in main_loader.loaders))
+
+            # help modules are imported only once
+            import_module_mock.reset_mock()
+            main_loader.load_help()
+            import_module_mock.assert_not_called()
+
     def test_argument_with_overrides(self):
 
         global_vm_name_type = CLIArgumentType(
@@ -232,7 +382,8 @@ class TestCommandRegistration(unittest.TestCase):
 
             def load_command_table(self, args):
                 super(TestCommandsLoader, self).load_command_table(args)
-                with self.command_group('test', operations_tmpl='{}#TestCommandRegistration.{{}}'.format(__name__)) as g:
+                operations_tmpl = '{}#TestCommandRegistration.{{}}'.format(__name__)
+                with self.command_group('test', operations_tmpl=operations_tmpl) as g:
                     g.command('vm-get', 'sample_vm_get')
                     g.command('command vm-get-1', 'sample_vm_get')
                     g.command('command vm-get-2', 'sample_vm_get')
@@ -0,0 +1,62 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+from azure.cli.core.commands.command_trie import CommandTrie
+
+
+class TestCommandTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = CommandTrie([
+            'network application-gateway create',
+            'network application-gateway delete',
+            'network list-usages',
+            'storage account create',
+            'storage account list',
+            'vm create',
+            'vmss create'
+        ])
+
+    def test_command_trie_contains(self):
+        self.assertEqual(len(self.trie), 7)
+        self.assertIn('network list-usages', self.trie)
+        self.assertNotIn('network', self.trie)
+        self.assertNotIn('network list', self.trie)
+        self.assertTrue(self.trie.is_group([]))
+        self.assertTrue(self.trie.is_group(['network', 'application-gateway']))
+        self.assertFalse(self.trie.is_group(['vm', 'create']))
+        self.assertFalse(self.trie.is_group(['vmm']))
+
+    def test_command_trie_longest_prefix(self):
+        self.assertEqual(self.trie.longest_prefix(['vm', 'create', 'myvm']), ['vm', 'create'])
+        self.assertEqual(self.trie.longest_prefix(['storage', 'account']), ['storage', 'account'])
+        # partial words are not matched
+        self.assertEqual(self.trie.longest_prefix(['vm', 'cr']), ['vm'])
+        self.assertEqual(self.trie.longest_prefix(['vmm']), [])
+        self.assertEqual(self.trie.longest_prefix([]), [])
+
+    def test_command_trie_groups(self):
+        self.assertEqual(self.trie.children([]), ['network', 'storage', 'vm', 'vmss'])
+        self.assertEqual(self.trie.children(['network']), ['application-gateway', 'list-usages'])
+        self.assertEqual(self.trie.children(['missing']), [])
+        self.assertEqual(sorted(self.trie.commands(['network'])),
+                         ['network application-gateway create', 'network application-gateway delete',
+                          'network list-usages'])
+        self.assertEqual(len(self.trie.commands()), 7)
+
+        representatives = self.trie.child_representatives(['network'])
+        self.assertEqual(len(representatives), 2)
+        self.assertIn('network list-usages', representatives)
+        self.assertTrue(any(r.startswith('network application-gateway ') for r in representatives))
+        # 'vmss create' doesn't belong to the 'vm' group
+        self.assertEqual(self.trie.child_representatives(['vm']), ['vm create'])
+        self.assertEqual(sorted(r.split()[0] for r in self.trie.child_representatives([])),
+                         ['network', 'storage', 'vm', 'vmss'])
+
+
+if __name__ == '__main__':
+    unittest.main()
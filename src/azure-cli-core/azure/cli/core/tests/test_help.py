@@ -8,7 +8,7 @@ from __future__ import print_function
 import logging
 import unittest
 
-from azure.cli.core._help import ArgumentGroupRegistry, CliCommandHelpFile
+from azure.cli.core._help import ArgumentGroupRegistry, CliCommandHelpFile, HelpStore
 from azure.cli.core.mock import DummyCli
 
 from knack.help import HelpObject, GroupHelpFile, HelpAuthoringException
@@ -58,6 +58,63 @@ class HelpTest(unittest.TestCase):
             except Exception as ex:
                 raise HelpAuthoringException('{}, {}'.format(name, ex))
 
+    def test_help_store(self):
+        import mock
+        import os
+        import shutil
+        import tempfile
+
+        help_entries = {
+            'test group': """
+                type: group
+                short-summary: A test group.
+            """,
+            'test group cmd': """
+                type: command
+                short-summary: A test command.
+                examples:
+                    - name: Run the command.
+                      text: az test group cmd
+                      min_profile: 2017-03-09
+            """,
+            'test invalid': 'Not: valid: yaml',
+            'test empty': ''
+        }
+        temp_dir = tempfile.mkdtemp()
+        try:
+            help_store = HelpStore(DummyCli())
+            help_store.path = os.path.join(temp_dir, 'helpStore.dat')
+            self.assertFalse(help_store.is_valid())
+
+            self.assertTrue(help_store.is_writable())
+            help_store.build(help_entries)
+            self.assertTrue(help_store.is_valid())
+            self.assertEqual(os.listdir(temp_dir), ['helpStore.dat'])
+            self.assertEqual(sorted(help_store.keys()), sorted(help_entries))
+            self.assertEqual(help_store.get('test group'), {'type': 'group', 'short-summary': 'A test group.'})
+            cmd_help = help_store.get('test group cmd')
+            self.assertEqual(cmd_help['short-summary'], 'A test command.')
+            self.assertEqual(cmd_help['examples'][0]['min_profile'], '2017-03-09')
+            self.assertEqual(help_store.get('test invalid'), 'Not: valid: yaml')
+            self.assertIsNone(help_store.get('test empty'))
+            self.assertIsNone(help_store.get('test missing'))
+            help_store.close()
+
+            # the store is recompiled when the installation changes
+            with mock.patch.object(HelpStore, '_get_signature', return_value={'version': 'changed'}):
+                self.assertFalse(help_store.is_valid())
+                self.assertIsNone(help_store.get('test group'))
+            help_store.close()
+
+            # a store which can't be written is reported, and building it doesn't fail
+            unwritable_store = HelpStore(DummyCli())
+            unwritable_store.path = os.path.join(help_store.path, 'helpStore.dat')
+            self.assertFalse(unwritable_store.is_writable())
+            unwritable_store.build(help_entries)
+            self.assertFalse(unwritable_store.is_valid())
+        finally:
+            shutil.rmtree(temp_dir)
+
 
 def _store_parsers(parser, d):
     for s in parser.subparsers.values():
@@ -0,0 +1,61 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+from six.moves import BaseHTTPServer, socketserver
+
+from azure.cli.core.http_pool import get_session, new_session
+
+
+class _KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        _KeepAliveHandler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    # the kept-alive connections stay open after the test
+    daemon_threads = True
+
+
+class TestHttpPool(unittest.TestCase):
+
+    def setUp(self):
+        _KeepAliveHandler.connections.clear()
+        self.server = _ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_sessions_share_connections(self):
+        self.assertIs(get_session(), get_session())
+        first, second = new_session(), new_session()
+        self.assertIsNot(first, second)
+        for session in (first, second, get_session()):
+            response = session.get(self.url)
+            self.assertEqual(response.text, 'ok')
+            session.close()
+        # each session sent its request over the same kept-alive connection
+        self.assertEqual(len(_KeepAliveHandler.connections), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import json
+import threading
+import time
+import unittest
+
+from six import StringIO
+
+from azure.cli.core import AzCommandsLoader
+from azure.cli.core.commands import CliCommandType
+from azure.cli.core.mock import DummyCli
+
+VM_ID = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/myRG/providers/' \
+        'Microsoft.Compute/virtualMachines/{}'
+
+_calls = []
+_calls_lock = threading.Lock()
+
+
+def sample_vm_show(resource_group_name, vm_name):
+    with _calls_lock:
+        _calls.append(vm_name)
+    # finish in the reverse order of the names, so that the results have to be put back in order
+    time.sleep(0.05 * (3 - int(vm_name[-1])))
+    if vm_name == 'vm2':
+        raise ValueError('vm2 is broken')
+    return {'resourceGroup': resource_group_name, 'name': vm_name, 'thread': threading.current_thread().name}
+
+
+class TestParallelIds(unittest.TestCase):
+
+    def setUp(self):
+        del _calls[:]
+
+    def _set_up_cli(self):
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                test_type = CliCommandType(operations_tmpl='{}#{{}}'.format(__name__))
+                with self.command_group('test', test_type) as g:
+                    g.command('vm show', 'sample_vm_show')
+                return self.command_table
+
+            def load_arguments(self, command):
+                self.command_table[command].load_arguments()  # this loads the arguments via reflection
+                with self.argument_context('test') as c:
+                    c.argument('resource_group_name', options_list=['--resource-group', '-g'],
+                               id_part='resource_group')
+                    c.argument('vm_name', options_list=['--name', '-n'], id_part='name')
+                self._update_command_definitions()  # pylint: disable=protected-access
+        return DummyCli(commands_loader_cls=TestCommandsLoader)
+
+    def test_parallel_ids_keep_order(self):
+        out = StringIO()
+        cli = self._set_up_cli()
+        exit_code = cli.invoke(['test', 'vm', 'show', '--ids', VM_ID.format('vm0'), VM_ID.format('vm1'),
+                                '--parallel', '2', '-o', 'json'], out_file=out)
+        self.assertEqual(exit_code, 0)
+        results = json.loads(out.getvalue())
+        self.assertEqual([r['name'] for r in results], ['vm0', 'vm1'])
+        self.assertTrue(all(r['resourceGroup'] == 'myRG' for r in results))
+        self.assertNotEqual(results[0]['thread'], results[1]['thread'])
+
+    def test_parallel_ids_failures_dont_stop_the_batch(self):
+        out = StringIO()
+        cli = self._set_up_cli()
+        exit_code = cli.invoke(['test', 'vm', 'show', '--ids', VM_ID.format('vm0'), VM_ID.format('vm2'),
+                                VM_ID.format('vm1'), '--parallel', '3'], out_file=out)
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(sorted(_calls), ['vm0', 'vm1', 'vm2'])
+        self.assertEqual(out.getvalue(), '')
+
+    def test_sequential_ids_stop_at_first_failure(self):
+        cli = self._set_up_cli()
+        exit_code = cli.invoke(['test', 'vm', 'show', '--ids', VM_ID.format('vm2'), VM_ID.format('vm1')],
+                               out_file=StringIO())
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(_calls, ['vm2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
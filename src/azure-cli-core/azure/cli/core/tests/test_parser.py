@@ -76,6 +76,36 @@ class TestParser(unittest.TestCase):
         parser.parse_args('test command'.split())
         self.assertTrue(AzCliCommandParser.error.called)
 
+    def test_command_arguments_loaded_lazily(self):
+        def test_handler(args):  # pylint: disable=unused-argument
+            pass
+
+        cli = DummyCli()
+        cli.loader = mock.MagicMock()
+        cli.loader.cli_ctx = cli
+
+        command = AzCliCommand(cli.loader, 'test command', test_handler)
+        command.add_argument('req', '--req', required=True)
+        command2 = AzCliCommand(cli.loader, 'test command2', test_handler)
+        command2.add_argument('opt', '--opt')
+        cli.commands_loader.command_table = {'test command': command, 'test command2': command2}
+
+        parser = AzCliCommandParser(cli)
+        parser.load_command_table(cli.commands_loader)
+        group_parsers = parser.subparsers[('test',)]._name_parser_map
+        command_parser = dict.__getitem__(group_parsers, 'command')
+        command2_parser = dict.__getitem__(group_parsers, 'command2')
+        # listing the commands of a group doesn't add their arguments
+        self.assertEqual(len(list(group_parsers.values())), 2)
+        self.assertIsNotNone(command_parser._pending_command)
+        self.assertFalse(command_parser.is_group())
+
+        args = parser.parse_args('test command --req yep'.split())
+        self.assertIs(args.func, command)
+        self.assertEqual(args.req, 'yep')
+        self.assertIsNone(command_parser._pending_command)
+        self.assertIsNotNone(command2_parser._pending_command)
+
     def test_nargs_parameter(self):
         def test_handler():
             pass
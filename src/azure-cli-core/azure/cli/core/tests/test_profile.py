@@ -9,6 +9,9 @@ import os
 import unittest
 import mock
 import re
+import shutil
+import tempfile
+import time
 
 from copy import deepcopy
 
@@ -1319,9 +1322,9 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache.retrieve_secret_of_service_principal(test_sp['servicePrincipalId']), None)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.FileLock', autospec=True)
+    def test_credscache_add_new_sp_creds(self, _, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1333,7 +1336,6 @@ class TestProfile(unittest.TestCase):
             "servicePrincipalTenant": "mytenant2",
             "accessToken": "Secret2"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1344,19 +1346,18 @@ class TestProfile(unittest.TestCase):
         token_entries = [e for _, e in creds_cache.adal_token_cache.read_items()]  # noqa: F812
         self.assertEqual(token_entries, [self.token_entry1])
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, mode=0o600)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.FileLock', autospec=True)
+    def test_credscache_add_preexisting_sp_creds(self, _, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1365,19 +1366,18 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
-        self.assertFalse(mock_open_for_write.called)
+        self.assertFalse(mock_write_file.called)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.FileLock', autospec=True)
+    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1388,19 +1388,18 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [new_creds])
-        self.assertTrue(mock_open_for_write.called)
+        self.assertTrue(mock_write_file.called)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.FileLock', autospec=True)
+    def test_credscache_remove_creds(self, _, mock_write_file, mock_read_file):
         cli = DummyCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1417,14 +1416,14 @@ class TestProfile(unittest.TestCase):
         # assert #2
         self.assertEqual(creds_cache._service_principal_creds, [])
 
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
-        self.assertEqual(mock_open_for_write.call_count, 2)
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, mode=0o600)
+        self.assertEqual(mock_write_file.call_count, 2)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._file_lock.FileLock', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_write_file, mock_read_file):  # pylint: disable=line-too-long
         cli = DummyCli()
         token_entry2 = {
             "accessToken": "new token",
@@ -1441,7 +1440,6 @@ class TestProfile(unittest.TestCase):
             return mock_adal_auth_context
 
         mock_adal_auth_context.acquire_token.side_effect = acquire_token_side_effect
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1]
         creds_cache = CredsCache(cli, auth_ctx_factory=get_auth_context, async_persist=False)
 
@@ -1455,10 +1453,108 @@ class TestProfile(unittest.TestCase):
             mock.ANY)
 
         # assert
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, mode=0o600)
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    def test_credscache_service_principal_token_cache(self, mock_read_file):
+        cli = DummyCli()
+        test_sp = {
+            "servicePrincipalId": "myapp",
+            "servicePrincipalTenant": "mytenant",
+            "accessToken": "Secret"
+        }
+        mock_read_file.return_value = [test_sp]
+        mock_auth_context = mock.MagicMock()
+        mock_auth_context.acquire_token_with_client_credentials.side_effect = [
+            {'tokenType': 'Bearer', 'accessToken': 'token1', 'expiresIn': 3599},
+            {'tokenType': 'Bearer', 'accessToken': 'token2', 'expiresIn': 3599},
+            {'tokenType': 'Bearer', 'accessToken': 'token3', 'expiresIn': 3599}
+        ]
+        mgmt_resource = 'https://management.core.windows.net/'
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+
+        def _get_creds_cache():
+            creds_cache = CredsCache(cli, auth_ctx_factory=lambda *_: mock_auth_context, async_persist=False)
+            creds_cache._sp_token_file = os.path.join(temp_dir, 'servicePrincipalTokens.json')
+            return creds_cache
+
+        # action #1, the token is acquired once and reused, also by another process
+        creds_cache = _get_creds_cache()
+        _, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+        self.assertEqual(token, 'token1')
+        _, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+        self.assertEqual(token, 'token1')
+        _, token, _ = _get_creds_cache().retrieve_token_for_service_principal('myapp', mgmt_resource)
+        self.assertEqual(token, 'token1')
+        self.assertEqual(mock_auth_context.acquire_token_with_client_credentials.call_count, 1)
+
+        # action #2, a token about to expire is renewed
+        with mock.patch('time.time', return_value=time.time() + 3500):
+            _, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+        self.assertEqual(token, 'token2')
+        self.assertEqual(mock_auth_context.acquire_token_with_client_credentials.call_count, 2)
+
+        # action #3, logging out the service principal drops its tokens
+        with mock.patch.object(creds_cache, 'persist_cached_creds', autospec=True):
+            creds_cache.remove_cached_creds('myapp')
+        creds_cache = _get_creds_cache()
+        self.assertIsNone(creds_cache._find_service_principal_token('myapp', 'mytenant', mgmt_resource))
+        _, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+        self.assertEqual(token, 'token3')
+
+    def test_credscache_indexed_token_cache(self):
+        from azure.cli.core._token_cache import IndexedTokenCache
+        token_entry2 = dict(self.token_entry1, userId=self.user2, resource='https://graph.windows.net/')
+        token_entry3 = dict(self.token_entry1, resource='https://graph.windows.net/')
+        cache = IndexedTokenCache([self.token_entry1, token_entry2])
+
+        self.assertEqual(cache.find({'userId': self.user1.upper()}), [self.token_entry1])
+        cache.add([token_entry3])
+        self.assertEqual(len(cache.find({'userId': self.user1, '_clientId': self.token_entry1['_clientId']})), 2)
+        self.assertEqual(len(cache.find({'userId': self.user1, '_clientId': 'other'})), 0)
+        self.assertEqual(len(cache.find({})), 3)
+        cache.remove([self.token_entry1])
+        self.assertEqual(cache.find({'userId': self.user1}), [token_entry3])
+
+        # only the changes are applied to the content of a token file changed by another process
+        token_entry4 = dict(self.token_entry1, userId='baz@baz.com')
+        cache.merge_into([self.token_entry1, token_entry4])
+        self.assertEqual(sorted(e['userId'] + e['resource'] for _, e in cache.read_items()),
+                         sorted([self.user1 + token_entry3['resource'], 'baz@baz.com' + self.token_entry1['resource']]))
+
+    def test_credscache_merge_token_file_changed_by_another_process(self):
+        cli = DummyCli()
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        token_file = os.path.join(temp_dir, 'accessTokens.json')
+        with open(token_file, 'w') as f:
+            json.dump([self.token_entry1], f)
+        test_sp = {
+            "servicePrincipalId": "myapp",
+            "servicePrincipalTenant": "mytenant",
+            "accessToken": "Secret"
+        }
+        token_entry2 = dict(self.token_entry1, userId=self.user2)
+
+        with mock.patch.dict('os.environ', {'AZURE_ACCESS_TOKEN_FILE': token_file}):
+            first = CredsCache(cli, async_persist=False)
+            second = CredsCache(cli, async_persist=False)
+            first.load_adal_token_cache()
+            second.load_adal_token_cache()
+
+            first.save_service_principal_cred(test_sp)
+            second.adal_token_cache.add([token_entry2])
+            second.persist_cached_creds()
+
+        with open(token_file, 'r') as f:
+            entries = json.load(f)
+        self.assertEqual(sorted(e.get('userId') or e['servicePrincipalId'] for e in entries),
+                         sorted([self.user1, self.user2, 'myapp']))
+        self.assertEqual(second._service_principal_creds, [test_sp])
+
     @mock.patch('azure.cli.core._profile.get_file_json', autospec=True)
     def test_credscache_good_error_on_file_corruption(self, mock_read_file):
         mock_read_file.side_effect = ValueError('a bad error for you')
@@ -1519,18 +1615,6 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(r.authority.url, aad_url + '/common')
 
 
-class FileHandleStub(object):  # pylint: disable=too-few-public-methods
-
-    def write(self, content):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _2, _3, _4):
-        pass
-
-
 class SubscriptionStub(Subscription):  # pylint: disable=too-few-public-methods
 
     def __init__(self, id, display_name, state, tenant_id):  # pylint: disable=redefined-builtin
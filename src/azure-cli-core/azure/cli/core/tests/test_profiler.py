@@ -0,0 +1,82 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import azure.cli.core.profiler as profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        profiler.conclude()
+        shutil.rmtree(self.temp_dir)
+
+    def test_profiler_parse_args(self):
+        args, enabled, output_file, pstats_file = profiler.parse_args(['vm', 'list', '--profile-startup'], {})
+        self.assertEqual(args, ['vm', 'list'])
+        self.assertTrue(enabled)
+        self.assertIsNone(output_file)
+        self.assertIsNone(pstats_file)
+
+        args, enabled, _, _ = profiler.parse_args(['vm', 'list'], {})
+        self.assertEqual(args, ['vm', 'list'])
+        self.assertFalse(enabled)
+
+        environ = {profiler.ENV_PROFILE_STARTUP: 'timings.json', profiler.ENV_PROFILE_STARTUP_PSTATS: 'az.pstats'}
+        args, enabled, output_file, pstats_file = profiler.parse_args(['vm', 'list'], environ)
+        self.assertTrue(enabled)
+        self.assertEqual(output_file, 'timings.json')
+        self.assertEqual(pstats_file, 'az.pstats')
+
+    def test_profiler_disabled(self):
+        self.assertFalse(profiler.is_enabled())
+        with profiler.phase('commandTable'):
+            pass
+        profiler.set_command('vm list')
+        profiler.conclude()
+
+    def test_profiler_timings(self):
+        output_file = os.path.join(self.temp_dir, 'timings.json')
+        pstats_file = os.path.join(self.temp_dir, 'az.pstats')
+        profiler.start(output_file=output_file, pstats_file=pstats_file)
+        self.assertTrue(profiler.is_enabled())
+
+        with mock.patch('timeit.default_timer', side_effect=[10.0, 10.5, 20.0, 20.25]):
+            with profiler.phase('validators'):
+                pass
+            with profiler.phase('validators'):
+                pass
+        profiler.set_command('vm list')
+        profiler.set_module_load_time('vm', 0.125)
+        profiler.set_module_load_time('myext', 0.25, extension=True)
+        response = mock.MagicMock()
+        response.elapsed.total_seconds.return_value = 1.5
+        self.assertIs(profiler.http_response_hook(response), response)
+        profiler.conclude()
+        self.assertFalse(profiler.is_enabled())
+
+        with open(output_file) as f:
+            timings = json.load(f)
+        self.assertEqual(timings['command'], 'vm list')
+        self.assertEqual(timings['phases'], {'validators': 0.75})
+        self.assertEqual(timings['commandModules'], {'vm': 0.125})
+        self.assertEqual(timings['extensions'], {'myext': 0.25})
+        self.assertEqual(timings['http'], {'requests': 1, 'time': 1.5})
+        self.assertEqual(timings['pstats'], pstats_file)
+        self.assertTrue(os.path.isfile(pstats_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
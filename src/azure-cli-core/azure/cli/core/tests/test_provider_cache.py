@@ -0,0 +1,114 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import unittest
+import mock
+
+from azure.cli.core.commands.provider_cache import ProviderCache, get_provider_cache
+
+
+def _get_provider(namespace, *resource_types):
+    provider = mock.MagicMock()
+    provider.namespace = namespace
+    provider.resource_types = []
+    for name in resource_types:
+        rt = mock.MagicMock()
+        rt.resource_type = name
+        rt.api_versions = ['2018-01-01-preview', '2017-01-01']
+        rt.default_api_version = None
+        provider.resource_types.append(rt)
+    return provider
+
+
+class TestProviderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        self.client.providers.get.side_effect = lambda namespace: _get_provider(namespace, 'virtualMachines')
+        self.client.providers.list.return_value = [_get_provider('Microsoft.Compute', 'virtualMachines'),
+                                                   _get_provider('Microsoft.Network', 'virtualNetworks'),
+                                                   _get_provider('Microsoft.Storage', 'storageAccounts')]
+
+    def _get_cli_ctx(self, ttl=3600):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.data = {}
+        cli_ctx.cloud.name = 'AzureCloud'
+        cli_ctx.config.config_dir = self.config_dir
+        cli_ctx.config.getint.return_value = ttl
+        return cli_ctx
+
+    def _get_cache(self, ttl=3600):
+        cache = ProviderCache(self._get_cli_ctx(ttl))
+        # write the cache file before the config directory is removed rather than on exit
+        self.addCleanup(lambda: cache._file and cache._file.flush())
+        return cache
+
+    def test_provider_cache_resource_type(self):
+        cli_ctx = self._get_cli_ctx()
+        cache = get_provider_cache(cli_ctx)
+        self.addCleanup(lambda: cache._file.flush())
+        self.assertIs(cache, get_provider_cache(cli_ctx))
+
+        rt = cache.get_resource_type(self.client, 'Microsoft.Compute', 'VIRTUALMACHINES')
+        self.assertEqual(rt.resource_type, 'virtualMachines')
+        self.assertEqual(rt.api_versions, ['2018-01-01-preview', '2017-01-01'])
+        self.assertIsNone(rt.default_api_version)
+        cache.get_resource_type(self.client, 'microsoft.compute', 'virtualMachines')
+        self.assertEqual(self.client.providers.get.call_count, 1)
+
+        # an unknown resource type is looked up again, in case it was added since
+        self.assertIsNone(cache.get_resource_type(self.client, 'Microsoft.Compute', 'disks'))
+        self.assertEqual(self.client.providers.get.call_count, 2)
+
+    def test_provider_cache_persisted(self):
+        cache = self._get_cache()
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        cache._get_file().flush()
+
+        cache = self._get_cache()
+        self.assertIsNotNone(cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines'))
+        self.assertEqual(self.client.providers.get.call_count, 1)
+
+        # the resource types of another subscription are cached separately
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000001'
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        self.assertEqual(self.client.providers.get.call_count, 2)
+
+    def test_provider_cache_expired(self):
+        cache = self._get_cache(ttl=-1)
+        self.assertIsNone(cache._get_file())
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        self.assertEqual(self.client.providers.get.call_count, 1)
+
+        cache = self._get_cache()
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        for entry in cache._entries.values():
+            entry['expiresOn'] = 0
+        cache.get_resource_type(self.client, 'Microsoft.Compute', 'virtualMachines')
+        self.assertEqual(self.client.providers.get.call_count, 3)
+
+    def test_provider_cache_load(self):
+        cache = self._get_cache()
+        cache.load(self.client, ['Microsoft.Compute'])
+        self.assertEqual(self.client.providers.get.call_count, 1)
+        self.assertFalse(self.client.providers.list.called)
+
+        # several missing providers are requested at once
+        cache.load(self.client, ['Microsoft.Compute', 'Microsoft.Network', 'Microsoft.Storage', 'Microsoft.Web'])
+        self.assertEqual(self.client.providers.list.call_count, 1)
+        self.client.providers.get.assert_called_with('microsoft.web')
+        self.assertEqual(self.client.providers.get.call_count, 2)
+        self.assertIsNotNone(cache.get_resource_type(self.client, 'Microsoft.Storage', 'storageAccounts'))
+        self.assertEqual(self.client.providers.get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import unittest
+import mock
+
+from azure.cli.core.commands.resource_ids import get_resource_id_resolver
+
+_REGISTRY_TYPE = 'Microsoft.ContainerRegistry/registries'
+_REGISTRY_ID = ('/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/{}/providers/'
+                'Microsoft.ContainerRegistry/registries/{}')
+
+
+def _get_resource(resource_group, name):
+    resource = mock.MagicMock(id=_REGISTRY_ID.format(resource_group, name))
+    resource.name = name
+    return resource
+
+
+class TestResourceIdResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        self.client.resources.list.return_value = [_get_resource('rg1', 'myregistry')]
+
+    def _get_resolver(self, ttl=3600):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.data = {}
+        cli_ctx.cloud.name = 'AzureCloud'
+        cli_ctx.config.config_dir = self.config_dir
+        cli_ctx.config.getint.return_value = ttl
+        resolver = get_resource_id_resolver(cli_ctx)
+        self.assertIs(resolver, get_resource_id_resolver(cli_ctx))
+        resolver._get_client = lambda: self.client
+        # write the cache file before the config directory is removed rather than on exit
+        self.addCleanup(lambda: resolver._file and resolver._file.flush())
+        return resolver
+
+    def test_resource_ids_by_name(self):
+        resolver = self._get_resolver()
+        self.assertEqual(resolver.get_resource_ids('myregistry', _REGISTRY_TYPE),
+                         [_REGISTRY_ID.format('rg1', 'myregistry')])
+        self.client.resources.list.assert_called_once_with(
+            filter="resourceType eq 'Microsoft.ContainerRegistry/registries' and name eq 'myregistry'")
+        resolver.get_resource_ids('MyRegistry', _REGISTRY_TYPE)
+        self.assertEqual(self.client.resources.list.call_count, 1)
+
+        resolver.get_resource_ids('myregistry', _REGISTRY_TYPE, refresh=True)
+        self.assertEqual(self.client.resources.list.call_count, 2)
+
+        # resources which are not found are queried again
+        self.client.resources.list.return_value = []
+        self.assertEqual(resolver.get_resource_ids('otherregistry', _REGISTRY_TYPE), [])
+        self.assertEqual(resolver.get_resource_ids('otherregistry', _REGISTRY_TYPE), [])
+        self.assertEqual(self.client.resources.list.call_count, 4)
+
+    def test_resource_ids_persisted(self):
+        resolver = self._get_resolver()
+        resolver.get_resource_ids('myregistry', _REGISTRY_TYPE)
+        resolver._get_file().flush()
+
+        resolver = self._get_resolver()
+        resolver.get_resource_ids('myregistry', _REGISTRY_TYPE)
+        self.assertEqual(self.client.resources.list.call_count, 1)
+
+        # the resources of another subscription are cached separately
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000001'
+        resolver.get_resource_ids('myregistry', _REGISTRY_TYPE)
+        self.assertEqual(self.client.resources.list.call_count, 2)
+
+    def test_resource_ids_invalidate(self):
+        resolver = self._get_resolver(ttl=0)
+        self.assertIsNone(resolver._get_file())
+        resolver.get_resource_ids('myregistry', _REGISTRY_TYPE)
+        self.client.resources.list.return_value = [_get_resource('rg2', 'myregistry')]
+        resolver.invalidate('myregistry', _REGISTRY_TYPE)
+        self.assertEqual(resolver.get_resource_ids('myregistry', _REGISTRY_TYPE),
+                         [_REGISTRY_ID.format('rg2', 'myregistry')])
+        self.assertEqual(self.client.resources.list.call_count, 2)
+
+        # the names are compared even if the service doesn't filter on them
+        self.client.resources.list.return_value = [_get_resource('rg1', 'myregistry2')]
+        self.assertEqual(resolver.get_resource_ids('myregistry3', _REGISTRY_TYPE), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
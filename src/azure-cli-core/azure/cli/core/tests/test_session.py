@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+
+from azure.cli.core._session import Session
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.filename = os.path.join(self.temp_dir, 'az.sess')
+
+    def _read_file(self):
+        with open(self.filename, 'rb') as f:
+            return json.loads(f.read().decode('utf-8-sig'))
+
+    def test_session_writes_are_coalesced(self):
+        session = Session()
+        session.load(self.filename)
+        self.assertEqual(self._read_file(), {})
+
+        with mock.patch('azure.cli.core._file_lock.write_file_atomically', autospec=True) as write_mock:
+            session['a'] = 1
+            session['b'] = 2
+            del session['a']
+            self.assertFalse(write_mock.called)
+        self.assertEqual(self._read_file(), {})
+
+        session.flush()
+        self.assertEqual(self._read_file(), {'b': 2})
+        self.assertFalse([f for f in os.listdir(self.temp_dir) if f.endswith('.tmp')])
+
+    def test_session_flush_keeps_changes_of_other_processes(self):
+        first, second = Session(), Session()
+        first.load(self.filename)
+        second.load(self.filename)
+
+        first['a'] = 'first'
+        first['shared'] = 'first'
+        first.flush()
+        second['b'] = 'second'
+        second['shared'] = 'second'
+        second.flush()
+
+        self.assertEqual(self._read_file(), {'a': 'first', 'b': 'second', 'shared': 'second'})
+        self.assertEqual(second.data, {'a': 'first', 'b': 'second', 'shared': 'second'})
+
+        # save writes the whole content
+        first.data = {'c': 3}
+        first.save()
+        self.assertEqual(self._read_file(), {'c': 3})
+
+    def test_session_flush_reads_same_size_changes(self):
+        first, second = Session(), Session()
+        first.load(self.filename)
+        first['a'] = 1
+        first['b'] = 2
+        first.flush()
+        second.load(self.filename)
+
+        # another process writes a value of the same size within the modification time granularity of the file system
+        stat = os.stat(self.filename)
+        second['b'] = 3
+        second.flush()
+        os.utime(self.filename, (stat.st_atime, stat.st_mtime))
+        self.assertEqual(first._get_file_stat(), first._file_stat)  # pylint: disable=protected-access
+
+        first['a'] = 4
+        first.flush()
+        self.assertEqual(self._read_file(), {'a': 4, 'b': 3})
+
+    def test_session_load_reads_changed_files_only(self):
+        session = Session()
+        session.load(self.filename)
+        with mock.patch('azure.cli.core._session.codecs_open', autospec=True) as open_mock:
+            session.load(self.filename)
+            self.assertFalse(open_mock.called)
+
+        other = Session()
+        other.load(self.filename)
+        other['key'] = 'value' * 10
+        other.flush()
+        session.load(self.filename)
+        self.assertEqual(session.data, {'key': 'value' * 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
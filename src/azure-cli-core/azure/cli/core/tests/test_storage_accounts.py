@@ -0,0 +1,150 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+import mock
+
+from knack.util import CLIError
+from msrestazure.azure_exceptions import CloudError
+
+from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
+
+_ACCOUNT_ID = ('/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/{}/providers/'
+               'Microsoft.Storage/storageAccounts/mystorage')
+
+
+def _get_cloud_error(status_code):
+    response = mock.MagicMock()
+    response.status_code = status_code
+    error = CloudError(response, error='not found')
+    error.status_code = status_code
+    return error
+
+
+class TestStorageAccountResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        keys = [mock.MagicMock(value='key1'), mock.MagicMock(value='key2')]
+        self.client.storage_accounts.list_keys.return_value = mock.MagicMock(keys=keys)
+        self.account_ids = {'mystorage': _ACCOUNT_ID.format('rg1')}
+
+    def _get_resolver(self, ttl=3600):
+        cli_ctx = mock.MagicMock()
+        # the IDs of the accounts are queried by `_query_account_id`
+        cli_ctx.data = {'resource_id_resolver': mock.MagicMock()}
+        cli_ctx.cloud.name = 'AzureCloud'
+        cli_ctx.config.config_dir = self.config_dir
+        cli_ctx.config.getint.return_value = ttl
+        resolver = get_storage_account_resolver(cli_ctx)
+        self.assertIs(resolver, get_storage_account_resolver(cli_ctx))
+        resolver._get_client = lambda: self.client
+        resolver._query_account_id = mock.MagicMock(side_effect=self.account_ids.get)
+        return resolver
+
+    def test_storage_account_resource_group(self):
+        resolver = self._get_resolver()
+        self.assertEqual(resolver.get_resource_group('mystorage'), 'rg1')
+        self.assertEqual(resolver.get_resource_group('MyStorage'), 'rg1')
+        self.assertEqual(resolver._query_account_id.call_count, 1)
+        self.assertFalse(self.client.storage_accounts.list.called)
+
+        # the file is only readable by the current user
+        mode = os.stat(resolver._get_cache_file()).st_mode
+        self.assertEqual(stat.S_IMODE(mode) & 0o077, 0)
+
+        # another invocation reads the file
+        resolver = self._get_resolver()
+        self.assertEqual(resolver.get_resource_group('mystorage'), 'rg1')
+        self.assertFalse(resolver._query_account_id.called)
+
+    def test_storage_account_not_indexed(self):
+        resolver = self._get_resolver()
+        account = mock.MagicMock(id=_ACCOUNT_ID.format('rg2'))
+        account.name = 'mystorage'
+        self.client.storage_accounts.list.return_value = [account]
+        self.account_ids.clear()
+        self.assertEqual(resolver.get_resource_group('mystorage'), 'rg2')
+        self.assertIsNone(resolver.get_resource_group('otherstorage'))
+        with self.assertRaises(CLIError):
+            resolver.get_keys('otherstorage')
+
+    def test_storage_account_keys(self):
+        resolver = self._get_resolver()
+        self.assertEqual(resolver.get_keys('mystorage'), ['key1', 'key2'])
+        self.assertEqual(resolver.get_keys('mystorage'), ['key1', 'key2'])
+        self.client.storage_accounts.list_keys.assert_called_once_with('rg1', 'mystorage')
+
+        resolver.get_keys('mystorage', refresh=True)
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 2)
+
+        # keys regenerated by another command are retrieved again
+        resolver.invalidate('mystorage')
+        resolver.get_keys('mystorage')
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 3)
+
+        # the keys are not written to the file, another invocation retrieves them from the resource group in it
+        with open(resolver._get_cache_file()) as f:
+            self.assertNotIn('key1', f.read())
+        resolver = self._get_resolver()
+        self.assertEqual(resolver.get_keys('mystorage'), ['key1', 'key2'])
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 4)
+        self.assertFalse(resolver._query_account_id.called)
+
+        # older API versions return the keys as properties
+        self.client.storage_accounts.list_keys.return_value = mock.MagicMock(keys=None, key1='a', key2='b')
+        self.assertEqual(resolver.get_keys('mystorage', refresh=True), ['a', 'b'])
+
+    def test_storage_account_moved(self):
+        resolver = self._get_resolver()
+        resolver.get_resource_group('mystorage')
+        self.account_ids['mystorage'] = _ACCOUNT_ID.format('rg2')
+
+        def _get_properties(resource_group, _):
+            if resource_group != 'rg2':
+                raise _get_cloud_error(404)
+            endpoints = mock.Mock(spec=['blob', 'web'], blob='https://mystorage.blob', web=None)
+            return mock.MagicMock(primary_endpoints=endpoints)
+        self.client.storage_accounts.get_properties.side_effect = _get_properties
+        endpoints = resolver.get_endpoints('mystorage')
+        self.assertEqual(endpoints['blob'], 'https://mystorage.blob')
+        self.assertNotIn('web', endpoints)
+        self.assertEqual(resolver.get_resource_group('mystorage'), 'rg2')
+
+        # other errors are raised
+        self.client.storage_accounts.list_keys.side_effect = _get_cloud_error(403)
+        with self.assertRaises(CloudError):
+            resolver.get_keys('mystorage')
+
+    def test_storage_account_clear(self):
+        resolver = self._get_resolver()
+        resolver.get_keys('mystorage')
+        resolver.clear()
+
+        resolver = self._get_resolver()
+        resolver.get_keys('mystorage')
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 2)
+        self.assertEqual(resolver._query_account_id.call_count, 1)
+
+    def test_storage_account_without_file(self):
+        resolver = self._get_resolver(ttl=0)
+        resolver.get_keys('mystorage')
+        resolver.get_keys('mystorage')
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 1)
+        self.assertFalse(os.listdir(self.config_dir))
+        resolver.clear()
+        resolver.get_keys('mystorage')
+        self.assertEqual(self.client.storage_accounts.list_keys.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
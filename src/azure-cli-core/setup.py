@@ -103,7 +103,7 @@ setup(
     extras_require={
         ":python_version<'3.4'": ['enum34'],
         ":python_version<'2.7.9'": ['pyopenssl', 'ndg-httpsclient', 'pyasn1'],
-        ":python_version<'3.0'": ['antlr4-python2-runtime'],
+        ":python_version<'3.0'": ['antlr4-python2-runtime', 'futures'],
         ":python_version>='3.0'": ['antlr4-python3-runtime']
     },
     package_data={'azure.cli.core': ['auth_landing_pages/*.html']},
@@ -19,7 +19,8 @@ from azure_devtools.scenario_tests.const import MOCKED_SUBSCRIPTION_ID, ENV_SKIP
 
 from .patches import (patch_load_cached_subscriptions, patch_main_exception_handler,
                       patch_retrieve_token_for_user, patch_long_run_operation_delay,
-                      patch_progress_controller)
+                      patch_progress_controller, patch_provider_cache,
+                      patch_storage_account_resolver, patch_resource_id_resolver)
 from .exceptions import CliExecutionError
 from .utilities import find_recording_dir, StorageAccountKeyReplacer
 from .reverse_dependency import get_dummy_cli
@@ -95,7 +96,8 @@ class ScenarioTest(ReplayableTest, CheckerMixin, unittest.TestCase):
             RequestUrlNormalizer(),
         ]
 
-        default_recording_patches = [patch_main_exception_handler]
+        default_recording_patches = [patch_main_exception_handler, patch_provider_cache,
+                                     patch_storage_account_resolver, patch_resource_id_resolver]
 
         default_replay_patches = [
             patch_main_exception_handler,
@@ -104,6 +106,9 @@ class ScenarioTest(ReplayableTest, CheckerMixin, unittest.TestCase):
             patch_load_cached_subscriptions,
             patch_retrieve_token_for_user,
             patch_progress_controller,
+            patch_provider_cache,
+            patch_storage_account_resolver,
+            patch_resource_id_resolver,
         ]
 
         def _merge_lists(base, patches):
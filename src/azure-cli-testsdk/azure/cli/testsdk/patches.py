@@ -87,3 +87,62 @@ def patch_long_run_operation_delay(unit_test):
     mock_in_unit_test(unit_test,
                       'azure.cli.core.commands.LongRunningOperation._delay',
                       _shortcut_long_run_operation)
+
+
+def patch_provider_cache(unit_test):
+    # the resource types cached by an earlier test or invocation would skip the requests of the recording
+    def _no_cache_file(*args, **kwargs):  # pylint: disable=unused-argument
+        return None
+
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands.provider_cache.ProviderCache._get_file',
+                      _no_cache_file)
+
+
+def patch_storage_account_resolver(unit_test):
+    from vcr.errors import CannotOverwriteExistingCassetteException
+    from azure.cli.core.commands.storage_accounts import StorageAccountResolver
+    query_account_id = StorageAccountResolver._query_account_id  # pylint: disable=protected-access
+
+    # the accounts cached by an earlier test or invocation would skip the requests of the recording
+    def _no_cache_file(*args, **kwargs):  # pylint: disable=unused-argument
+        return None
+
+    # recordings made before storage accounts were queried by name list the storage accounts instead
+    def _query_account_id(self, account_name):
+        try:
+            return query_account_id(self, account_name)
+        except CannotOverwriteExistingCassetteException:
+            return None
+
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands.storage_accounts.StorageAccountResolver._get_cache_file',
+                      _no_cache_file)
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands.storage_accounts.StorageAccountResolver._query_account_id',
+                      _query_account_id)
+
+
+def patch_resource_id_resolver(unit_test):
+    from vcr.errors import CannotOverwriteExistingCassetteException
+    from azure.cli.core.commands.resource_ids import ResourceIdResolver
+    list_resource_ids = ResourceIdResolver._list_resource_ids  # pylint: disable=protected-access
+
+    # the IDs cached by an earlier test or invocation would skip the requests of the recording
+    def _no_cache_file(*args, **kwargs):  # pylint: disable=unused-argument
+        return None
+
+    # recordings made before resources were queried by name list every resource of the type instead
+    def _list_resource_ids(self, client, resource_name, resource_type):
+        try:
+            return list_resource_ids(self, client, resource_name, resource_type)
+        except CannotOverwriteExistingCassetteException:
+            query = "resourceType eq '{}'".format(resource_type)
+            return [r.id for r in client.resources.list(filter=query) if r.name.lower() == resource_name.lower()]
+
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands.resource_ids.ResourceIdResolver._get_file',
+                      _no_cache_file)
+    mock_in_unit_test(unit_test,
+                      'azure.cli.core.commands.resource_ids.ResourceIdResolver._list_resource_ids',
+                      _list_resource_ids)
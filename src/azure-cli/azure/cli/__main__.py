@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
 import sys
 import uuid
 
@@ -11,6 +12,8 @@ from knack.log import get_logger
 
 from azure.cli.core import get_default_cli
 
+import azure.cli.core.batch as batch
+import azure.cli.core.profiler as profiler
 import azure.cli.core.telemetry as telemetry
 
 
@@ -29,6 +32,11 @@ def cli_main(cli, args):
     return cli.invoke(args)
 
 
+args, profile_startup, profile_output_file, profile_pstats_file = profiler.parse_args(sys.argv[1:], os.environ)
+if profile_startup:
+    profiler.start(output_file=profile_output_file, pstats_file=profile_pstats_file)
+args, stdin_commands = batch.parse_args(args)
+
 az_cli = get_default_cli()
 
 telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
@@ -36,7 +44,10 @@ telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
 try:
     telemetry.start()
 
-    exit_code = cli_main(az_cli, sys.argv[1:])
+    if stdin_commands:
+        exit_code = batch.run_commands(az_cli, sys.stdin, sys.stdout, extra_args=args)
+    else:
+        exit_code = cli_main(az_cli, args)
 
     if exit_code and exit_code != 0:
         telemetry.set_failure()
@@ -49,3 +60,4 @@ except KeyboardInterrupt:
     sys.exit(1)
 finally:
     telemetry.conclude()
+    profiler.conclude()
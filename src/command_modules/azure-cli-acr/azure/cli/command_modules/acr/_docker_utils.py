@@ -12,7 +12,6 @@ except ImportError:
 import time
 from json import loads
 from base64 import b64encode
-import requests
 from requests.utils import to_native_string
 from msrest.http_logger import log_request, log_response
 
@@ -21,6 +20,7 @@ from knack.prompting import prompt, prompt_pass, NoTTYException
 from knack.log import get_logger
 
 from azure.cli.core.util import should_disable_connection_verify
+from azure.cli.core.http_pool import get_session
 from azure.cli.core.cloud import CloudSuffixNotSetException
 
 from ._client_factory import cf_acr_registries
@@ -59,7 +59,8 @@ def _get_aad_token(cli_ctx,
 
     login_server = login_server.rstrip('/')
 
-    challenge = requests.get('https://' + login_server + '/v2/', verify=(not should_disable_connection_verify()))
+    challenge = get_session(cli_ctx).get('https://' + login_server + '/v2/',
+                                         verify=(not should_disable_connection_verify()))
     if challenge.status_code not in [401] or 'WWW-Authenticate' not in challenge.headers:
         raise CLIError("Registry '{}' did not issue a challenge.".format(login_server))
 
@@ -89,8 +90,8 @@ def _get_aad_token(cli_ctx,
         'access_token': creds[1]
     }
 
-    response = requests.post(authhost, urlencode(content), headers=headers,
-                             verify=(not should_disable_connection_verify()))
+    response = get_session(cli_ctx).post(authhost, urlencode(content), headers=headers,
+                                         verify=(not should_disable_connection_verify()))
 
     if response.status_code not in [200]:
         raise CLIError(
@@ -117,8 +118,8 @@ def _get_aad_token(cli_ctx,
         'scope': scope,
         'refresh_token': refresh_token
     }
-    response = requests.post(authhost, urlencode(content), headers=headers,
-                             verify=(not should_disable_connection_verify()))
+    response = get_session(cli_ctx).post(authhost, urlencode(content), headers=headers,
+                                         verify=(not should_disable_connection_verify()))
     access_token = loads(response.content.decode("utf-8"))["access_token"]
 
     return access_token
@@ -316,7 +317,7 @@ def request_data_from_registry(http_method,
         try:
             if file_payload:
                 with open(file_payload, 'rb') as data_payload:
-                    response = requests.request(
+                    response = get_session().request(
                         method=http_method,
                         url=url,
                         headers=headers,
@@ -325,7 +326,7 @@ def request_data_from_registry(http_method,
                         verify=(not should_disable_connection_verify())
                     )
             else:
-                response = requests.request(
+                response = get_session().request(
                     method=http_method,
                     url=url,
                     headers=headers,
@@ -6,7 +6,8 @@
 from knack.util import CLIError
 from knack.log import get_logger
 from knack.prompting import prompt_y_n, NoTTYException
-from azure.cli.core.commands.parameters import get_resources_in_subscription
+from msrestazure.azure_exceptions import CloudError
+from azure.cli.core.commands.resource_ids import get_resource_id_resolver
 
 from azure.mgmt.containerregistry.v2018_09_01.models import SkuName, Sku
 
@@ -26,13 +27,12 @@ from ._client_factory import (
 logger = get_logger(__name__)
 
 
-def _arm_get_resource_by_name(cli_ctx, resource_name, resource_type):
-    """Returns the ARM resource in the current subscription with resource_name.
+def _arm_get_resource_id_by_name(cli_ctx, resource_name, resource_type):
+    """Returns the ID of the ARM resource in the current subscription with resource_name.
     :param str resource_name: The name of resource
     :param str resource_type: The type of resource
     """
-    result = get_resources_in_subscription(cli_ctx, resource_type)
-    elements = [item for item in result if item.name.lower() == resource_name.lower()]
+    elements = get_resource_id_resolver(cli_ctx).get_resource_ids(resource_name, resource_type)
 
     if not elements:
         from azure.cli.core._profile import Profile
@@ -70,17 +70,23 @@ def get_resource_group_name_by_registry_name(cli_ctx, registry_name,
     :param str resource_group_name: The name of resource group
     """
     if not resource_group_name:
-        arm_resource = _arm_get_resource_by_name(cli_ctx, registry_name, REGISTRY_RESOURCE_TYPE)
-        resource_group_name = get_resource_group_name_by_resource_id(arm_resource.id)
+        resource_id = _arm_get_resource_id_by_name(cli_ctx, registry_name, REGISTRY_RESOURCE_TYPE)
+        resource_group_name = get_resource_group_name_by_resource_id(resource_id)
     return resource_group_name
 
 
+def invalidate_registry_id(cli_ctx, registry_name):
+    """Forgets the cached ID of the container registry, once it is created or deleted.
+    :param str registry_name: The name of container registry
+    """
+    get_resource_id_resolver(cli_ctx).invalidate(registry_name, REGISTRY_RESOURCE_TYPE)
+
+
 def get_resource_id_by_storage_account_name(cli_ctx, storage_account_name):
     """Returns the resource id for the storage account.
     :param str storage_account_name: The name of storage account
     """
-    arm_resource = _arm_get_resource_by_name(cli_ctx, storage_account_name, STORAGE_RESOURCE_TYPE)
-    return arm_resource.id
+    return _arm_get_resource_id_by_name(cli_ctx, storage_account_name, STORAGE_RESOURCE_TYPE)
 
 
 def get_registry_by_name(cli_ctx, registry_name, resource_group_name=None):
@@ -88,10 +94,19 @@ def get_registry_by_name(cli_ctx, registry_name, resource_group_name=None):
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     """
-    resource_group_name = get_resource_group_name_by_registry_name(
-        cli_ctx, registry_name, resource_group_name)
     client = get_acr_service_client(cli_ctx).registries
+    if resource_group_name:
+        return client.get(resource_group_name, registry_name), resource_group_name
 
+    resource_group_name = get_resource_group_name_by_registry_name(cli_ctx, registry_name)
+    try:
+        return client.get(resource_group_name, registry_name), resource_group_name
+    except CloudError as e:
+        if e.status_code != 404:
+            raise
+    # the registry was deleted or moved since its ID was cached
+    invalidate_registry_id(cli_ctx, registry_name)
+    resource_group_name = get_resource_group_name_by_registry_name(cli_ctx, registry_name)
     return client.get(resource_group_name, registry_name), resource_group_name
 
 
@@ -17,6 +17,7 @@ from azure.mgmt.containerregistry.v2018_09_01.models import (
 
 from ._constants import MANAGED_REGISTRY_SKU, CLASSIC_REGISTRY_SKU
 from ._utils import (
+    invalidate_registry_id,
     arm_deploy_template_new_storage,
     arm_deploy_template_existing_storage,
     random_storage_account_name,
@@ -50,6 +51,9 @@ def acr_create(cmd,
                storage_account_name=None,
                admin_enabled=False,
                deployment_name=None):
+    # a registry of the same name may have been deleted since its ID was cached
+    invalidate_registry_id(cmd.cli_ctx, registry_name)
+
     if sku in MANAGED_REGISTRY_SKU and storage_account_name:
         raise CLIError("Please specify '--sku {}' without providing an existing storage account "
                        "to create a managed registry, or specify '--sku Classic --storage-account-name {}' "
@@ -105,7 +109,9 @@ def acr_create(cmd,
 
 def acr_delete(cmd, client, registry_name, resource_group_name=None):
     resource_group_name = get_resource_group_name_by_registry_name(cmd.cli_ctx, registry_name, resource_group_name)
-    return client.delete(resource_group_name, registry_name)
+    result = client.delete(resource_group_name, registry_name)
+    invalidate_registry_id(cmd.cli_ctx, registry_name)
+    return result
 
 
 def acr_show(cmd, client, registry_name, resource_group_name=None):
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 import time
-import requests
 try:
     from urllib.parse import unquote
 except ImportError:
@@ -14,6 +13,7 @@ from knack.util import CLIError
 from knack.log import get_logger
 
 from azure.cli.core.util import should_disable_connection_verify
+from azure.cli.core.http_pool import get_session
 
 from ._utils import validate_managed_registry, user_confirmation
 from ._docker_utils import (
@@ -53,7 +53,7 @@ def _get_manifest_digest(login_server, repository, tag, username, password, retr
     for i in range(0, retry_times):
         errorMessage = None
         try:
-            response = requests.get(
+            response = get_session().get(
                 url=url,
                 headers=headers,
                 verify=(not should_disable_connection_verify())
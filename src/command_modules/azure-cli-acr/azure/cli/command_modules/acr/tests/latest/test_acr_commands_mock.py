@@ -42,7 +42,7 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_repository_list(self, mock_requests_get, mock_get_access_credentials, mock_get_registry_by_name):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -86,7 +86,7 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_repository_show_tags(self, mock_requests_get, mock_get_access_credentials, mock_get_registry_by_name):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -143,7 +143,7 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_repository_show_manifests(self, mock_requests_get, mock_get_access_credentials, mock_get_registry_by_name):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -197,7 +197,7 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_repository_show(self, mock_requests_get, mock_get_access_credentials, mock_get_registry_by_name):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -253,8 +253,8 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch('requests.Session.request')
+    @mock.patch('requests.Session.get')
     def test_repository_delete(self, mock_requests_get, mock_requests_delete, mock_get_access_credentials, mock_get_registry_by_name):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -369,8 +369,8 @@ class AcrMockCommandsTests(unittest.TestCase):
 
     @mock.patch('azure.cli.core._profile.Profile.get_raw_token', autospec=True)
     @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_by_name', autospec=True)
-    @mock.patch('requests.post', autospec=True)
-    @mock.patch('requests.get', autospec=True)
+    @mock.patch('requests.Session.post')
+    @mock.patch('requests.Session.get')
     def test_get_docker_credentials(self, mock_requests_get, mock_requests_post, mock_get_registry_by_name, mock_get_raw_token):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -438,7 +438,7 @@ class AcrMockCommandsTests(unittest.TestCase):
             verify=mock.ANY)
 
     @mock.patch('azure.cli.command_modules.acr.helm.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_helm_list(self, mock_requests_get, mock_get_access_credentials):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -477,7 +477,7 @@ class AcrMockCommandsTests(unittest.TestCase):
             verify=mock.ANY)
 
     @mock.patch('azure.cli.command_modules.acr.helm.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_helm_show(self, mock_requests_get, mock_get_access_credentials):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -522,7 +522,7 @@ class AcrMockCommandsTests(unittest.TestCase):
             verify=mock.ANY)
 
     @mock.patch('azure.cli.command_modules.acr.helm.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_helm_delete(self, mock_requests_get, mock_get_access_credentials):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -555,7 +555,7 @@ class AcrMockCommandsTests(unittest.TestCase):
             verify=mock.ANY)
 
     @mock.patch('azure.cli.command_modules.acr.helm.get_access_credentials', autospec=True)
-    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.Session.request')
     def test_helm_push(self, mock_requests_get, mock_get_access_credentials):
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
@@ -6,8 +6,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.acs._help  # pylint: disable=unused-import
-
 
 class ContainerServiceCommandsLoader(AzCommandsLoader):
 
@@ -3,10 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-# pylint: disable=unused-import
-
 from azure.cli.core import AzCommandsLoader
-import azure.cli.command_modules.ams._help
 
 
 class MediaServicesCommandsLoader(AzCommandsLoader):
@@ -251,14 +251,14 @@ def enable_zip_deploy(cmd, resource_group_name, name, src, slot=None):
     headers = authorization
     headers['content-type'] = 'application/octet-stream'
 
-    import requests
+    from azure.cli.core.http_pool import get_session
     import os
     # Read file content
     with open(os.path.realpath(os.path.expanduser(src)), 'rb') as fs:
         zip_content = fs.read()
-        requests.post(zip_url, data=zip_content, headers=headers)
+        get_session(cmd.cli_ctx).post(zip_url, data=zip_content, headers=headers)
     # check the status of async deployment
-    response = requests.get(deployment_status_url, headers=authorization)
+    response = get_session(cmd.cli_ctx).get(deployment_status_url, headers=authorization)
     response = response.json()
     if response.get('status', 0) != 4:
         logger.warning(response.get('progress', ''))
@@ -807,14 +807,13 @@ def update_container_settings(cmd, resource_group_name, name, docker_registry_se
 
 def _get_acr_cred(cli_ctx, registry_name):
     from azure.mgmt.containerregistry import ContainerRegistryManagementClient
-    from azure.cli.core.commands.parameters import get_resources_in_subscription
+    from azure.cli.core.commands.resource_ids import get_resource_id_resolver
     client = get_mgmt_service_client(cli_ctx, ContainerRegistryManagementClient).registries
 
-    result = get_resources_in_subscription(cli_ctx, 'Microsoft.ContainerRegistry/registries')
-    result = [item for item in result if item.name.lower() == registry_name]
+    result = get_resource_id_resolver(cli_ctx).get_resource_ids(registry_name, 'Microsoft.ContainerRegistry/registries')
     if not result or len(result) > 1:
         raise CLIError("No resource or more than one were found with name '{}'.".format(registry_name))
-    resource_group_name = parse_resource_id(result[0].id)['resource_group']
+    resource_group_name = parse_resource_id(result[0])['resource_group']
 
     registry = client.get(resource_group_name, registry_name)
 
@@ -1975,12 +1974,12 @@ def list_locations(cmd, sku, linux_workers_enabled=None):
 
 
 def _check_zip_deployment_status(deployment_status_url, authorization):
-    import requests
+    from azure.cli.core.http_pool import get_session
     import time
     num_trials = 1
     while num_trials < 10:
         time.sleep(15)
-        response = requests.get(deployment_status_url, headers=authorization)
+        response = get_session().get(deployment_status_url, headers=authorization)
         res_dict = response.json()
         num_trials = num_trials + 1
         if res_dict['status'] == 5:
@@ -32,6 +32,7 @@ from six.moves import urllib_parse
 
 from azure.cli.core import keys
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
+from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
 from azure.cli.core.profiles import ResourceType, get_sdk
 import azure.mgmt.batchai.models as models
 
@@ -157,15 +158,14 @@ def _get_storage_account_key(cli_ctx, account_name, account_key):
     """
     if account_key:
         return account_key
+    resolver = get_storage_account_resolver(cli_ctx)
     storage_client = _get_storage_management_client(cli_ctx)
-    account = [a.id for a in list(storage_client.storage_accounts.list()) if a.name == account_name]
-    if not account:
+    if not resolver.get_resource_group(account_name, storage_client):
         raise CLIError('Cannot find "{0}" storage account.'.format(account_name))
-    resource_group = parse_resource_id(account[0])['resource_group']
-    keys_list_result = storage_client.storage_accounts.list_keys(resource_group, account_name)
-    if not keys_list_result or not keys_list_result.keys:
+    keys = resolver.get_keys(account_name, client=storage_client)
+    if not keys:
         raise CLIError('Cannot find a key for "{0}" storage account.'.format(account_name))
-    return keys_list_result.keys[0].value
+    return keys[0]
 
 
 def _get_effective_storage_account_name_and_key(cli_ctx, account_name, account_key):
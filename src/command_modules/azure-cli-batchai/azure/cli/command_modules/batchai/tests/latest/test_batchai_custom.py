@@ -2,7 +2,6 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
-import collections
 import unittest
 from contextlib import contextmanager
 
@@ -47,21 +46,13 @@ def _given_env_variable(name, value):
         os.environ.pop(name, None)
 
 
-def _get_mock_storage_accounts_and_keys(accounts_and_keys):
-    """Creates a mock storage client which knows about given storage accounts and keys"""
-    Endpoints = collections.namedtuple('Endpoints', 'file')
-    Account = collections.namedtuple('Account', 'id name primary_endpoints')
-    mock_storage_client = MagicMock()
-    mock_storage_client.storage_accounts.list = MagicMock(
-        return_value=[Account(
-            '/subscriptions/000/resourceGroups/rg/providers/Microsoft.Storage/storageAccounts/{0}'.format(a),
-            a, Endpoints('https://{0}.file.core.windows.net/'.format(a)))
-            for a in accounts_and_keys.keys()])
-    Keys = collections.namedtuple('Keys', 'keys')
-    Key = collections.namedtuple('Key', 'value')
-    mock_storage_client.storage_accounts.list_keys = MagicMock(
-        side_effect=lambda _, account: Keys([Key(accounts_and_keys.get(account, None))]))
-    return mock_storage_client
+def _get_mock_storage_account_resolver(accounts_and_keys):
+    """Creates a mock storage account resolver which knows about given storage accounts and keys"""
+    mock_resolver = MagicMock()
+    mock_resolver.get_resource_group = MagicMock(
+        side_effect=lambda account, *_: 'rg' if account in accounts_and_keys else None)
+    mock_resolver.get_keys = MagicMock(side_effect=lambda account, **_: [accounts_and_keys[account]])
+    return mock_resolver
 
 
 def _data_file(filename):
@@ -349,7 +340,8 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEquals(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
-    def test_batchai_patch_mount_volumes_with_credentials(self, get_storage_client):
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
+    def test_batchai_patch_mount_volumes_with_credentials(self, get_resolver, _):
         # noinspection PyTypeChecker
         mount_volumes = MountVolumes(
             azure_file_shares=[
@@ -369,8 +361,8 @@ class TestBatchAICustom(unittest.TestCase):
                 ),
             ]
         )
-        get_storage_client.return_value = \
-            _get_mock_storage_accounts_and_keys({'account1': 'key1', 'account2': 'key2'})
+        get_resolver.return_value = \
+            _get_mock_storage_account_resolver({'account1': 'key1', 'account2': 'key2'})
         actual = _patch_mount_volumes(DummyCli(), mount_volumes)
         expected = MountVolumes(
             azure_file_shares=[
@@ -393,8 +385,9 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEquals(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
-    def test_batchai_patch_mount_volumes_with_credentials_no_account_found(self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys({})
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
+    def test_batchai_patch_mount_volumes_with_credentials_no_account_found(self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver({})
         # noinspection PyTypeChecker
         mount_volumes = MountVolumes(
             azure_file_shares=[
@@ -410,9 +403,10 @@ class TestBatchAICustom(unittest.TestCase):
             _patch_mount_volumes(DummyCli(), mount_volumes)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
     def test_batchai_patch_mount_volumes_with_credentials_no_account_given(
-            self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys(
+            self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver(
             {})
         # noinspection PyTypeChecker
         mount_volumes = MountVolumes(
@@ -429,9 +423,10 @@ class TestBatchAICustom(unittest.TestCase):
             _patch_mount_volumes(DummyCli(), mount_volumes)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
     def test_batchai_patch_mount_volumes_when_no_patching_required(
-            self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys(
+            self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver(
             {})
         # noinspection PyTypeChecker
         mount_volumes = MountVolumes(
@@ -510,9 +505,10 @@ class TestBatchAICustom(unittest.TestCase):
             _add_azure_file_share_to_mount_volumes(DummyCli(), MountVolumes(), 'share', '')
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
     def test_batchai_add_azure_file_share_to_mount_volumes_account_and_key_via_env_variables(
-            self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys({'account': 'key'})
+            self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver({'account': 'key'})
         with _given_env_variable('AZURE_BATCHAI_STORAGE_ACCOUNT', 'account'):
             with _given_env_variable('AZURE_BATCHAI_STORAGE_KEY', 'key'):
                 actual = _add_azure_file_share_to_mount_volumes(DummyCli(), MountVolumes(), 'share', 'relative_path')
@@ -529,10 +525,11 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
     def test_batchai_add_azure_file_share_to_mount_volumes_account_and_key_via_command_line_args(
-            self, get_storage_client):
-        get_storage_client.return_value = \
-            _get_mock_storage_accounts_and_keys({'account': 'key'})
+            self, get_resolver, _):
+        get_resolver.return_value = \
+            _get_mock_storage_account_resolver({'account': 'key'})
         actual = _add_azure_file_share_to_mount_volumes(DummyCli(), MountVolumes(), 'share', 'relative_path',
                                                         'account', 'key')
         expected = MountVolumes(azure_file_shares=[
@@ -548,8 +545,9 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
-    def test_batchai_add_azure_file_share_to_mount_volumes_account_via_command_line_args(self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys({'account': 'key'})
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
+    def test_batchai_add_azure_file_share_to_mount_volumes_account_via_command_line_args(self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver({'account': 'key'})
         actual = _add_azure_file_share_to_mount_volumes(DummyCli(), MountVolumes(), 'share', 'relative_path', 'account')
         expected = MountVolumes(azure_file_shares=[
             AzureFileShareReference(
@@ -564,8 +562,9 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
-    def test_batchai_add_azure_file_share_to_absent_mount_volumes(self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys({'account': 'key'})
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
+    def test_batchai_add_azure_file_share_to_absent_mount_volumes(self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver({'account': 'key'})
         actual = _add_azure_file_share_to_mount_volumes(DummyCli(), None, 'share', 'relative_path', 'account')
         expected = MountVolumes(azure_file_shares=[
             AzureFileShareReference(
@@ -623,8 +622,9 @@ class TestBatchAICustom(unittest.TestCase):
         self.assertEqual(expected, actual)
 
     @patch('azure.cli.command_modules.batchai.custom._get_storage_management_client')
-    def test_batchai_add_azure_container_mount_volumes_account_via_cmd_line_args(self, get_storage_client):
-        get_storage_client.return_value = _get_mock_storage_accounts_and_keys({'account': 'key'})
+    @patch('azure.cli.command_modules.batchai.custom.get_storage_account_resolver')
+    def test_batchai_add_azure_container_mount_volumes_account_via_cmd_line_args(self, get_resolver, _):
+        get_resolver.return_value = _get_mock_storage_account_resolver({'account': 'key'})
         actual = _add_azure_container_to_mount_volumes(
             DummyCli(), MountVolumes(), 'container', 'relative_path', 'account')
         expected = MountVolumes(azure_blob_file_systems=[
@@ -5,11 +5,8 @@
 
 from azure.cli.core import AzCommandsLoader
 
-# pylint: disable=unused-import
 # pylint: disable=line-too-long
 
-from ._help import helps
-
 
 class EventhubCommandsLoader(AzCommandsLoader):
 
@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 from azure.cli.core import AzCommandsLoader
-import azure.cli.command_modules.find._help  # pylint: disable=unused-import
 
 
 class FindCommandsLoader(AzCommandsLoader):
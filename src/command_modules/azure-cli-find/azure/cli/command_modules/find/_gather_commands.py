@@ -3,15 +3,20 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import yaml
-
 from knack.help import REQUIRED_TAG
 from knack.help_files import helps
 
 
 def build_command_table(cli_ctx):
     from azure.cli.core import MainCommandsLoader
-    cmd_table = MainCommandsLoader(cli_ctx).load_command_table(None)
+    from azure.cli.core._help import HelpStore
+    loader = MainCommandsLoader(cli_ctx)
+    cmd_table = loader.load_command_table(None)
+    help_store = HelpStore(cli_ctx)
+    if not help_store.is_valid():
+        loader.load_help()
+        if help_store.is_writable():
+            help_store.build(helps)
     for command in cmd_table:
         cmd_table[command].load_arguments()
 
@@ -46,8 +51,13 @@ def build_command_table(cli_ctx):
         com_descip['parameters'] = param_descrip
         data[command] = com_descip
 
-    for command in helps:
-        diction_help = yaml.load(helps[command])
+    if help_store.is_valid():
+        help_entries = ((command, help_store.get(command)) for command in help_store.keys())
+    else:
+        # the store couldn't be compiled, so the help entries loaded above are parsed instead
+        import yaml
+        help_entries = ((command, yaml.safe_load(helps[command])) for command in helps)
+    for command, diction_help in help_entries:
         if command not in data:
             data[command] = {
                 'short-summary': diction_help.get(
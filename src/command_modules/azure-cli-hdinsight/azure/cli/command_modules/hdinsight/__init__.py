@@ -4,7 +4,6 @@
 # --------------------------------------------------------------------------------------------
 
 from azure.cli.core import AzCommandsLoader
-import azure.cli.command_modules.hdinsight._help  # pylint: disable=unused-import
 
 
 class HDInsightCommandsLoader(AzCommandsLoader):
@@ -3,19 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from knack.help_files import helps
-
 from azure.cli.core import AzCommandsLoader
 
 
-helps['interactive'] = """
-            type: command
-            short-summary: Start interactive mode. Installs the Interactive extension if not installed already.
-            long-summary: >
-                For more information on interactive mode, see: https://azure.microsoft.com/en-us/blog/welcome-to-azure-cli-shell/
-            """
-
-
 class InteractiveCommandsLoader(AzCommandsLoader):
 
     def __init__(self, cli_ctx=None):
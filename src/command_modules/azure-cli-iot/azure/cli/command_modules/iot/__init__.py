@@ -7,7 +7,6 @@ from knack.events import EVENT_INVOKER_POST_PARSE_ARGS
 from knack.log import get_logger
 from azure.cli.core import AzCommandsLoader
 from azure.cli.core.commands import CliCommandType
-import azure.cli.command_modules.iot._help  # pylint: disable=unused-import
 from azure.cli.core.extension import extension_exists
 
 
@@ -5,8 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-from azure.cli.command_modules.iotcentral._help import helps  # pylint: disable=unused-import
-
 
 class IoTCentralCommandsLoader(AzCommandsLoader):
 
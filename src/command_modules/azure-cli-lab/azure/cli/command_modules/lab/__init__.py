@@ -5,8 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.lab._help  # pylint: disable=unused-import
-
 
 class DevTestLabCommandsLoader(AzCommandsLoader):
 
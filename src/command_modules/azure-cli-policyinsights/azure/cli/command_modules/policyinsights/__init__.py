@@ -3,9 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-# pylint: disable=unused-import
-
-from azure.cli.command_modules.policyinsights._help import helps
 from azure.cli.core import AzCommandsLoader
 
 
@@ -50,6 +50,9 @@ def load_arguments(self, _):
         c.argument('resource_ids', nargs='+', options_list=['--ids'], help='One or more resource IDs (space-delimited). If provided, no other "Resource Id" arguments should be specified.', arg_group='Resource Id')
         c.argument('include_response_body', arg_type=get_three_state_flag(), help='Use if the default command output doesn\'t capture all of the property data.')
 
+    with self.argument_context('resource delete') as c:
+        c.argument('parallel', type=int, arg_group='Resource Id', help='The number of deletes to issue at the same time; every issued delete is polled until it completes. Resources blocked by another resource being deleted are retried once it is deleted. Default: the value of `ids_parallelism` in the `[core]` section of the CLI config, or 1.')
+
     with self.argument_context('resource list') as c:
         c.argument('name', resource_name_type)
 
@@ -16,6 +16,7 @@ import ssl
 import sys
 import uuid
 
+from six import string_types
 from six.moves.urllib.request import urlopen  # pylint: disable=import-error
 from six.moves.urllib.parse import urlparse  # pylint: disable=import-error
 
@@ -33,6 +34,7 @@ from azure.mgmt.resource.links.models import ResourceLinkProperties
 from azure.cli.core.parser import IncorrectUsageError
 from azure.cli.core.util import get_file_json, shell_safe_json_parse, sdk_no_wait
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
+from azure.cli.core.commands.provider_cache import get_provider_cache
 from azure.cli.core.profiles import ResourceType, get_sdk, get_api_version
 
 from azure.cli.command_modules.resource._client_factory import (
@@ -42,6 +44,14 @@ from azure.cli.command_modules.resource._validators import _parse_lock_id
 
 logger = get_logger(__name__)
 
+# the delay in seconds before a resource blocked by a dependency is deleted again, doubled on every attempt
+_DELETE_RETRY_DELAY = 2
+_DELETE_MAX_RETRY_DELAY = 30
+# the interval in seconds at which the operations of the issued deletes are checked for completion
+_DELETE_POLL_INTERVAL = 1
+# the error codes of failed deletes which mean a resource is still used by another, e.g. InUseSubnetCannotBeDeleted
+_DEPENDENCY_ERROR_MARKERS = ('InUse', 'CannotBeDeleted', 'ReservedFor', 'AnotherOperationInProgress')
+
 
 def _process_parameters(template_param_defs, parameter_lists):
 
@@ -345,7 +355,8 @@ def _list_resources_odata_filter_builder(resource_group_name=None, resource_prov
 
 def _get_auth_provider_latest_api_version(cli_ctx):
     rcf = _resource_client_factory(cli_ctx)
-    api_version = _ResourceUtils.resolve_api_version(rcf, 'Microsoft.Authorization', None, 'providerOperations')
+    api_version = _ResourceUtils.resolve_api_version(cli_ctx, rcf, 'Microsoft.Authorization', None,
+                                                     'providerOperations')
     return api_version
 
 
@@ -737,7 +748,7 @@ def create_resource(cmd, properties,
 
 def _get_parsed_resource_ids(resource_ids):
     """
-    Returns a generator of parsed resource ids. Raise when there is invalid resource id.
+    Returns a list of parsed resource ids. Raise when there is invalid resource id.
     """
     if not resource_ids:
         return None
@@ -746,7 +757,17 @@ def _get_parsed_resource_ids(resource_ids):
         if not is_valid_resource_id(rid):
             raise CLIError('az resource: error: argument --ids: invalid ResourceId value: \'%s\'' % rid)
 
-    return (parse_resource_id(rid) for rid in resource_ids)
+    return [parse_resource_id(rid) for rid in resource_ids]
+
+
+def _load_providers_of_parsed_ids(cli_ctx, parsed_ids, api_version):
+    """
+    Cache the resource types of the providers of the parsed ids at once, before the API version of each is resolved.
+    """
+    if api_version or len(parsed_ids) < 2:
+        return
+    namespaces = {id_dict['resource_namespace'] for id_dict in parsed_ids if id_dict.get('resource_namespace')}
+    get_provider_cache(cli_ctx).load(_resource_client_factory(cli_ctx), namespaces)
 
 
 def _get_rsrc_util_from_parsed_id(cli_ctx, parsed_id, api_version):
@@ -790,57 +811,136 @@ def show_resource(cmd, resource_ids=None, resource_group_name=None,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
+    _load_providers_of_parsed_ids(cmd.cli_ctx, parsed_ids, api_version)
 
     return _single_or_collection(
         [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).get_resource(
             include_response_body) for id_dict in parsed_ids])
 
 
+def _is_dependency_error(ex):
+    """
+    Whether a failed delete may succeed once other resources are deleted, e.g. a subnet still used by a NIC.
+    """
+    if ex.status_code == 409:
+        return True
+    code = getattr(ex.error, 'error', None)
+    return isinstance(code, string_types) and any(marker in code for marker in _DEPENDENCY_ERROR_MARKERS)
+
+
+def _delete_resources(to_be_deleted, parallelism):
+    """
+    Deletes the resources of `to_be_deleted`, pairs of resource utils and parsed ids. Up to `parallelism` deletes are
+    issued at the same time, and the operations they start are polled together until they complete. A resource which
+    fails to be deleted because of a dependency is retried with an increasing delay, as long as other deletes are in
+    progress or succeeded since it failed.
+    Returns the results of the deletes, in the order of `to_be_deleted`, and the parsed ids which failed.
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from msrestazure.azure_exceptions import CloudError
+
+    def _delete(rsrc_utils, id_dict):
+        resource = resource_dict_to_id(**id_dict) if id_dict.get('subscription') else id_dict['resource_name']
+        logger.debug("deleting %s", resource)
+        return rsrc_utils.delete()
+
+    results = {}
+    failed = []
+    ready = list(range(len(to_be_deleted)))
+    # the indexes of the resources blocked by a dependency, with the time of their next attempt
+    waiting = {}
+    attempts = [0] * len(to_be_deleted)
+    # the number of successful deletes when each blocked resource failed
+    failed_after = {}
+    succeeded = [0]
+
+    def _fail(index, ex):
+        to_be_deleted[index][1]['exception'] = str(ex)
+        if not _is_dependency_error(ex):
+            failed.append(index)
+            return
+        delay = min(_DELETE_RETRY_DELAY * 2 ** (attempts[index] - 1), _DELETE_MAX_RETRY_DELAY)
+        logger.debug("Deleting %s is blocked by a dependency, retrying in %s seconds: %s",
+                     to_be_deleted[index][1]['resource_name'], delay, ex)
+        waiting[index] = time.time() + delay
+        failed_after[index] = succeeded[0]
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        # the deletes being issued, and the operations of the issued deletes being polled
+        issuing = {}
+        polling = {}
+        while ready or issuing or polling or waiting:
+            now = time.time()
+            for index in [i for i, t in waiting.items() if t <= now]:
+                del waiting[index]
+                ready.append(index)
+            while ready and len(issuing) < parallelism:
+                index = ready.pop(0)
+                attempts[index] += 1
+                issuing[executor.submit(_delete, *to_be_deleted[index])] = index
+
+            if not issuing and not polling:
+                if all(failed_after[i] == succeeded[0] for i in waiting):
+                    # no resource was deleted since the remaining ones failed, so nothing can unblock them
+                    failed.extend(waiting)
+                    waiting.clear()
+                else:
+                    time.sleep(max(min(waiting.values()) - time.time(), 0))
+                continue
+
+            timeouts = [max(min(waiting.values()) - now, 0)] if waiting else []
+            if polling:
+                timeouts.append(_DELETE_POLL_INTERVAL)
+            timeout = min(timeouts) if timeouts else None
+            if issuing:
+                done, _ = wait(issuing, timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                done = ()
+                time.sleep(timeout)
+            for future in done:
+                index = issuing.pop(future)
+                try:
+                    polling[index] = future.result()
+                except CloudError as ex:
+                    _fail(index, ex)
+            for index in [i for i, poller in polling.items() if poller.done()]:
+                try:
+                    results[index] = polling.pop(index).result()
+                    succeeded[0] += 1
+                except CloudError as ex:
+                    _fail(index, ex)
+
+    return [results[i] for i in sorted(results)], [to_be_deleted[i][1] for i in sorted(failed)]
+
+
 # pylint: disable=unused-argument
 def delete_resource(cmd, resource_ids=None, resource_group_name=None,
                     resource_provider_namespace=None, parent_resource_path=None, resource_type=None,
-                    resource_name=None, api_version=None):
+                    resource_name=None, api_version=None, parallel=None):
     """
     Deletes the given resource(s).
     This function allows deletion of ids with dependencies on one another.
-    This is done with multiple passes through the given ids.
+    The resources are deleted concurrently, and the ones blocked by a dependency are retried once it is deleted.
     """
+    if parallel is None:
+        parallel = cmd.cli_ctx.config.getint('core', 'ids_parallelism', fallback=1)
+    if parallel < 1:
+        raise CLIError('usage error: --parallel must be at least 1.')
     parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
                                                                               resource_provider_namespace,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
+    _load_providers_of_parsed_ids(cmd.cli_ctx, parsed_ids, api_version)
     to_be_deleted = [(_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version), id_dict)
                      for id_dict in parsed_ids]
 
-    results = []
-    from msrestazure.azure_exceptions import CloudError
-    while to_be_deleted:
-        logger.debug("Start new loop to delete resources.")
-        operations = []
-        failed_to_delete = []
-        for rsrc_utils, id_dict in to_be_deleted:
-            try:
-                operations.append(rsrc_utils.delete())
-                resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
-                logger.debug("deleting %s", resource)
-            except CloudError as e:
-                # request to delete failed, add parsed id dict back to queue
-                id_dict['exception'] = str(e)
-                failed_to_delete.append((rsrc_utils, id_dict))
-        to_be_deleted = failed_to_delete
-
-        # stop deleting if none deletable
-        if not operations:
-            break
-
-        # all operations return result before next pass
-        for operation in operations:
-            results.append(operation.result())
+    results, failed = _delete_resources(to_be_deleted, parallel)
 
-    if to_be_deleted:
+    if failed:
         error_msg_builder = ['Some resources failed to be deleted:']
-        for _, id_dict in to_be_deleted:
+        for id_dict in failed:
             logger.debug(id_dict['exception'])
             error_msg_builder.append(resource_dict_to_id(**id_dict))
         raise CLIError(os.linesep.join(error_msg_builder))
@@ -857,6 +957,7 @@ def update_resource(cmd, parameters, resource_ids=None,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
+    _load_providers_of_parsed_ids(cmd.cli_ctx, parsed_ids, api_version)
 
     return _single_or_collection(
         [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).update(parameters) for id_dict in parsed_ids])
@@ -873,6 +974,7 @@ def tag_resource(cmd, tags, resource_ids=None,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
+    _load_providers_of_parsed_ids(cmd.cli_ctx, parsed_ids, api_version)
 
     return _single_or_collection(
         [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).tag(tags) for id_dict in parsed_ids])
@@ -889,6 +991,7 @@ def invoke_resource_action(cmd, action, request_body=None, resource_ids=None,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
+    _load_providers_of_parsed_ids(cmd.cli_ctx, parsed_ids, api_version)
 
     return _single_or_collection([_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version)
                                   .invoke_action(action, request_body) for id_dict in parsed_ids])
@@ -1629,11 +1732,11 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
         self.rcf = rcf or _resource_client_factory(cli_ctx)
         if api_version is None:
             if resource_id:
-                api_version = _ResourceUtils._resolve_api_version_by_id(self.rcf, resource_id)
+                api_version = _ResourceUtils._resolve_api_version_by_id(cli_ctx, self.rcf, resource_id)
             else:
                 _validate_resource_inputs(resource_group_name, resource_provider_namespace,
                                           resource_type, resource_name)
-                api_version = _ResourceUtils.resolve_api_version(self.rcf,
+                api_version = _ResourceUtils.resolve_api_version(cli_ctx, self.rcf,
                                                                  resource_provider_namespace,
                                                                  parent_resource_path,
                                                                  resource_type)
@@ -1801,26 +1904,23 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
                                     self.rcf.resources.config.long_running_operation_timeout)
 
     @staticmethod
-    def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type):
-        provider = rcf.providers.get(resource_provider_namespace)
-
+    def resolve_api_version(cli_ctx, rcf, resource_provider_namespace, parent_resource_path, resource_type):
         # If available, we will use parent resource's api-version
         resource_type_str = (parent_resource_path.split('/')[0] if parent_resource_path else resource_type)
 
-        rt = [t for t in provider.resource_types
-              if t.resource_type.lower() == resource_type_str.lower()]
+        rt = get_provider_cache(cli_ctx).get_resource_type(rcf, resource_provider_namespace, resource_type_str)
         if not rt:
             raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
-        if len(rt) == 1 and rt[0].api_versions:
-            npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-            return npv[0] if npv else rt[0].api_versions[0]
+        if rt.api_versions:
+            npv = [v for v in rt.api_versions if 'preview' not in v.lower()]
+            return npv[0] if npv else rt.api_versions[0]
         else:
             raise IncorrectUsageError(
                 'API version is required and could not be resolved for resource {}'
                 .format(resource_type))
 
     @staticmethod
-    def _resolve_api_version_by_id(rcf, resource_id):
+    def _resolve_api_version_by_id(cli_ctx, rcf, resource_id):
         parts = parse_resource_id(resource_id)
         namespace = parts.get('child_namespace_1', parts['namespace'])
         if parts.get('child_type_2'):
@@ -1839,4 +1939,4 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
             parent = None
             resource_type = parts['type']
 
-        return _ResourceUtils.resolve_api_version(rcf, namespace, parent, resource_type)
+        return _ResourceUtils.resolve_api_version(cli_ctx, rcf, namespace, parent, resource_type)
@@ -18,7 +18,42 @@ except ImportError:
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 from azure.cli.command_modules.resource.custom import \
     (_get_missing_parameters, _extract_lock_params, _process_parameters, _find_missing_parameters,
-     _prompt_for_parameters, _load_file_string_or_uri)
+     _prompt_for_parameters, _load_file_string_or_uri, _delete_resources)
+
+
+class _FakeResource(object):
+    """ A resource whose delete fails with the given HTTP statuses and error codes, and with a dependency error while
+    the resource it depends on isn't deleted. The operation of a delete completes after `delay` seconds. """
+
+    def __init__(self, name, deleted, errors=(), depends_on=None, delay=0):
+        self.name = name
+        self.deleted = deleted
+        self.errors = list(errors)
+        self.depends_on = depends_on
+        self.delay = delay
+        self.attempts = 0
+
+    def delete(self):
+        import time
+        self.attempts += 1
+        if self.errors:
+            raise _get_cloud_error(self.name, *self.errors.pop(0))
+        if self.depends_on and self.depends_on not in self.deleted:
+            raise _get_cloud_error(self.name, 400, 'InUseSubnetCannotBeDeleted')
+        completion = time.time() + self.delay
+
+        def _result():
+            self.deleted.append(self.name)
+            return self.name
+        return mock.MagicMock(done=lambda: time.time() >= completion, result=_result)
+
+
+def _get_cloud_error(name, status_code, code):
+    from msrestazure.azure_exceptions import CloudError
+    error = CloudError(mock.MagicMock(status_code=status_code), error='{} failed'.format(name))
+    error.error = mock.MagicMock(error=code)
+    error.error.__str__.return_value = error.message
+    return error
 
 
 def _simulate_no_tty():
@@ -49,6 +84,57 @@ class TestCustom(unittest.TestCase):
         self.assertEqual(None, _load_file_string_or_uri(None, 'test', required=False))
         self.assertRaises(CLIError, _load_file_string_or_uri, None, 'test')
 
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_POLL_INTERVAL', 0.01)
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_RETRY_DELAY', 0.01)
+    def test_delete_resources_with_dependencies(self):
+        deleted = []
+        nic = _FakeResource('nic', deleted, delay=0.1)
+        subnet = _FakeResource('subnet', deleted, depends_on='nic')
+        vnet = _FakeResource('vnet', deleted, errors=[(409, 'Conflict')], depends_on='subnet')
+        to_be_deleted = [(r, {'resource_name': r.name}) for r in (vnet, subnet, nic)]
+
+        results, failed = _delete_resources(to_be_deleted, 3)
+        self.assertEqual(results, ['vnet', 'subnet', 'nic'])
+        self.assertEqual(failed, [])
+        self.assertEqual(deleted, ['nic', 'subnet', 'vnet'])
+
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_POLL_INTERVAL', 0.01)
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_MAX_RETRY_DELAY', 0.01)
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_RETRY_DELAY', 0.01)
+    def test_delete_resources_issued_before_completion(self):
+        deleted = []
+        vm = _FakeResource('vm', deleted, delay=0.5)
+        disks = [_FakeResource('disk{}'.format(i), deleted, delay=0.2) for i in range(3)]
+        nic = _FakeResource('nic', deleted, depends_on='vm')
+        to_be_deleted = [(r, {'resource_name': r.name}) for r in [vm, nic] + disks]
+
+        # the deletes are issued one at a time but polled together, and a resource blocked by a long delete is retried
+        # for as long as the delete runs
+        results, failed = _delete_resources(to_be_deleted, 1)
+        self.assertEqual(results, ['vm', 'nic', 'disk0', 'disk1', 'disk2'])
+        self.assertEqual(failed, [])
+        self.assertEqual(deleted, ['disk0', 'disk1', 'disk2', 'vm', 'nic'])
+        self.assertGreater(nic.attempts, 8)
+        self.assertTrue(all(d.attempts == 1 for d in disks))
+
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_POLL_INTERVAL', 0.01)
+    @mock.patch('azure.cli.command_modules.resource.custom._DELETE_RETRY_DELAY', 0.01)
+    def test_delete_resources_failures(self):
+        deleted = []
+        denied = _FakeResource('denied', deleted, errors=[(403, 'AuthorizationFailed')])
+        blocked = _FakeResource('blocked', deleted, depends_on='nic')
+        disk = _FakeResource('disk', deleted)
+        to_be_deleted = [(r, {'resource_name': r.name}) for r in (denied, blocked, disk)]
+
+        # a resource which isn't blocked by a dependency isn't retried, and a blocked one is retried until no other
+        # resource is deleted
+        results, failed = _delete_resources(to_be_deleted, 1)
+        self.assertEqual(results, ['disk'])
+        self.assertEqual([f['resource_name'] for f in failed], ['denied', 'blocked'])
+        self.assertEqual(denied.attempts, 1)
+        self.assertEqual(blocked.attempts, 2)
+        self.assertIn('blocked failed', failed[1]['exception'])
+
     def test_extract_parameters(self):
         tests = [
             {
@@ -3,11 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-# pylint: disable=unused-import
 # pylint: disable=line-too-long
 
 from azure.cli.core import AzCommandsLoader
-from azure.cli.command_modules.servicebus._help import helps
 
 
 class ServicebusCommandsLoader(AzCommandsLoader):
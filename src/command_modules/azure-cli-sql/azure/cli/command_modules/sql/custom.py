@@ -1150,21 +1150,16 @@ def _get_storage_endpoint(
     '''
     from azure.mgmt.storage import StorageManagementClient
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
-
-    # Get storage account
-    client = get_mgmt_service_client(cli_ctx, StorageManagementClient)
-    account = client.storage_accounts.get_properties(
-        resource_group_name=resource_group_name,
-        account_name=storage_account)
+    from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
 
     # Get endpoint
-    # pylint: disable=no-member
-    endpoints = account.primary_endpoints
+    client = get_mgmt_service_client(cli_ctx, StorageManagementClient)
+    endpoints = get_storage_account_resolver(cli_ctx).get_endpoints(storage_account, resource_group_name, client)
     try:
-        return endpoints.blob
-    except AttributeError:
-        raise CLIError("The storage account with name '{}' (id '{}') has no blob endpoint. Use a"
-                       " different storage account.".format(account.name, account.id))
+        return endpoints['blob']
+    except KeyError:
+        raise CLIError("The storage account with name '{}' has no blob endpoint. Use a"
+                       " different storage account.".format(storage_account))
 
 
 def _get_storage_key(
@@ -1177,16 +1172,16 @@ def _get_storage_key(
     '''
     from azure.mgmt.storage import StorageManagementClient
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
 
-    # Get storage keys
+    # Get storage keys. The key is stored by the server, so it's never taken from the cache.
     client = get_mgmt_service_client(cli_ctx, StorageManagementClient)
-    keys = client.storage_accounts.list_keys(
-        resource_group_name=resource_group_name,
-        account_name=storage_account)
+    keys = get_storage_account_resolver(cli_ctx).get_keys(storage_account, resource_group_name, refresh=True,
+                                                          client=client)
 
     # Choose storage key
     index = 1 if use_secondary_key else 0
-    return keys.keys[index].value  # pylint: disable=no-member
+    return keys[index]
 
 
 def _db_security_policy_update(
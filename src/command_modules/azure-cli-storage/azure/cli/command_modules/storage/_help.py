@@ -186,6 +186,14 @@ helps['storage account keys list'] = """
           text: az storage account keys list -g MyResourceGroup -n MyStorageAccount
 """
 
+helps['storage account keys renew'] = """
+    type: command
+    short-summary: Regenerate one of the access keys for a storage account.
+    examples:
+        - name: Regenerate the primary key of a storage account.
+          text: az storage account keys renew -g MyResourceGroup -n MyStorageAccount --key primary
+"""
+
 helps['storage blob'] = """
     type: group
     short-summary: Manage object storage for unstructured data (blobs).
@@ -303,6 +311,42 @@ helps['storage blob upload-batch'] = """
           text: az storage blob upload-batch -d MyContainer --account-name MyStorageAccount -s directory_path --pattern *.py --if-unmodified-since 2018-08-27T20:51Z
 """
 
+helps['storage blob sync'] = """
+    type: command
+    short-summary: Upload the files of a local directory which are new or changed to a blob container.
+    long-summary: >
+        The blobs of the container are listed once, and a file is uploaded when there is no blob for it, when its
+        size differs from the size of the blob or when it was modified after the blob.
+    parameters:
+        - name: --source -s
+          type: string
+          short-summary: The directory where the files to be uploaded are located.
+        - name: --destination -d
+          type: string
+          short-summary: The blob container where the files will be uploaded.
+          long-summary: The destination can be the container URL or the container name. When the destination is the container URL, the storage
+                        account name will be parsed from the URL.
+        - name: --pattern
+          type: string
+          short-summary: The pattern used for globbing files or blobs in the source. The supported patterns are '*', '?', '[seq]', and '[!seq]'.
+        - name: --dryrun
+          type: bool
+          short-summary: Show the summary of the operations to be taken instead of actually uploading or deleting blobs.
+        - name: --check-md5
+          type: bool
+          short-summary: Compare the MD5 hash of the files which have the size of their blob to the Content-MD5 of the blob, and only upload
+                         the ones which differ.
+        - name: --delete-destination
+          type: bool
+          short-summary: Delete the blobs under the destination path which match the pattern and have no file in the source.
+        - name: --type -t
+          short-summary: Defaults to 'page' for *.vhd files, or 'block' otherwise. The setting will override blob types
+                         for every file.
+    examples:
+        - name: Upload the files of a directory which are new or changed, and delete the blobs of files which were removed.
+          text: az storage blob sync -d MyContainer --account-name MyStorageAccount -s directory_path --delete-destination
+"""
+
 helps['storage blob download-batch'] = """
     type: command
     short-summary: Download blobs from a blob container recursively.
@@ -389,6 +433,9 @@ helps['storage blob copy start-batch'] = """
         - name: --source-sas
           type: string
           short-summary: The shared access signature for the source storage account.
+    examples:
+        - name: Copy the blobs of a container to another container, and wait for the copies to complete.
+          text: az storage blob copy start-batch --account-name MyAccount --destination-container MyContainer --source-container MySourceContainer --wait
 """
 
 helps['storage container'] = """
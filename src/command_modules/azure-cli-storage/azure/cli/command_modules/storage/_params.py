@@ -59,6 +59,11 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                                     action='store_true', validator=add_progress_callback)
     socket_timeout_type = CLIArgumentType(help='The socket timeout(secs), used by the service to regulate data flow.',
                                           type=int)
+    max_parallel_files_type = CLIArgumentType(type=int, help='Maximum number of files to transfer at the same time. '
+                                                             'The largest files are transferred first.')
+    resume_type = CLIArgumentType(action='store_true',
+                                  help='Skip the files transferred by a previous run of the command with the same '
+                                       'source and destination which was interrupted.')
 
     sas_help = 'The permissions the SAS grants. Allowed values: {}. Do not use if a stored access policy is ' \
                'referenced with --id that specifies this value. Can be combined.'
@@ -277,6 +282,28 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('maxsize_condition', arg_group='Content Control')
         c.argument('validate_content', action='store_true', min_api='2016-05-31', arg_group='Content Control')
         c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
+        c.argument('max_parallel_files', max_parallel_files_type)
+        c.argument('resume', resume_type, help='Skip the files uploaded by a previous run of the command with the same '
+                                               'source and destination which was interrupted, and resume the upload '
+                                               'of the block blobs larger than 64MB it started.')
+        c.extra('no_progress', progress_type)
+        c.extra('socket_timeout', socket_timeout_type)
+
+    with self.argument_context('storage blob sync') as c:
+        from .sdkutil import get_blob_types
+
+        t_blob_content_settings = self.get_sdk('blob.models#ContentSettings')
+        c.register_content_settings_argument(t_blob_content_settings, update=False, arg_group='Content Control')
+        c.ignore('source_files', 'destination_container_name')
+
+        c.argument('source', options_list=('--source', '-s'))
+        c.argument('destination', options_list=('--destination', '-d'))
+        c.argument('max_connections', type=int,
+                   help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+        c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
+        c.argument('check_md5', action='store_true')
+        c.argument('delete_destination', action='store_true')
+        c.argument('max_parallel_files', max_parallel_files_type)
         c.extra('no_progress', progress_type)
         c.extra('socket_timeout', socket_timeout_type)
 
@@ -297,6 +324,8 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('socket_timeout', socket_timeout_type)
         c.argument('max_connections', type=int,
                    help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+        c.argument('max_parallel_files', max_parallel_files_type)
+        c.argument('resume', resume_type)
 
     with self.argument_context('storage blob delete') as c:
         from .sdkutil import get_delete_blob_snapshot_type_names
@@ -342,6 +371,13 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('source_container')
         c.argument('source_share')
 
+    with self.argument_context('storage blob copy start-batch') as c:
+        c.argument('wait', action='store_true',
+                   help='Wait for the copies to complete, and report the copies which failed or were aborted.')
+        c.argument('max_parallel_files', type=int,
+                   help='Maximum number of copies to start, or to poll the status of, at the same time.')
+        c.extra('no_progress', progress_type)
+
     with self.argument_context('storage blob incremental-copy start') as c:
         from azure.cli.command_modules.storage._validators import process_blob_source_uri
 
@@ -585,6 +621,7 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('max_connections', arg_group='Download Control', type=int)
         c.argument('validate_content', action='store_true', min_api='2016-05-31')
         c.register_content_settings_argument(t_file_content_settings, update=False, arg_group='Content Settings')
+        c.argument('resume', resume_type)
         c.extra('no_progress', progress_type)
 
     with self.argument_context('storage file download-batch') as c:
@@ -6,6 +6,7 @@
 # pylint: disable=protected-access
 
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
+from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
 from azure.cli.core.commands.validators import validate_key_value_pairs
 from azure.cli.core.profiles import ResourceType, get_sdk
 
@@ -24,23 +25,14 @@ storage_account_key_options = {'primary': 'key1', 'secondary': 'key2'}
 # pylint: disable=inconsistent-return-statements,too-many-lines
 def _query_account_key(cli_ctx, account_name):
     """Query the storage account key. This is used when the customer doesn't offer account key but name."""
-    rg, scf = _query_account_rg(cli_ctx, account_name)
-    t_storage_account_keys = get_sdk(
-        cli_ctx, ResourceType.MGMT_STORAGE, 'models.storage_account_keys#StorageAccountKeys')
-
-    if t_storage_account_keys:
-        return scf.storage_accounts.list_keys(rg, account_name).key1
-    # of type: models.storage_account_list_keys_result#StorageAccountListKeysResult
-    return scf.storage_accounts.list_keys(rg, account_name).keys[0].value  # pylint: disable=no-member
+    return get_storage_account_resolver(cli_ctx).get_keys(account_name)[0]
 
 
 def _query_account_rg(cli_ctx, account_name):
     """Query the storage account's resource group, which the mgmt sdk requires."""
-    scf = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_STORAGE)
-    acc = next((x for x in scf.storage_accounts.list() if x.name == account_name), None)
-    if acc:
-        from msrestazure.tools import parse_resource_id
-        return parse_resource_id(acc.id)['resource_group'], scf
+    rg = get_storage_account_resolver(cli_ctx).get_resource_group(account_name)
+    if rg:
+        return rg, get_mgmt_service_client(cli_ctx, ResourceType.MGMT_STORAGE)
     raise ValueError("Storage account '{}' not found.".format(account_name))
 
 
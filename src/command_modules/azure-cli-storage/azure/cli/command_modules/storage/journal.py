@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Transfer journals
+
+The batch commands record the files they transfer, and the blocks of the large block blobs they upload, in a journal
+in the `transfers` directory of the CLI config directory. A record is appended to the journal as soon as a file or a
+block is transferred, so that a command which is interrupted can be run again with `--resume` to skip them. The
+journal is removed once every file is transferred. A journal which cannot be written is disabled with a warning, the
+transfer goes on without it.
+
+The files are recorded with their size and modification time, a file which changed since it was recorded is
+transferred again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+_JOURNAL_DIR = 'transfers'
+
+
+def get_file_version(file_path):
+    """ The size and modification time of the file at `file_path`, None if it doesn't exist. """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+class TransferJournal(object):
+    """ The journal of a batch transfer. Used as a context manager, the journal is removed when the transfer
+    succeeds and kept when it fails. """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stream = None
+        self._disabled = False
+        self._files = {}
+        self._blocks = {}
+        if resume:
+            self._load()
+        else:
+            self._remove_file()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.readlines()
+        except (IOError, OSError):
+            logger.info('No journal of a previous transfer was found, transferring every file.')
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # the last record is incomplete when the transfer was interrupted while writing it
+                continue
+            if 'block' in record:
+                self._blocks.setdefault((record['file'], json.dumps(record['version'])), set()).add(record['block'])
+            else:
+                self._files[record['file']] = record['version']
+
+    def _append(self, record):
+        with self._lock:
+            if self._disabled:
+                return
+            try:
+                if self._stream is None:
+                    from azure.cli.command_modules.storage.util import mkdir_p
+                    mkdir_p(os.path.dirname(self.path))
+                    self._stream = open(self.path, 'a')
+                self._stream.write(json.dumps(record) + '\n')
+                self._stream.flush()
+            except (IOError, OSError) as ex:
+                # the journal only serves --resume, so the transfer goes on without it
+                logger.warning('Failed to write the transfer journal %s, the transfer cannot be resumed: %s',
+                               self.path, ex)
+                self._disabled = True
+
+    def _remove_file(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def is_complete(self, name, version):
+        """ Whether the file `name` was transferred when it had the version `version`. """
+        return version is not None and self._files.get(name) == version
+
+    def complete(self, name, version):
+        """ Record that the file `name` with the version `version` is transferred. """
+        self._files[name] = version
+        self._append({'file': name, 'version': version})
+
+    def get_blocks(self, name, version):
+        """ The IDs of the blocks uploaded for the file `name` with the version `version`. """
+        return set(self._blocks.get((name, json.dumps(version)), ()))
+
+    def add_block(self, name, version, block_id):
+        """ Record that the block `block_id` of the file `name` with the version `version` is uploaded. """
+        self._append({'file': name, 'version': version, 'block': block_id})
+
+    def close(self):
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if exc_type is None:
+            self._remove_file()
+        elif not self._disabled:
+            logger.warning('Run the command again with --resume to skip the files which were transferred.')
+
+
+def get_transfer_journal(cli_ctx, resume, *key):
+    """ The journal of the batch transfer identified by `key`, e.g. the command, its source and its destination.
+    Unless `resume` is set, the journal of a previous transfer is discarded. """
+    digest = hashlib.sha1(u'\n'.join(k or u'' for k in key).encode('utf-8')).hexdigest()
+    return TransferJournal(os.path.join(cli_ctx.config.config_dir, _JOURNAL_DIR, digest + '.journal'), resume)
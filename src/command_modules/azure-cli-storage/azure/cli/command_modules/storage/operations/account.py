@@ -36,7 +36,21 @@ def create_storage_account(cmd, resource_group_name, account_name, sku=None, loc
         params.network_rule_set = NetworkRuleSet(bypass=bypass, default_action=default_action, ip_rules=None,
                                                  virtual_network_rules=None)
 
-    return scf.storage_accounts.create(resource_group_name, account_name, params)
+    result = scf.storage_accounts.create(resource_group_name, account_name, params)
+    # an account of the same name may have been deleted from another resource group
+    _invalidate_storage_account(cmd.cli_ctx, account_name)
+    return result
+
+
+def delete_storage_account(cmd, client, resource_group_name, account_name):
+    result = client.delete(resource_group_name, account_name)
+    _invalidate_storage_account(cmd.cli_ctx, account_name)
+    return result
+
+
+def _invalidate_storage_account(cli_ctx, account_name):
+    from azure.cli.core.commands.storage_accounts import get_storage_account_resolver
+    get_storage_account_resolver(cli_ctx).invalidate(account_name)
 
 
 def list_storage_accounts(cmd, resource_group_name=None):
@@ -48,6 +62,14 @@ def list_storage_accounts(cmd, resource_group_name=None):
     return list(accounts)
 
 
+def regenerate_key(cmd, client, resource_group_name, account_name, key_name):
+    """Regenerate one of the access keys for a storage account."""
+    result = client.regenerate_key(resource_group_name, account_name, key_name)
+    # the previous keys are no longer valid
+    _invalidate_storage_account(cmd.cli_ctx, account_name)
+    return result
+
+
 def show_storage_account_connection_string(cmd, resource_group_name, account_name, protocol='https', blob_endpoint=None,
                                            file_endpoint=None, queue_endpoint=None, table_endpoint=None,
                                            key_name='primary'):
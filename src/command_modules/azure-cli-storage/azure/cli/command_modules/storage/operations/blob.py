@@ -6,6 +6,7 @@
 from __future__ import print_function
 
 import os
+from functools import partial
 from knack.log import get_logger
 
 
@@ -16,6 +17,9 @@ from azure.cli.command_modules.storage.util import (create_blob_service_from_sto
                                                     filter_none, collect_blobs, collect_files,
                                                     mkdir_p, guess_content_type, normalize_blob_file_path,
                                                     check_precondition_success)
+from azure.cli.command_modules.storage.journal import get_file_version, get_transfer_journal
+from azure.cli.command_modules.storage.transfer import (DEFAULT_MAX_PARALLEL_FILES, TransferTask, run_transfers,
+                                                       run_listed_transfers)
 from azure.cli.command_modules.storage.url_quote_util import encode_for_url, make_encoded_file_url_and_params
 
 
@@ -56,11 +60,25 @@ def set_delete_policy(client, enable=None, days_retained=None):
     return client.get_blob_service_properties().delete_retention_policy
 
 
-def storage_blob_copy_batch(cmd, client, source_client, destination_container=None,
+# the number of seconds between two polls of the status of the copies waited for
+_COPY_POLL_INTERVAL = 5
+
+
+def storage_blob_copy_batch(cmd, client, source_client, destination_container=None,  # pylint: disable=too-many-locals
                             destination_path=None, source_container=None, source_share=None,
-                            source_sas=None, pattern=None, dryrun=False):
+                            source_sas=None, pattern=None, dryrun=False, wait=False, progress_callback=None,
+                            max_parallel_files=DEFAULT_MAX_PARALLEL_FILES):
     """Copy a group of blob or files to a blob container."""
     logger = None
+
+    def _start_copies(copies):
+        """ Start the copies, each a function returning the name of its destination blob and the properties of the
+        copy, as they are listed, and wait for them to complete if requested. """
+        tasks = (TransferTask(name, None, lambda _, c=copy: c()) for name, copy in copies)
+        started = run_listed_transfers(tasks, max_parallel_files, action='copy')
+        if wait:
+            _wait_for_copies(client, destination_container, started, max_parallel_files, progress_callback)
+        return [client.make_blob_url(destination_container, blob_name) for blob_name, _ in started]
     if dryrun:
         logger = get_logger(__name__)
         logger.warning('copy files or blobs to blob container')
@@ -81,17 +99,15 @@ def storage_blob_copy_batch(cmd, client, source_client, destination_container=No
             source_sas = create_short_lived_container_sas(cmd, source_client.account_name, source_client.account_key,
                                                           source_container)
 
-        # pylint: disable=inconsistent-return-statements
-        def action_blob_copy(blob_name):
-            if dryrun:
+        if dryrun:
+            for blob_name in collect_blobs(source_client, source_container, pattern):
                 logger.warning('  - copy blob %s', blob_name)
-            else:
-                return _copy_blob_to_blob_container(client, source_client, destination_container, destination_path,
-                                                    source_container, source_sas, blob_name)
+            return []
 
-        return list(filter_none(action_blob_copy(blob) for blob in collect_blobs(source_client,
-                                                                                 source_container,
-                                                                                 pattern)))
+        return _start_copies((blob_name, partial(_copy_blob_to_blob_container, client, source_client,
+                                                 destination_container, destination_path, source_container,
+                                                 source_sas, blob_name))
+                             for blob_name in collect_blobs(source_client, source_container, pattern))
 
     elif source_share:
         # copy blob from file share
@@ -103,41 +119,41 @@ def storage_blob_copy_batch(cmd, client, source_client, destination_container=No
             source_sas = create_short_lived_share_sas(cmd, source_client.account_name, source_client.account_key,
                                                       source_share)
 
-        # pylint: disable=inconsistent-return-statements
-        def action_file_copy(file_info):
-            dir_name, file_name = file_info
-            if dryrun:
+        if dryrun:
+            for dir_name, file_name in collect_files(cmd, source_client, source_share, pattern):
                 logger.warning('  - copy file %s', os.path.join(dir_name, file_name))
-            else:
-                return _copy_file_to_blob_container(client, source_client, destination_container, destination_path,
-                                                    source_share, source_sas, dir_name, file_name)
-
-        return list(filter_none(action_file_copy(file) for file in collect_files(cmd,
-                                                                                 source_client,
-                                                                                 source_share,
-                                                                                 pattern)))
+            return []
+
+        return _start_copies((os.path.join(dir_name, file_name),
+                              partial(_copy_file_to_blob_container, client, source_client, destination_container,
+                                      destination_path, source_share, source_sas, dir_name, file_name))
+                             for dir_name, file_name in collect_files(cmd, source_client, source_share, pattern))
     else:
         raise ValueError('Fail to find source. Neither blob container or file share is specified')
 
 
 # pylint: disable=unused-argument
-def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False,
-                                progress_callback=None, max_connections=2):
+def storage_blob_download_batch(cmd, client, source, destination, source_container_name, pattern=None, dryrun=False,
+                                progress_callback=None, max_connections=2,
+                                max_parallel_files=DEFAULT_MAX_PARALLEL_FILES, resume=False):
+
+    def _download_blob(journal, normalized_blob_name, blob_name, blob_progress_callback):
+        destination_path = os.path.join(destination, normalized_blob_name)
+        if journal.is_complete(normalized_blob_name, get_file_version(destination_path)):
+            get_logger(__name__).info('skipping %s, downloaded by a previous run', blob_name)
+            return blob_name
 
-    def _download_blob(blob_service, container, destination_folder, normalized_blob_name, blob_name):
-        # TODO: try catch IO exception
-        destination_path = os.path.join(destination_folder, normalized_blob_name)
         destination_folder = os.path.dirname(destination_path)
         if not os.path.exists(destination_folder):
             mkdir_p(destination_folder)
 
-        blob = blob_service.get_blob_to_path(container, blob_name, destination_path, max_connections=max_connections,
-                                             progress_callback=progress_callback)
+        blob = client.get_blob_to_path(source_container_name, blob_name, destination_path,
+                                       max_connections=max_connections, progress_callback=blob_progress_callback)
+        journal.complete(normalized_blob_name, get_file_version(destination_path))
         return blob.name
 
-    source_blobs = collect_blobs(client, source_container_name, pattern)
     blobs_to_download = {}
-    for blob_name in source_blobs:
+    for blob_name in collect_blobs(client, source_container_name, pattern):
         # remove starting path seperator and normalize
         normalized_blob_name = normalize_blob_file_path(None, blob_name)
         if normalized_blob_name in blobs_to_download:
@@ -152,14 +168,17 @@ def storage_blob_download_batch(client, source, destination, source_container_na
         logger.warning('download action: from %s to %s', source, destination)
         logger.warning('    pattern %s', pattern)
         logger.warning('  container %s', source_container_name)
-        logger.warning('      total %d', len(source_blobs))
+        logger.warning('      total %d', len(blobs_to_download))
         logger.warning(' operations')
-        for b in source_blobs:
+        for b in blobs_to_download.values():
             logger.warning('  - %s', b)
         return []
 
-    return list(_download_blob(client, source_container_name, destination, blob_normed, blobs_to_download[blob_normed])
-                for blob_normed in blobs_to_download)
+    with get_transfer_journal(cmd.cli_ctx, resume, 'blob download-batch', client.account_name, source_container_name,
+                              os.path.realpath(destination)) as journal:
+        tasks = [TransferTask(blob_name, None, partial(_download_blob, journal, blob_normed, blob_name))
+                 for blob_normed, blob_name in blobs_to_download.items()]
+        return run_transfers(tasks, max_parallel_files, progress_callback, action='download')
 
 
 def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
@@ -168,7 +187,8 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None, progress_callback=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False,
+                              max_parallel_files=DEFAULT_MAX_PARALLEL_FILES, resume=False):
     def _create_return_result(blob_name, blob_content_settings, upload_result=None):
         blob_name = normalize_blob_file_path(destination_path, blob_name)
         return {
@@ -192,24 +212,41 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
             results.append(_create_return_result(dst, guess_content_type(src, content_settings, t_content_settings)))
     else:
         @check_precondition_success
-        def _upload_blob(*args, **kwargs):
-            return upload_blob(*args, **kwargs)
+        def _upload_blob(journal, src, dst, **kwargs):
+            blob_name = normalize_blob_file_path(destination_path, dst)
+            # large block blobs are uploaded a block at a time, so that their upload can be resumed
+            if blob_type == 'block' and (_get_file_size(src) or 0) > client.MAX_SINGLE_PUT_SIZE:
+                return _upload_block_blob_resumable(cmd, client, journal, destination_container_name, blob_name, src,
+                                                    **kwargs)
+            return upload_blob(cmd, client, destination_container_name, blob_name, src, blob_type=blob_type,
+                               maxsize_condition=maxsize_condition, **kwargs)
 
-        for src, dst in source_files or []:
-            logger.warning('uploading %s', src)
+        # pylint: disable=inconsistent-return-statements
+        def _upload_file(journal, src, dst, file_progress_callback):
             guessed_content_settings = guess_content_type(src, content_settings, t_content_settings)
+            version = get_file_version(src)
+            if journal.is_complete(dst, version):
+                logger.info('skipping %s, uploaded by a previous run', src)
+                return _create_return_result(dst, guessed_content_settings)
 
-            include, result = _upload_blob(cmd, client, destination_container_name,
-                                           normalize_blob_file_path(destination_path, dst), src,
-                                           blob_type=blob_type, content_settings=guessed_content_settings,
+            logger.warning('uploading %s', src)
+            include, result = _upload_blob(journal, src, dst, content_settings=guessed_content_settings,
                                            metadata=metadata, validate_content=validate_content,
-                                           maxsize_condition=maxsize_condition, max_connections=max_connections,
-                                           lease_id=lease_id, progress_callback=progress_callback,
+                                           max_connections=max_connections, lease_id=lease_id,
+                                           progress_callback=file_progress_callback,
                                            if_modified_since=if_modified_since,
                                            if_unmodified_since=if_unmodified_since, if_match=if_match,
                                            if_none_match=if_none_match, timeout=timeout)
             if include:
-                results.append(_create_return_result(dst, guessed_content_settings, result))
+                journal.complete(dst, version)
+                return _create_return_result(dst, guessed_content_settings, result)
+
+        with get_transfer_journal(cmd.cli_ctx, resume, 'blob upload-batch', source, client.account_name,
+                                  destination_container_name, destination_path) as journal:
+            tasks = [TransferTask(src, _get_file_size(src), partial(_upload_file, journal, src, dst))
+                     for src, dst in source_files or []]
+            results = list(filter_none(run_transfers(tasks, max_parallel_files, progress_callback,
+                                                     action='upload')))
 
         num_failures = len(source_files) - len(results)
         if num_failures:
@@ -217,6 +254,104 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
     return results
 
 
+def storage_blob_sync(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
+                      source_files=None, destination_path=None, destination_container_name=None, blob_type=None,
+                      content_settings=None, metadata=None, check_md5=False, delete_destination=False,
+                      max_connections=2, progress_callback=None, timeout=None, dryrun=False,
+                      max_parallel_files=DEFAULT_MAX_PARALLEL_FILES):
+    """Upload the files of a local directory which are missing from a blob container or changed since they were
+    uploaded, comparing their size and modification time to the ones of the blobs listed once."""
+    from fnmatch import fnmatch
+
+    logger = get_logger(__name__)
+    t_content_settings = cmd.get_models('blob.models#ContentSettings')
+
+    prefix = normalize_blob_file_path(destination_path, '') + '/' if destination_path else ''
+    blobs = {b.name: b.properties for b in client.list_blobs(destination_container_name, prefix=prefix or None,
+                                                              timeout=timeout)}
+
+    def _get_result(blob_name, action, upload_result=None):
+        return {
+            'Blob': client.make_blob_url(destination_container_name, blob_name),
+            'Action': action,
+            'Last Modified': upload_result.last_modified if upload_result else None,
+            'eTag': upload_result.etag if upload_result else None}
+
+    # pylint: disable=inconsistent-return-statements
+    def _sync_file(src, blob_name, file_progress_callback):
+        properties = blobs.get(blob_name)
+        # only the files with the size of their blob may be unchanged, the others aren't read twice
+        if check_md5 and properties and properties.content_settings.content_md5 and \
+                _get_file_size(src) == properties.content_length and \
+                _get_file_md5(src) == properties.content_settings.content_md5:
+            logger.info('%s is unchanged', src)
+            return
+        if dryrun:
+            return _get_result(blob_name, 'upload')
+        logger.warning('uploading %s', src)
+        result = upload_blob(cmd, client, destination_container_name, blob_name, src, blob_type=blob_type,
+                             content_settings=guess_content_type(src, content_settings, t_content_settings),
+                             metadata=metadata, max_connections=max_connections,
+                             progress_callback=file_progress_callback, timeout=timeout)
+        return _get_result(blob_name, 'upload', result)
+
+    def _delete_blob(blob_name, _):
+        if not dryrun:
+            logger.warning('deleting %s', blob_name)
+            client.delete_blob(destination_container_name, blob_name, delete_snapshots='include', timeout=timeout)
+        return _get_result(blob_name, 'delete')
+
+    tasks = []
+    local_blobs = set()
+    for src, dst in source_files or []:
+        blob_name = normalize_blob_file_path(destination_path, dst)
+        local_blobs.add(blob_name)
+        if _is_file_changed(src, blobs.get(blob_name)):
+            tasks.append(TransferTask(src, _get_file_size(src), partial(_sync_file, src, blob_name)))
+    logger.info('%s of %s files are new or changed', len(tasks), len(source_files or []))
+    results = list(filter_none(run_transfers(tasks, max_parallel_files, progress_callback, action='upload')))
+
+    if delete_destination:
+        # the blobs which don't match the pattern are left alone, like the files which don't
+        extraneous = [name for name in blobs if name not in local_blobs and
+                      (not pattern or fnmatch(name[len(prefix):], pattern.lstrip('/')))]
+        tasks = [TransferTask(name, None, partial(_delete_blob, name)) for name in extraneous]
+        results.extend(run_transfers(tasks, max_parallel_files, action='delete'))
+    return results
+
+
+def _is_file_changed(file_path, blob_properties):
+    """Whether the file at `file_path` differs from the blob with `blob_properties` by size, or was modified after the
+    blob. Files which could not be compared are considered changed."""
+    import calendar
+    if blob_properties is None:
+        return True
+    try:
+        if os.path.getsize(file_path) != blob_properties.content_length:
+            return True
+        return os.path.getmtime(file_path) > calendar.timegm(blob_properties.last_modified.utctimetuple())
+    except (OSError, AttributeError, TypeError):
+        return True
+
+
+def _get_file_md5(file_path):
+    """The base64 encoded MD5 hash of the file at `file_path`, as stored in the Content-MD5 property of blobs."""
+    import base64
+    import hashlib
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('utf-8')
+
+
+def _get_file_size(file_path):
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return None
+
+
 def upload_blob(cmd, client, container_name, blob_name, file_path, blob_type=None, content_settings=None, metadata=None,
                 validate_content=False, maxsize_condition=None, max_connections=2, lease_id=None, tier=None,
                 if_modified_since=None, if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None,
@@ -297,6 +432,67 @@ def upload_blob(cmd, client, container_name, blob_name, file_path, blob_type=Non
     return type_func[blob_type]()
 
 
+def _upload_block_blob_resumable(cmd, client, journal, container_name, blob_name,  # pylint: disable=too-many-locals
+                                 file_path, content_settings=None, metadata=None, validate_content=False,
+                                 max_connections=2, lease_id=None, progress_callback=None, if_modified_since=None,
+                                 if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None):
+    """Upload a block blob a block at a time, recording the blocks in `journal`. The blocks recorded by a previous
+    upload of the same version of the file which are still uncommitted are not uploaded again."""
+    import hashlib
+    import json
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from azure.common import AzureMissingResourceHttpError
+
+    t_blob_block = cmd.get_models('blob.models#BlobBlock')
+    version = get_file_version(file_path)
+    size = version[0]
+    # increase the block size when the block list would contain more than 50,000 blocks
+    block_size = max(client.MAX_BLOCK_SIZE, -(-size // 50000))
+    # the IDs of the blocks change with the file and the block size, so that stale blocks are never committed
+    prefix = hashlib.sha1(json.dumps(version + [block_size]).encode('utf-8')).hexdigest()[:16]
+    block_ids = ['{}-{:08d}'.format(prefix, i) for i in range(-(-size // block_size))]
+
+    uploaded = journal.get_blocks(blob_name, version)
+    if uploaded:
+        try:
+            # uncommitted blocks are discarded by the service after a week, or when another upload commits the blob
+            block_list = client.get_block_list(container_name, blob_name, block_list_type='uncommitted',
+                                               lease_id=lease_id, timeout=timeout)
+            uploaded &= set(b.id for b in block_list.uncommitted_blocks)
+        except AzureMissingResourceHttpError:
+            uploaded = set()
+        get_logger(__name__).info('resuming the upload of %s, %d of %d blocks were uploaded', file_path,
+                                  len(uploaded), len(block_ids))
+
+    put_block_args = {'lease_id': lease_id, 'timeout': timeout}
+    if cmd.supported_api_version(min_api='2016-05-31'):
+        put_block_args['validate_content'] = validate_content
+
+    lock = threading.Lock()
+    progress = [sum(min(block_size, size - i * block_size) for i, b in enumerate(block_ids) if b in uploaded)]
+
+    def _put_block(index):
+        with open(file_path, 'rb') as f:
+            f.seek(index * block_size)
+            block = f.read(block_size)
+        client.put_block(container_name, blob_name, block, block_ids[index], **put_block_args)
+        journal.add_block(blob_name, version, block_ids[index])
+        if progress_callback:
+            with lock:
+                progress[0] += len(block)
+                progress_callback(progress[0], size)
+
+    with ThreadPoolExecutor(max_workers=max(max_connections, 1)) as executor:
+        # the results are read to raise the first failure
+        list(executor.map(_put_block, [i for i, b in enumerate(block_ids) if b not in uploaded]))
+
+    return client.put_block_list(container_name, blob_name, [t_blob_block(id=b) for b in block_ids],
+                                 content_settings=content_settings, metadata=metadata, lease_id=lease_id,
+                                 if_modified_since=if_modified_since, if_unmodified_since=if_unmodified_since,
+                                 if_match=if_match, if_none_match=if_none_match, timeout=timeout)
+
+
 def show_blob(cmd, client, container_name, blob_name, snapshot=None, lease_id=None,
               if_modified_since=None, if_unmodified_since=None, if_match=None,
               if_none_match=None, timeout=None):
@@ -335,9 +531,9 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
         return client.delete_blob(**delete_blob_args)
 
     logger = get_logger(__name__)
-    source_blobs = list(collect_blobs(client, source_container_name, pattern))
 
     if dryrun:
+        source_blobs = list(collect_blobs(client, source_container_name, pattern))
         logger.warning('delete action: from %s', source)
         logger.warning('    pattern %s', pattern)
         logger.warning('  container %s', source_container_name)
@@ -347,10 +543,16 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
             logger.warning('  - %s', blob)
         return []
 
-    results = [result for include, result in (_delete_blob(blob) for blob in source_blobs) if include]
-    num_failures = len(source_blobs) - len(results)
+    # the blobs are deleted as they are listed
+    total, results = 0, []
+    for blob in collect_blobs(client, source_container_name, pattern):
+        total += 1
+        include, result = _delete_blob(blob)
+        if include:
+            results.append(result)
+    num_failures = total - len(results)
     if num_failures:
-        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, len(source_blobs))
+        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, total)
 
 
 def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_container, destination_path,
@@ -360,8 +562,8 @@ def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_
                                                         sas_token=source_sas)
     destination_blob_name = normalize_blob_file_path(destination_path, source_blob_name)
     try:
-        blob_service.copy_blob(destination_container, destination_blob_name, source_blob_url)
-        return blob_service.make_blob_url(destination_container, destination_blob_name)
+        copy = blob_service.copy_blob(destination_container, destination_blob_name, source_blob_url)
+        return destination_blob_name, copy
     except AzureException:
         from knack.util import CLIError
         error_template = 'Failed to copy blob {} to container {}.'
@@ -379,9 +581,52 @@ def _copy_file_to_blob_container(blob_service, source_file_service, destination_
     destination_blob_name = normalize_blob_file_path(destination_path, source_path)
 
     try:
-        blob_service.copy_blob(destination_container, destination_blob_name, file_url)
-        return blob_service.make_blob_url(destination_container, destination_blob_name)
+        copy = blob_service.copy_blob(destination_container, destination_blob_name, file_url)
+        return destination_blob_name, copy
     except AzureException as ex:
         from knack.util import CLIError
         error_template = 'Failed to copy file {} to container {}. {}'
         raise CLIError(error_template.format(source_file_name, destination_container, ex))
+
+
+def _get_copy_progress(copy):
+    """ The number of bytes copied and the total number of bytes of `copy`, from its 'copied/total' progress. """
+    try:
+        current, total = (int(n) for n in copy.progress.split('/'))
+        return current, total
+    except (AttributeError, ValueError):
+        return 0, 0
+
+
+def _wait_for_copies(client, container_name, copies, max_parallel_files, progress_callback=None):
+    """ Poll the status of the copies to the blobs of `copies`, pairs of blob names and copy properties, until none is
+    pending. The copies which failed or were aborted are reported once every copy is done. """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from knack.util import CLIError
+
+    def _get_copy(blob_name):
+        return client.get_blob_properties(container_name, blob_name).properties.copy
+
+    logger = get_logger(__name__)
+    copies = dict(copies)
+    with ThreadPoolExecutor(max_workers=max_parallel_files) as executor:
+        while True:
+            pending = sorted(name for name, copy in copies.items() if copy.status == 'pending')
+            if progress_callback:
+                progress = [_get_copy_progress(c) for c in copies.values()]
+                current, total = sum(p[0] for p in progress), sum(p[1] for p in progress)
+                # the progress ends when the current value reaches the total
+                if total and (current < total or not pending):
+                    progress_callback(current, total)
+            if not pending:
+                break
+            logger.info('waiting for %d of %d copies', len(pending), len(copies))
+            time.sleep(_COPY_POLL_INTERVAL)
+            copies.update(zip(pending, executor.map(_get_copy, pending)))
+
+    failures = sorted((name, copy) for name, copy in copies.items() if copy.status in ('failed', 'aborted'))
+    if failures:
+        for name, copy in failures:
+            logger.error('Copy to %s %s: %s', name, copy.status, copy.status_description)
+        raise CLIError('{} of {} copies failed or were aborted.'.format(len(failures), len(copies)))
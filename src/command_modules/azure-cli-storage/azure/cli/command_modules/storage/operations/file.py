@@ -40,9 +40,10 @@ def list_share_files(cmd, client, share_name, directory_name=None, timeout=None,
 
 def storage_file_upload_batch(cmd, client, destination, source, destination_path=None, pattern=None, dryrun=False,
                               validate_content=False, content_settings=None, max_connections=1, metadata=None,
-                              progress_callback=None):
+                              progress_callback=None, resume=False):
     """ Upload local files to Azure Storage File Share in batch """
 
+    from azure.cli.command_modules.storage.journal import get_file_version, get_transfer_journal
     from azure.cli.command_modules.storage.util import glob_files_locally, normalize_blob_file_path
 
     source_files = [c for c in glob_files_locally(source, pattern)]
@@ -60,11 +61,16 @@ def storage_file_upload_batch(cmd, client, destination, source, destination_path
 
     # TODO: Performance improvement
     # 1. Upload files in parallel
-    def _upload_action(src, dst):
+    def _upload_action(journal, src, dst):
         dst = normalize_blob_file_path(destination_path, dst)
         dir_name = os.path.dirname(dst)
         file_name = os.path.basename(dst)
 
+        version = get_file_version(src)
+        if journal.is_complete(dst, version):
+            logger.info('skipping %s, uploaded by a previous run', src)
+            return client.make_file_url(destination, dir_name, file_name)
+
         _make_directory_in_files_share(client, destination, dir_name)
         create_file_args = {'share_name': destination, 'directory_name': dir_name, 'file_name': file_name,
                             'local_file_path': src, 'progress_callback': progress_callback,
@@ -76,10 +82,13 @@ def storage_file_upload_batch(cmd, client, destination, source, destination_path
 
         logger.warning('uploading %s', src)
         client.create_file_from_path(**create_file_args)
+        journal.complete(dst, version)
 
         return client.make_file_url(destination, dir_name, file_name)
 
-    return list(_upload_action(src, dst) for src, dst in source_files)
+    with get_transfer_journal(cmd.cli_ctx, resume, 'file upload-batch', os.path.realpath(source), client.account_name,
+                              destination, destination_path) as journal:
+        return list(_upload_action(journal, src, dst) for src, dst in source_files)
 
 
 def storage_file_download_batch(cmd, client, source, destination, pattern=None, dryrun=False, validate_content=False,
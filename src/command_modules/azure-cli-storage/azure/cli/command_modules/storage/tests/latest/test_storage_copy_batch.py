@@ -0,0 +1,92 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import mock
+
+from knack.util import CLIError
+
+from azure.cli.command_modules.storage.operations.blob import storage_blob_copy_batch
+
+
+def _get_copy(status, progress=None, status_description=None):
+    return mock.MagicMock(status=status, progress=progress, status_description=status_description)
+
+
+class TestStorageBlobCopyBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.client.make_blob_url.side_effect = lambda container, blob: '{}/{}'.format(container, blob)
+        self.source_client = mock.MagicMock()
+        self.source_client.list_blobs.return_value = [mock.MagicMock() for _ in range(3)]
+        for i, blob in enumerate(self.source_client.list_blobs.return_value):
+            blob.name = 'blob{}'.format(i)
+        self.copies = {}
+        self.client.copy_blob.side_effect = lambda container, blob, _: self.copies[blob].pop(0)
+        self.client.get_blob_properties.side_effect = \
+            lambda container, blob: mock.MagicMock(properties=mock.MagicMock(copy=self.copies[blob].pop(0)))
+
+    def _copy_batch(self, **kwargs):
+        with mock.patch('azure.cli.command_modules.storage.operations.blob._COPY_POLL_INTERVAL', 0):
+            return storage_blob_copy_batch(mock.MagicMock(), self.client, self.source_client,
+                                           destination_container='dest', source_container='src', source_sas='sas',
+                                           **kwargs)
+
+    def test_storage_blob_copy_batch_wait(self):
+        self.copies = {
+            'blob0': [_get_copy('success', '10/10')],
+            'blob1': [_get_copy('pending'), _get_copy('pending', '5/20'), _get_copy('success', '20/20')],
+            'blob2': [_get_copy('pending'), _get_copy('success', '30/30')],
+        }
+        progress = []
+        results = self._copy_batch(wait=True, progress_callback=lambda c, t: progress.append((c, t)))
+        self.assertEqual(results, ['dest/blob0', 'dest/blob1', 'dest/blob2'])
+        self.assertEqual(self.client.copy_blob.call_count, 3)
+        self.assertEqual(self.client.get_blob_properties.call_count, 3)
+        self.assertEqual(progress, [(45, 60), (60, 60)])
+
+    def test_storage_blob_copy_batch_failures(self):
+        self.copies = {
+            'blob0': [_get_copy('pending'), _get_copy('failed', status_description='500 InternalError')],
+            'blob1': [_get_copy('pending'), _get_copy('aborted')],
+            'blob2': [_get_copy('success')],
+        }
+        with self.assertRaisesRegexp(CLIError, '2 of 3 copies failed or were aborted'):
+            self._copy_batch(wait=True)
+
+        # the copies are not waited for by default
+        self.client.get_blob_properties.reset_mock()
+        self.copies = {'blob{}'.format(i): [_get_copy('pending')] for i in range(3)}
+        self.assertEqual(len(self._copy_batch()), 3)
+        self.assertFalse(self.client.get_blob_properties.called)
+
+    def test_storage_blob_copy_batch_lazily(self):
+        listed = []
+
+        def _list_blobs(*_, **__):
+            for i in range(50):
+                listed.append(i)
+                blob = mock.MagicMock()
+                blob.name = 'blob{}'.format(i)
+                yield blob
+
+        started = []
+
+        def _copy_blob(container, blob, _):
+            started.append(len(listed))
+            return _get_copy('success')
+        self.source_client.list_blobs.side_effect = _list_blobs
+        self.client.copy_blob.side_effect = _copy_blob
+
+        results = self._copy_batch(max_parallel_files=2)
+        self.assertEqual(results, ['dest/blob{}'.format(i) for i in range(50)])
+        # the copies start while the blobs are listed, with at most twice as many copies as threads listed ahead
+        self.assertLessEqual(started[0], 5)
+        self.assertTrue(all(n <= i + 5 for i, n in enumerate(sorted(started))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+
+from azure.cli.command_modules.storage.journal import get_file_version, get_transfer_journal
+from azure.cli.command_modules.storage.operations.blob import _upload_block_blob_resumable
+
+
+class TestStorageTransferJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.config.config_dir = self.config_dir
+        self.file_path = os.path.join(self.config_dir, 'file.txt')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'0123456789')
+
+    def _get_journal(self, resume):
+        return get_transfer_journal(self.cli_ctx, resume, 'blob upload-batch', self.config_dir, 'account', None)
+
+    def test_transfer_journal(self):
+        version = get_file_version(self.file_path)
+        self.assertEqual(version[0], 10)
+        self.assertIsNone(get_file_version(os.path.join(self.config_dir, 'missing.txt')))
+
+        with self.assertRaises(IOError):
+            with self._get_journal(resume=False) as journal:
+                journal.complete('file.txt', version)
+                journal.add_block('large.txt', [100, 1], 'block-1')
+                raise IOError('interrupted')
+        # an incomplete record is ignored
+        with open(self._get_journal(resume=True).path, 'a') as f:
+            f.write('{"file": "other.txt", "vers')
+
+        with self._get_journal(resume=True) as journal:
+            self.assertTrue(journal.is_complete('file.txt', version))
+            self.assertFalse(journal.is_complete('file.txt', [11, version[1]]))
+            self.assertFalse(journal.is_complete('other.txt', version))
+            self.assertEqual(journal.get_blocks('large.txt', [100, 1]), {'block-1'})
+            self.assertEqual(journal.get_blocks('large.txt', [100, 2]), set())
+            path = journal.path
+        # the journal is removed once the transfer succeeds
+        self.assertFalse(os.path.exists(path))
+
+        # the journal of another transfer is discarded without --resume
+        with self._get_journal(resume=False) as journal:
+            journal.complete('file.txt', version)
+        with self.assertRaises(IOError):
+            with self._get_journal(resume=False) as journal:
+                raise IOError('interrupted')
+        self.assertFalse(self._get_journal(resume=True).is_complete('file.txt', version))
+
+    def test_transfer_journal_write_error(self):
+        # the journal directory cannot be created under a file
+        self.cli_ctx.config.config_dir = self.file_path
+        version = get_file_version(self.file_path)
+        with mock.patch('azure.cli.command_modules.storage.journal.logger') as logger:
+            with self._get_journal(resume=False) as journal:
+                journal.complete('file.txt', version)
+                journal.add_block('large.txt', [100, 1], 'block-1')
+                self.assertTrue(journal.is_complete('file.txt', version))
+        self.assertEqual(logger.warning.call_count, 1)
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_upload_block_blob_resumable(self):
+        client = mock.MagicMock(MAX_BLOCK_SIZE=4)
+        cmd = mock.MagicMock()
+        cmd.get_models.return_value = lambda id: id  # pylint: disable=redefined-builtin
+        progress = []
+
+        def _put_block(container_name, blob_name, block, block_id, **_):
+            if block != b'0123':
+                raise IOError('interrupted')
+
+        with self.assertRaises(IOError):
+            with self._get_journal(resume=False) as journal:
+                client.put_block.side_effect = _put_block
+                _upload_block_blob_resumable(cmd, client, journal, 'container', 'blob', self.file_path,
+                                             max_connections=1)
+        block_ids = {c[0][2]: c[0][3] for c in client.put_block.call_args_list}
+        self.assertEqual(sorted(block_ids), [b'0123', b'4567', b'89'])
+        self.assertFalse(client.put_block_list.called)
+
+        # the blocks which were uploaded and are still uncommitted are not uploaded again
+        client.reset_mock()
+        client.put_block.side_effect = None
+        client.get_block_list.return_value.uncommitted_blocks = [mock.MagicMock(id=block_ids[b'0123'])]
+        with self._get_journal(resume=True) as journal:
+            _upload_block_blob_resumable(cmd, client, journal, 'container', 'blob', self.file_path,
+                                         max_connections=2, progress_callback=lambda c, t: progress.append((c, t)))
+        self.assertEqual(sorted(c[0][2] for c in client.put_block.call_args_list), [b'4567', b'89'])
+        committed = client.put_block_list.call_args[0][2]
+        self.assertEqual(committed, [block_ids[b'0123'], block_ids[b'4567'], block_ids[b'89']])
+        self.assertEqual(progress[-1], (10, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
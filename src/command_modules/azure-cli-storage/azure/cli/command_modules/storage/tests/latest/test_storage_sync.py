@@ -0,0 +1,106 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import datetime
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+
+from azure.cli.command_modules.storage.operations.blob import storage_blob_sync, _get_file_md5
+from azure.cli.command_modules.storage.util import glob_files_locally
+
+
+class TestStorageBlobSync(unittest.TestCase):
+
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.old = datetime.datetime.utcnow() - datetime.timedelta(days=1)
+        self.new = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        self.blobs = []
+        self.client = mock.MagicMock()
+        self.client.list_blobs.side_effect = lambda *_, **__: self.blobs
+        self.client.make_blob_url.side_effect = lambda container, blob: '{}/{}'.format(container, blob)
+
+    def _write_file(self, name, content):
+        path = os.path.join(self.source, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    def _add_blob(self, name, content, last_modified, content_md5=None):
+        blob = mock.MagicMock()
+        blob.name = name
+        blob.properties.content_length = len(content)
+        blob.properties.last_modified = last_modified
+        blob.properties.content_settings.content_md5 = content_md5
+        self.blobs.append(blob)
+
+    def _sync(self, pattern=None, destination_path=None, **kwargs):
+        source_files = list(glob_files_locally(self.source, pattern))
+        with mock.patch('azure.cli.command_modules.storage.operations.blob.upload_blob') as upload_blob:
+            results = storage_blob_sync(mock.MagicMock(), self.client, self.source, 'container', pattern=pattern,
+                                        source_files=source_files, destination_path=destination_path,
+                                        destination_container_name='container',
+                                        content_settings=mock.MagicMock(content_type='text/plain'), **kwargs)
+        return sorted((r['Action'], r['Blob']) for r in results), upload_blob
+
+    def test_storage_blob_sync(self):
+        self._write_file('new.txt', b'new')
+        self._write_file('same.txt', b'same')
+        self._write_file(os.path.join('dir', 'resized.txt'), b'resized')
+        self._write_file('modified.txt', b'modified')
+        self._add_blob('same.txt', b'same', self.new)
+        self._add_blob('dir/resized.txt', b'size', self.new)
+        self._add_blob('modified.txt', b'modified', self.old)
+        self._add_blob('removed.txt', b'removed', self.new)
+
+        results, upload_blob = self._sync(dryrun=True)
+        self.assertEqual(results, [('upload', 'container/dir/resized.txt'), ('upload', 'container/modified.txt'),
+                                   ('upload', 'container/new.txt')])
+        self.assertFalse(upload_blob.called)
+        self.assertFalse(self.client.delete_blob.called)
+        self.client.list_blobs.reset_mock()
+
+        results, upload_blob = self._sync(delete_destination=True)
+        self.assertEqual(results, [('delete', 'container/removed.txt'), ('upload', 'container/dir/resized.txt'),
+                                   ('upload', 'container/modified.txt'), ('upload', 'container/new.txt')])
+        self.assertEqual(upload_blob.call_count, 3)
+        self.client.list_blobs.assert_called_once_with('container', prefix=None, timeout=None)
+        self.client.delete_blob.assert_called_once_with('container', 'removed.txt', delete_snapshots='include',
+                                                        timeout=None)
+
+    def test_storage_blob_sync_md5(self):
+        self._write_file('touched.txt', b'touched')
+        self._write_file('changed.txt', b'changed')
+        md5 = base64.b64encode(hashlib.md5(b'touched').digest()).decode('utf-8')
+        self._add_blob('dir/touched.txt', b'touched', self.old, md5)
+        self._add_blob('dir/changed.txt', b'changed', self.old, md5)
+        # the blobs which don't match the pattern are not deleted
+        self._add_blob('dir/removed.log', b'removed', self.old)
+
+        # the files whose size differs from their blob are not hashed
+        self._write_file('resized.txt', b'resized')
+        self._add_blob('dir/resized.txt', b'size', self.new, md5)
+
+        with mock.patch('azure.cli.command_modules.storage.operations.blob._get_file_md5',
+                        wraps=_get_file_md5) as get_file_md5:
+            results, upload_blob = self._sync(pattern='*.txt', destination_path='dir', check_md5=True,
+                                              delete_destination=True)
+        self.assertEqual(results, [('upload', 'container/dir/changed.txt'), ('upload', 'container/dir/resized.txt')])
+        self.assertEqual(sorted(os.path.basename(c[0][0]) for c in get_file_md5.call_args_list),
+                         ['changed.txt', 'touched.txt'])
+        self.assertEqual(sorted(c[0][3] for c in upload_blob.call_args_list), ['dir/changed.txt', 'dir/resized.txt'])
+        self.client.list_blobs.assert_called_once_with('container', prefix='dir/', timeout=None)
+        self.assertFalse(self.client.delete_blob.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+from knack.util import CLIError
+
+from azure.cli.command_modules.storage.transfer import TransferTask, run_listed_transfers, run_transfers
+
+
+class TestStorageTransfer(unittest.TestCase):
+
+    def test_run_transfers(self):
+        started = []
+        lock = threading.Lock()
+
+        def _transfer(name, size, progress_callback):
+            with lock:
+                started.append(name)
+            if progress_callback:
+                progress_callback(size // 2, size)
+                progress_callback(size, size)
+            return name.upper()
+
+        tasks = [TransferTask(name, size, lambda cb, n=name, s=size: _transfer(n, s, cb))
+                 for name, size in [('small', 10), ('large', 1000), ('medium', 100)]]
+        progress = []
+        results = run_transfers(tasks, 1, lambda current, total: progress.append((current, total)))
+
+        # the results keep the order of the tasks, while the largest files are transferred first
+        self.assertEqual(results, ['SMALL', 'LARGE', 'MEDIUM'])
+        self.assertEqual(started, ['large', 'medium', 'small'])
+        # the progress of the files is reported as one, and only reaches the total once every file is transferred
+        self.assertTrue(all(total == 1110 for _, total in progress))
+        self.assertEqual([p for p in progress if p[0] == p[1]], [(1110, 1110)])
+        self.assertEqual(progress[-1], (1110, 1110))
+
+    def test_run_transfers_failures(self):
+        def _transfer(name):
+            if name.startswith('bad'):
+                raise IOError('{} is not readable'.format(name))
+            return name
+
+        tasks = [TransferTask(name, None, lambda _, n=name: _transfer(n)) for name in ['a', 'bad1', 'b', 'bad2', 'c']]
+        self.assertEqual(run_transfers(tasks[::2], 3), ['a', 'b', 'c'])
+
+        # the other files are still transferred when some fail
+        transferred = []
+        tasks.append(TransferTask('d', None, lambda _: transferred.append('d')))
+        with self.assertRaisesRegexp(CLIError, '2 of 6 files failed to upload'):
+            run_transfers(tasks, 2, action='upload')
+        self.assertEqual(transferred, ['d'])
+
+        with self.assertRaises(CLIError):
+            run_transfers(tasks, 0)
+
+    def test_run_listed_transfers(self):
+        listed = []
+
+        def _list_tasks():
+            for name in ['a', 'bad1', 'b', 'bad2', 'c']:
+                listed.append(name)
+                yield TransferTask(name, None, lambda _, n=name: _transfer(n))
+
+        def _transfer(name):
+            if name.startswith('bad'):
+                raise IOError('{} is not readable'.format(name))
+            return name.upper()
+
+        self.assertEqual(run_listed_transfers((t for t in _list_tasks() if not t.name.startswith('bad')), 1),
+                         ['A', 'B', 'C'])
+        with self.assertRaisesRegexp(CLIError, '2 of 5 files failed to copy'):
+            run_listed_transfers(_list_tasks(), 2, action='copy')
+        with self.assertRaises(CLIError):
+            run_listed_transfers(_list_tasks(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import mock
+
+from azure.cli.command_modules.storage.util import collect_blobs
+
+
+def _get_blob(name):
+    blob = mock.MagicMock()
+    blob.name = name
+    return blob
+
+
+class TestStorageUtil(unittest.TestCase):
+
+    def setUp(self):
+        self.blob_service = mock.MagicMock()
+        self.names = ['logs/2018/a.log', 'logs/2018/b.txt', 'logs/2019/c.log']
+
+        def _list_blobs(_, prefix=None):
+            for name in self.names:
+                if not prefix or name.startswith(prefix):
+                    yield _get_blob(name)
+        self.blob_service.list_blobs.side_effect = _list_blobs
+
+    def test_collect_blobs_prefix(self):
+        self.assertEqual(list(collect_blobs(self.blob_service, 'container', 'logs/2018/*.log')), ['logs/2018/a.log'])
+        self.blob_service.list_blobs.assert_called_with('container', prefix='logs/2018/')
+        self.assertEqual(list(collect_blobs(self.blob_service, 'container', 'logs/20[01]?/*.log')),
+                         ['logs/2018/a.log', 'logs/2019/c.log'])
+        self.blob_service.list_blobs.assert_called_with('container', prefix='logs/20')
+        self.assertEqual(len(list(collect_blobs(self.blob_service, 'container', '*'))), 3)
+        self.blob_service.list_blobs.assert_called_with('container', prefix=None)
+        self.assertEqual(len(list(collect_blobs(self.blob_service, 'container'))), 3)
+
+        self.blob_service.exists.return_value = True
+        self.assertEqual(list(collect_blobs(self.blob_service, 'container', 'logs/2018/a.log')), ['logs/2018/a.log'])
+        self.assertEqual(self.blob_service.list_blobs.call_count, 4)
+
+    def test_collect_blobs_lazily(self):
+        blobs = collect_blobs(self.blob_service, 'container', 'logs/*')
+        self.assertFalse(self.blob_service.list_blobs.called)
+        self.assertEqual(next(blobs), 'logs/2018/a.log')
+
+        with self.assertRaises(ValueError):
+            collect_blobs(self.blob_service, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
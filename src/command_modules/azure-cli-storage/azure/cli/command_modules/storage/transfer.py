@@ -0,0 +1,123 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+from collections import namedtuple
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+# the number of files the batch commands transfer at the same time by default
+DEFAULT_MAX_PARALLEL_FILES = 8
+
+# a file to transfer: `run` is called with the progress callback of the file and returns the result of the transfer.
+# `size` is the size of the file in bytes, or None when it isn't known.
+TransferTask = namedtuple('TransferTask', ['name', 'size', 'run'])
+
+
+class _AggregateProgress(object):
+    """ Reports the progress of concurrent transfers to a progress callback as the progress of a single transfer. """
+
+    def __init__(self, progress_callback, tasks):
+        self._progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._current = [0] * len(tasks)
+        self._total = [t.size or 0 for t in tasks]
+        self._remaining = len(tasks)
+
+    def _report(self):
+        current, total = sum(self._current), sum(self._total)
+        # the callback ends the progress once the current value reaches the total, which happens before the end when
+        # the size of the transfers which haven't started isn't known
+        if total and (current < total or not self._remaining):
+            self._progress_callback(current, total)
+
+    def get_callback(self, index):
+        def _update_progress(current, total):
+            with self._lock:
+                self._current[index] = current
+                if total:
+                    self._total[index] = total
+                self._report()
+        return _update_progress
+
+    def task_done(self, index):
+        with self._lock:
+            self._current[index] = self._total[index]
+            self._remaining -= 1
+            self._report()
+
+
+def run_transfers(tasks, max_parallel_files, progress_callback=None, action='transfer'):
+    """ Run the `TransferTask`s `tasks` on up to `max_parallel_files` threads, the largest files first, so that the
+    small files are transferred while the large ones are. Returns the results of the tasks in the order of `tasks`.
+    A task which fails doesn't stop the others; the failures are reported once all the tasks are done. """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    if max_parallel_files < 1:
+        raise CLIError('usage error: --max-parallel-files must be at least 1.')
+
+    progress = _AggregateProgress(progress_callback, tasks) if progress_callback else None
+    results = [None] * len(tasks)
+    failures = []
+    order = sorted(range(len(tasks)), key=lambda i: -(tasks[i].size or 0))
+    with ThreadPoolExecutor(max_workers=max_parallel_files) as executor:
+        futures = {executor.submit(tasks[i].run, progress.get_callback(i) if progress else None): i for i in order}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as ex:  # pylint: disable=broad-except
+                failures.append((index, tasks[index].name, ex))
+            if progress:
+                progress.task_done(index)
+
+    _raise_failures(failures, len(tasks), action)
+    return results
+
+
+def run_listed_transfers(tasks, max_parallel_files, action='transfer'):
+    """ Run the `TransferTask`s of the iterable `tasks` on up to `max_parallel_files` threads as they are listed, for
+    transfers which have no size to order them by, e.g. the copies of the blobs of a container listing. Only twice as
+    many tasks as threads are taken from `tasks` ahead of the threads, so that the listing is never held in memory.
+    Returns the results of the tasks in the order of `tasks`, the failures are reported like by `run_transfers`. """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    if max_parallel_files < 1:
+        raise CLIError('usage error: --max-parallel-files must be at least 1.')
+
+    results = []
+    failures = []
+    running = {}
+
+    def _collect(futures):
+        for future in futures:
+            index, name = running.pop(future)
+            try:
+                results[index] = future.result()
+            except Exception as ex:  # pylint: disable=broad-except
+                failures.append((index, name, ex))
+
+    with ThreadPoolExecutor(max_workers=max_parallel_files) as executor:
+        for index, task in enumerate(tasks):
+            if len(running) >= 2 * max_parallel_files:
+                _collect(wait(running, return_when=FIRST_COMPLETED).done)
+            results.append(None)
+            running[executor.submit(task.run, None)] = index, task.name
+        _collect(wait(running).done)
+
+    _raise_failures(failures, len(results), action)
+    return results
+
+
+def _raise_failures(failures, total, action):
+    """ Log the `failures`, tuples of the index, name and exception of the tasks which failed, and raise a CLIError if
+    there are any. """
+    if failures:
+        for _, name, ex in sorted(failures, key=lambda f: f[0]):
+            logger.error('Failed to %s %s: %s', action, name, ex)
+        raise CLIError('{} of {} files failed to {}.'.format(len(failures), total, action))
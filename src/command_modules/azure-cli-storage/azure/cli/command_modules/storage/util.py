@@ -10,6 +10,9 @@ import os
 def collect_blobs(blob_service, container, pattern=None):
     """
     List the blobs in the given blob container, filter the blob by comparing their path to the given pattern.
+
+    The names are yielded as the pages of the listing arrive. Only the blobs starting with the literal prefix of the
+    pattern, e.g. `logs/2018/` for `logs/2018/*.log`, are listed.
     """
     if not blob_service:
         raise ValueError('missing parameter blob_service')
@@ -18,19 +21,20 @@ def collect_blobs(blob_service, container, pattern=None):
         raise ValueError('missing parameter container')
 
     if not _pattern_has_wildcards(pattern):
-        return [pattern] if blob_service.exists(container, pattern) else []
+        return iter([pattern] if blob_service.exists(container, pattern) else [])
+
+    return _iter_blobs(blob_service, container, pattern)
+
 
-    results = []
-    for blob in blob_service.list_blobs(container):
+def _iter_blobs(blob_service, container, pattern):
+    for blob in blob_service.list_blobs(container, prefix=_get_pattern_prefix(pattern) or None):
         try:
             blob_name = blob.name.encode('utf-8') if isinstance(blob.name, unicode) else blob.name
         except NameError:
             blob_name = blob.name
 
         if not pattern or _match_path(blob_name, pattern):
-            results.append(blob_name)
-
-    return results
+            yield blob_name
 
 
 def collect_files(cmd, file_service, share, pattern=None):
@@ -167,6 +171,14 @@ def _pattern_has_wildcards(p):
     return not p or p.find('*') != -1 or p.find('?') != -1 or p.find('[') != -1
 
 
+def _get_pattern_prefix(p):
+    """ The part of the pattern `p` before its first wildcard, which every path matching it starts with. """
+    if not p:
+        return ''
+    wildcards = [i for i in (p.find('*'), p.find('?'), p.find('[')) if i != -1]
+    return p[:min(wildcards)] if wildcards else p
+
+
 def _match_path(path, pattern):
     from fnmatch import fnmatch
     return fnmatch(path, pattern)
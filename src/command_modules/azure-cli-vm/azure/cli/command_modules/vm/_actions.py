@@ -70,16 +70,16 @@ def load_images_thru_services(cli_ctx, publisher, offer, sku, location):
 
 
 def load_images_from_aliases_doc(cli_ctx, publisher=None, offer=None, sku=None):
-    import requests
     from azure.cli.core.cloud import CloudEndpointNotSetException
     from azure.cli.core.util import should_disable_connection_verify
+    from azure.cli.core.http_pool import get_session
     try:
         target_url = cli_ctx.cloud.endpoints.vm_image_alias_doc
     except CloudEndpointNotSetException:
         raise CLIError("'endpoint_vm_image_alias_doc' isn't configured. Please invoke 'az cloud update' to configure "
                        "it or use '--all' to retrieve images from server")
     # under hack mode(say through proxies with unsigned cert), opt out the cert verification
-    response = requests.get(target_url, verify=(not should_disable_connection_verify()))
+    response = get_session(cli_ctx).get(target_url, verify=(not should_disable_connection_verify()))
     if response.status_code != 200:
         raise CLIError("Failed to retrieve image alias doc '{}'. Error: '{}'".format(target_url, response))
     dic = json.loads(response.content.decode())
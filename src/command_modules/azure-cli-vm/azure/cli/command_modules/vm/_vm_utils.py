@@ -42,20 +42,19 @@ def read_content_if_is_file(string_or_file):
 
 def _resolve_api_version(cli_ctx, provider_namespace, resource_type, parent_path):
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    from azure.cli.core.commands.provider_cache import get_provider_cache
     from azure.cli.core.profiles import ResourceType
     client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES)
-    provider = client.providers.get(provider_namespace)
 
     # If available, we will use parent resource's api-version
     resource_type_str = (parent_path.split('/')[0] if parent_path else resource_type)
 
-    rt = [t for t in provider.resource_types  # pylint: disable=no-member
-          if t.resource_type.lower() == resource_type_str.lower()]
+    rt = get_provider_cache(cli_ctx).get_resource_type(client, provider_namespace, resource_type_str)
     if not rt:
         raise CLIError('Resource type {} not found.'.format(resource_type_str))
-    if len(rt) == 1 and rt[0].api_versions:
-        npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-        return npv[0] if npv else rt[0].api_versions[0]
+    if rt.api_versions:
+        npv = [v for v in rt.api_versions if 'preview' not in v.lower()]
+        return npv[0] if npv else rt.api_versions[0]
     else:
         raise CLIError(
             'API version is required and could not be resolved for resource {}'